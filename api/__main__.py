@@ -0,0 +1,21 @@
+import argparse
+import asyncio
+from api.server import ApiServer
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m api", description="Локальный JSON API над сервисами проектов и документов")
+    parser.add_argument('--projects-db', default="projects.db")
+    parser.add_argument('--documents-db', default="documents.db")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--read-pool', type=int, default=4)
+    args = parser.parse_args()
+
+    server = ApiServer(args.projects_db, args.documents_db, args.host, args.port, args.read_pool)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
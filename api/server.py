@@ -0,0 +1,286 @@
+import asyncio
+import json
+import re
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+from models.enums import DocumentStatus, DocumentCategory
+from models.transitions import TransitionOutcome
+from models.serialization import document_to_dict, project_to_dict
+from repositories.connection import ReadOnlyPool
+from repositories.document_repository import DocumentRepository
+from repositories.project_repository import ProjectRepository
+from services.document_service import DocumentService
+from services.project_service import ProjectService
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+class Services:
+    def __init__(self, projects: ProjectService, documents: DocumentService):
+        self.projects = projects
+        self.documents = documents
+
+class Route:
+    def __init__(self, method: str, pattern: str, handler: Callable, kind: str):
+        self.method = method
+        self.pattern = re.compile(f"^{pattern}$")
+        self.handler = handler
+        self.kind = kind
+
+def _enum(enum_cls, value: str):
+    try:
+        return next(m for m in enum_cls if value in (m.name, m.value))
+    except StopIteration:
+        raise HttpError(400, f"Неизвестное значение {enum_cls.__name__}: {value}")
+
+def list_projects(services: Services, match, query: Dict, body) -> Iterator[Dict]:
+    return (project_to_dict(p) for p in services.projects.iter_projects())
+
+def project_stats(services: Services, match, query: Dict, body) -> Dict:
+    return services.projects.get_project_progress_stats()
+
+def update_project_progress(services: Services, match, query: Dict, body) -> Dict:
+    return {'updated': services.projects.update_project_progress(int(match.group(1)), int(body['progress']))}
+
+def list_documents(services: Services, match, query: Dict, body) -> Iterator[Dict]:
+    return (document_to_dict(d) for d in services.documents.iter_documents())
+
+def search_documents(services: Services, match, query: Dict, body) -> Iterator[Dict]:
+    from strategies.search_strategy import SimpleSearchStrategy, AdvancedSearchStrategy
+    strategy = AdvancedSearchStrategy() if query.get('advanced') == '1' else SimpleSearchStrategy()
+    text = query.get('q', '')
+    documents = services.documents.iter_documents()
+    while True:
+        batch = list(islice(documents, 1000))
+        if not batch:
+            return
+        yield from (document_to_dict(d) for d in strategy.search(batch, text))
+
+def search_documents_advanced(services: Services, match, query: Dict, body) -> List[Dict]:
+    params = dict(body or {})
+    for key in ('date_from', 'date_to'):
+        if params.get(key):
+            params[key] = datetime.strptime(params[key], '%Y-%m-%d')
+    return [document_to_dict(d) for d in services.documents.search_documents_advanced(params)]
+
+def create_document(services: Services, match, query: Dict, body) -> Dict:
+    document = services.documents.create_document(body['name'], _enum(DocumentCategory, body['category']), body['author'])
+    if body.get('description'):
+        document.description = body['description']
+        services.documents.save_document(document, immediate=True).result()
+    return document_to_dict(document)
+
+def publish_document(services: Services, match, query: Dict, body) -> Dict:
+    return {'published': services.documents.publish_document(int(match.group(1)))}
+
+def set_document_status(services: Services, match, query: Dict, body) -> Dict:
+    results = services.documents.transition_documents(body['ids'], _enum(DocumentStatus, body['status']))
+    return {'updated': sum(outcome == TransitionOutcome.APPLIED for outcome in results.values()),
+            'results': {str(doc_id): outcome.name.lower() for doc_id, outcome in results.items()}}
+
+ROUTES = [
+    Route('GET', r"/projects", list_projects, 'stream'),
+    Route('GET', r"/projects/stats", project_stats, 'read'),
+    Route('POST', r"/projects/(\d+)/progress", update_project_progress, 'write'),
+    Route('GET', r"/documents", list_documents, 'stream'),
+    Route('GET', r"/documents/search", search_documents, 'stream'),
+    Route('POST', r"/documents/search", search_documents_advanced, 'read'),
+    Route('POST', r"/documents", create_document, 'write'),
+    Route('POST', r"/documents/(\d+)/publish", publish_document, 'write'),
+    Route('POST', r"/documents/status", set_document_status, 'write'),
+]
+
+def resolve(method: str, path: str) -> Tuple[Route, re.Match]:
+    allowed = False
+    for route in ROUTES:
+        match = route.pattern.match(path)
+        if match:
+            if route.method == method:
+                return route, match
+            allowed = True
+    raise HttpError(405 if allowed else 404, f"{method} {path}")
+
+class ApiServer:
+    def __init__(self, projects_db: str, documents_db: str, host: str = "127.0.0.1", port: int = 8765,
+                 read_pool_size: int = 4, max_write_batch: int = 100, stream_chunk: int = 500):
+        self.host = host
+        self.port = port
+        self.max_write_batch = max_write_batch
+        self.stream_chunk = stream_chunk
+        self.project_pool = ReadOnlyPool(projects_db, read_pool_size)
+        self.document_pool = ReadOnlyPool(documents_db, read_pool_size)
+        self.readers = Services(
+            ProjectService(ProjectRepository(projects_db, pool=self.project_pool, read_pool=self.project_pool)),
+            DocumentService(DocumentRepository(documents_db, pool=self.document_pool, read_pool=self.document_pool))
+        )
+        self.writers = Services(
+            ProjectService(ProjectRepository(projects_db)),
+            DocumentService(DocumentRepository(documents_db))
+        )
+        self.read_executor = ThreadPoolExecutor(read_pool_size, thread_name_prefix="api-read")
+        self.stream_executor = ThreadPoolExecutor(read_pool_size, thread_name_prefix="api-stream")
+        self.write_executor = ThreadPoolExecutor(1, thread_name_prefix="api-write")
+        self.write_queue: Optional[asyncio.Queue] = None
+        self.writer_task: Optional[asyncio.Task] = None
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        self.write_queue = asyncio.Queue()
+        self.writer_task = asyncio.create_task(self.writer_loop())
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.writer_task is not None:
+            self.writer_task.cancel()
+            try:
+                await self.writer_task
+            except asyncio.CancelledError:
+                pass
+        self.read_executor.shutdown(wait=True)
+        self.stream_executor.shutdown(wait=True)
+        self.write_executor.shutdown(wait=True)
+        self.project_pool.close()
+        self.document_pool.close()
+
+    async def writer_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.write_queue.get()]
+            while len(batch) < self.max_write_batch and not self.write_queue.empty():
+                batch.append(self.write_queue.get_nowait())
+            results = await loop.run_in_executor(self.write_executor, self.apply_writes,
+                                                 [operation for operation, _ in batch])
+            for (_, future), (ok, value) in zip(batch, results):
+                if future.cancelled():
+                    continue
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+
+    def apply_writes(self, operations: List[Callable]) -> List[Tuple[bool, object]]:
+        results = []
+        for operation in operations:
+            try:
+                results.append((True, operation(self.writers)))
+            except Exception as e:
+                results.append((False, e))
+        return results
+
+    async def submit_write(self, operation: Callable):
+        future = asyncio.get_running_loop().create_future()
+        await self.write_queue.put((operation, future))
+        return await future
+
+    async def execute(self, method: str, target: str, body):
+        url = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if method == 'POST' and url.path == "/batch":
+            return 'read', await self.execute_batch(body or [])
+        route, match = resolve(method, url.path)
+        call = lambda services: route.handler(services, match, query, body)
+        if route.kind == 'write':
+            return route.kind, await self.submit_write(call)
+        if route.kind == 'stream':
+            return route.kind, call(self.readers)
+        return route.kind, await asyncio.get_running_loop().run_in_executor(self.read_executor, call, self.readers)
+
+    async def execute_batch(self, requests: List[Dict]) -> List[Dict]:
+        async def run(request):
+            try:
+                kind, result = await self.execute(request.get('method', 'GET'), request['path'], request.get('body'))
+                if kind == 'stream':
+                    result = await asyncio.get_running_loop().run_in_executor(self.stream_executor, list, result)
+                return {'status': 200, 'body': result}
+            except HttpError as e:
+                return {'status': e.status, 'error': str(e)}
+            except (KeyError, ValueError, TypeError) as e:
+                return {'status': 400, 'error': str(e)}
+        return await asyncio.gather(*(run(request) for request in requests))
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+                try:
+                    method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                    length = int(headers.get('content-length', 0))
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    await self.send_json(writer, 400, {'error': "Некорректный запрос"})
+                    break
+                raw_body = await reader.readexactly(length)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await self.respond(writer, method, target, raw_body)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer: asyncio.StreamWriter, method: str, target: str, raw_body: bytes):
+        try:
+            body = json.loads(raw_body) if raw_body else None
+            kind, result = await self.execute(method, target, body)
+        except HttpError as e:
+            return await self.send_json(writer, e.status, {'error': str(e)})
+        except (KeyError, ValueError, TypeError) as e:
+            return await self.send_json(writer, 400, {'error': str(e)})
+        except Exception as e:
+            return await self.send_json(writer, 500, {'error': str(e)})
+        if kind == 'stream':
+            await self.send_stream(writer, result)
+        else:
+            await self.send_json(writer, 200, result)
+
+    async def send_json(self, writer: asyncio.StreamWriter, status: int, payload):
+        data = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+        writer.write(f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\nContent-Type: application/json; charset=utf-8\r\n"
+                     f"Content-Length: {len(data)}\r\n\r\n".encode('latin-1') + data)
+        await writer.drain()
+
+    async def send_stream(self, writer: asyncio.StreamWriter, records: Iterator[Dict]):
+        loop = asyncio.get_running_loop()
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson; charset=utf-8\r\n"
+                     b"Transfer-Encoding: chunked\r\n\r\n")
+        try:
+            while True:
+                chunk = await loop.run_in_executor(self.stream_executor, lambda: list(islice(records, self.stream_chunk)))
+                if not chunk:
+                    break
+                data = "".join(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in chunk).encode('utf-8')
+                writer.write(f"{len(data):x}\r\n".encode('latin-1') + data + b"\r\n")
+                await writer.drain()
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        finally:
+            if hasattr(records, 'close'):
+                await loop.run_in_executor(self.stream_executor, records.close)
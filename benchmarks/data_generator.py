@@ -0,0 +1,170 @@
+import random
+import sqlite3
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Tuple
+from models.document import Document
+from models.project import Project
+from models.enums import ProjectStatus, ProjectType, DocumentStatus, DocumentCategory
+from strategies.stemmer import document_terms, document_text
+
+SURNAMES = [
+    "Иванов", "Петров", "Сидоров", "Козлов", "Смирнов", "Кузнецов", "Попов", "Васильев",
+    "Соколов", "Михайлов", "Новиков", "Фёдоров", "Морозов", "Волков", "Алексеев", "Лебедев",
+    "Семёнов", "Егоров", "Павлов", "Степанов", "Николаев", "Орлов", "Андреев", "Макаров",
+    "Никитин", "Захаров", "Зайцев", "Соловьёв", "Борисов", "Яковлев", "Григорьев", "Романов",
+    "Воробьёв", "Сергеев", "Кузьмин", "Фролов", "Александров", "Дмитриев", "Королёв", "Гусев"
+]
+FEMALE_SUFFIX = "а"
+INITIALS = "АБВГДЕИКЛМНОПРСТФЮЯ"
+
+DOCUMENT_TITLES = {
+    DocumentCategory.REGULATORY: ["Положение о {}", "Регламент {}", "Методика {}", "Стандарт {}"],
+    DocumentCategory.ARCHIVE: ["Архивная копия: {}", "Отчёт о {}"],
+    DocumentCategory.ORDERS: ["Приказ №{n} о {}", "Распоряжение №{n} о {}"],
+    DocumentCategory.TRAINING: ["Учебный курс: {}", "Презентация по теме {}"],
+    DocumentCategory.TEMPLATES: ["Шаблон: {}", "Форма {}"],
+    DocumentCategory.MEMOS: ["Служебная записка о {}", "Докладная записка о {}"]
+}
+SUBJECTS = [
+    "дорожной деятельности", "закупках", "охране труда", "документообороте", "командировках",
+    "информационной безопасности", "бюджетировании", "оценке проектов", "капитальном ремонте",
+    "логистике", "кадровом резерве", "внутреннем контроле", "развитии инфраструктуры"
+]
+PROJECT_TITLES = [
+    "Развитие {}", "Модернизация {}", "Строительство {}", "Реконструкция {}", "Внедрение {}", "Цифровизация {}"
+]
+PROJECT_SUBJECTS = [
+    "дорожной сети", "ИТ-инфраструктуры", "логистического центра", "складского комплекса",
+    "системы документооборота", "мостового перехода", "корпоративной системы", "службы эксплуатации"
+]
+
+CATEGORY_WEIGHTS = {
+    DocumentCategory.ORDERS: 30,
+    DocumentCategory.REGULATORY: 25,
+    DocumentCategory.MEMOS: 20,
+    DocumentCategory.TEMPLATES: 10,
+    DocumentCategory.TRAINING: 10,
+    DocumentCategory.ARCHIVE: 5
+}
+DOCUMENT_STATUS_WEIGHTS = {
+    DocumentStatus.PUBLISHED: 35, DocumentStatus.DRAFT: 15, DocumentStatus.ARCHIVED: 12,
+    DocumentStatus.APPROVAL: 6, DocumentStatus.APPROVED: 5, DocumentStatus.APPROVAL_WAITING: 4,
+    DocumentStatus.APPROVED_FINAL: 4, DocumentStatus.EXPIRED: 5, DocumentStatus.RECALLED: 2,
+    DocumentStatus.VERIFICATION: 3, DocumentStatus.REFINEMENT: 3, DocumentStatus.UPDATING: 2,
+    DocumentStatus.UPDATED: 2, DocumentStatus.DELETED: 1, DocumentStatus.PUBLICATION_WAITING: 1
+}
+PROJECT_STATUS_WEIGHTS = {
+    ProjectStatus.IN_PROGRESS: 30, ProjectStatus.PLANNED: 12, ProjectStatus.CREATED: 8,
+    ProjectStatus.COMPLETED: 15, ProjectStatus.CLOSED: 10, ProjectStatus.APPROVAL: 5,
+    ProjectStatus.APPROVAL_WAITING: 4, ProjectStatus.VERIFICATION: 4, ProjectStatus.REQUIRES_REFINEMENT: 3,
+    ProjectStatus.FROZEN: 3, ProjectStatus.ARCHIVED: 4, ProjectStatus.CANCELLED: 2
+}
+PROJECT_TYPE_WEIGHTS = {ProjectType.INVESTMENT: 40, ProjectType.CORPORATE: 60}
+
+class SyntheticDataGenerator:
+    def __init__(self, seed: int = 42, start: date = date(2018, 1, 1), end: date = date(2025, 12, 31),
+                 people: int = 2000):
+        self.rng = random.Random(seed)
+        self.start = start
+        self.days = (end - start).days
+        self.people = [self._make_person() for _ in range(people)]
+        self.categories, self.category_weights = self._split(CATEGORY_WEIGHTS)
+        self.document_statuses, self.document_status_weights = self._split(DOCUMENT_STATUS_WEIGHTS)
+        self.project_statuses, self.project_status_weights = self._split(PROJECT_STATUS_WEIGHTS)
+        self.project_types, self.project_type_weights = self._split(PROJECT_TYPE_WEIGHTS)
+
+    def _split(self, weights: Dict) -> Tuple[List, List[int]]:
+        return list(weights.keys()), list(weights.values())
+
+    def _make_person(self) -> str:
+        surname = self.rng.choice(SURNAMES)
+        if self.rng.random() < 0.4:
+            surname += FEMALE_SUFFIX
+        return f"{surname} {self.rng.choice(INITIALS)}.{self.rng.choice(INITIALS)}."
+
+    def _pick(self, values: List, weights: List[int]):
+        return self.rng.choices(values, weights)[0]
+
+    def _day(self, offset: int = 0, spread: int = None) -> date:
+        return self.start + timedelta(days=offset + self.rng.randint(0, spread if spread is not None else self.days))
+
+    def person(self) -> str:
+        return self.rng.choice(self.people)
+
+    def document_rows(self, count: int) -> Iterator[tuple]:
+        for i in range(1, count + 1):
+            category = self._pick(self.categories, self.category_weights)
+            template = self.rng.choice(DOCUMENT_TITLES[category])
+            subject = self.rng.choice(SUBJECTS)
+            name = template.format(subject, n=self.rng.randint(1, 999))
+            yield (
+                name, category.value, self._pick(self.document_statuses, self.document_status_weights).value,
+                self.person(), f"{self.rng.randint(1, 4)}.{self.rng.randint(0, 9)}",
+                self._day().isoformat(), f"{name}. Документ {i} по направлению «{subject}»", ""
+            )
+
+    def project_rows(self, count: int) -> Iterator[tuple]:
+        for i in range(1, count + 1):
+            status = self._pick(self.project_statuses, self.project_status_weights)
+            start = self._day(spread=self.days - 60)
+            end = start + timedelta(days=self.rng.randint(60, 900))
+            actual_start, actual_end, progress = None, None, self.rng.randint(0, 95)
+            if status not in (ProjectStatus.CREATED, ProjectStatus.PLANNED):
+                actual_start = (start + timedelta(days=self.rng.randint(-10, 30))).isoformat()
+            if status in (ProjectStatus.COMPLETED, ProjectStatus.CLOSED, ProjectStatus.ARCHIVED):
+                actual_end = (end + timedelta(days=int(self.rng.gauss(15, 40)))).isoformat()
+                progress = 100
+            name = self.rng.choice(PROJECT_TITLES).format(self.rng.choice(PROJECT_SUBJECTS))
+            yield (
+                f"{name} ({i})", self._pick(self.project_types, self.project_type_weights).value, status.value,
+                start.isoformat(), end.isoformat(), actual_start, actual_end,
+                self.person(), f"Проект {i}: {name}", progress
+            )
+
+    def documents(self, count: int) -> Iterator[Document]:
+        for row in self.document_rows(count):
+            document = Document(0, row[0], DocumentCategory(row[1]), DocumentStatus(row[2]), row[3], row[4])
+            document.creation_date = datetime.strptime(row[5], '%Y-%m-%d')
+            document.description = row[6]
+            yield document
+
+    def projects(self, count: int) -> Iterator[Project]:
+        for row in self.project_rows(count):
+            project = Project(0, row[0], ProjectType(row[1]), ProjectStatus(row[2]),
+                              datetime.strptime(row[3], '%Y-%m-%d'), datetime.strptime(row[4], '%Y-%m-%d'),
+                              row[7], row[8])
+            project.actual_start = datetime.strptime(row[5], '%Y-%m-%d') if row[5] else None
+            project.actual_end = datetime.strptime(row[6], '%Y-%m-%d') if row[6] else None
+            project.progress = row[9]
+            yield project
+
+    def populate_documents(self, db_path: str, count: int, batch_size: int = 50000):
+        conn = sqlite3.connect(db_path)
+        rows = self.document_rows(count)
+        while True:
+            batch = [row + (document_terms(row[0], row[3], row[6]), document_text(row[0], row[3], row[6]))
+                     for _, row in zip(range(batch_size), rows)]
+            if not batch:
+                break
+            conn.executemany('''
+                INSERT INTO documents (name, category, status, author, version, creation_date, description, file_path,
+                                       search_terms, search_text)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', batch)
+            conn.commit()
+        conn.close()
+
+    def populate_projects(self, db_path: str, count: int, batch_size: int = 50000):
+        conn = sqlite3.connect(db_path)
+        rows = self.project_rows(count)
+        while True:
+            batch = [row for _, row in zip(range(batch_size), rows)]
+            if not batch:
+                break
+            conn.executemany('''
+                INSERT INTO projects (name, type, status, start_date, end_date, actual_start, actual_end,
+                                      manager, description, progress)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', batch)
+            conn.commit()
+        conn.close()
@@ -0,0 +1,153 @@
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.data_generator import SyntheticDataGenerator
+from repositories.document_repository import DocumentRepository
+from repositories.project_repository import ProjectRepository
+from services.document_service import DocumentService
+
+BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "memory_budget.json")
+
+def resident_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+class Footprint:
+    def __init__(self, name: str, count: int, traced: int, peak: int, resident: Optional[int], top: List[str]):
+        self.name = name
+        self.count = count
+        self.traced = traced
+        self.peak = peak
+        self.resident = resident
+        self.top = top
+
+    @property
+    def per_item(self) -> float:
+        return self.traced / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict:
+        return {'count': self.count, 'bytes': self.traced, 'per_item': round(self.per_item, 1),
+                'peak': self.peak, 'resident': self.resident, 'top': self.top}
+
+def measure(name: str, load: Callable[[], Tuple[object, int]], top: int = 5) -> Tuple[object, Footprint]:
+    gc.collect()
+    resident_before = resident_bytes()
+    tracemalloc.start(1)
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    result, count = load()
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    traced, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    resident_after = resident_bytes()
+    statistics = after.compare_to(before, 'lineno')
+    grown = sum(stat.size_diff for stat in statistics)
+    sites = [f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno} +{stat.size_diff} Б"
+             for stat in statistics[:top]]
+    resident = resident_after - resident_before if resident_before is not None and resident_after is not None else None
+    return result, Footprint(name, count, grown, peak, resident, sites)
+
+def measure_treeview(service: DocumentService) -> Optional[Footprint]:
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception:
+        return None
+    try:
+        root.withdraw()
+        from ui.document_view import DocumentView
+        view = DocumentView(root, service)
+        view.tree.delete(*view.tree.get_children())
+        _, footprint = measure('Treeview row', lambda: (view.display_documents(view.documents), len(view.documents)))
+        return footprint
+    finally:
+        root.destroy()
+
+def run(workdir: str, documents: int, projects: int, seed: int) -> Dict[str, Footprint]:
+    generator = SyntheticDataGenerator(seed=seed)
+    document_repository = DocumentRepository(os.path.join(workdir, "documents.db"))
+    project_repository = ProjectRepository(os.path.join(workdir, "projects.db"))
+    generator.populate_documents(document_repository.db_path, documents)
+    generator.populate_projects(project_repository.db_path, projects)
+
+    def loaded(items):
+        return items, len(items)
+
+    results = {}
+    _, results['Document'] = measure('Document', lambda: loaded(document_repository.get_all_documents()))
+    _, results['Project'] = measure('Project', lambda: loaded(project_repository.get_all_projects()))
+    treeview = measure_treeview(DocumentService(document_repository))
+    if treeview is not None:
+        results['Treeview row'] = treeview
+    return results
+
+def load_budget(path: str) -> Dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def check(results: Dict[str, Footprint], budget: Dict) -> List[str]:
+    violations = []
+    for name, footprint in results.items():
+        limit = budget.get('per_item', {}).get(name)
+        if limit and footprint.per_item > limit:
+            violations.append(f"{name}: {footprint.per_item:.0f} Б на объект при бюджете {limit} Б")
+        peak_limit = budget.get('peak_per_item', {}).get(name)
+        if peak_limit and footprint.count and footprint.peak / footprint.count > peak_limit:
+            violations.append(f"{name}: пик {footprint.peak / footprint.count:.0f} Б на объект при бюджете {peak_limit} Б")
+    return violations
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Объем памяти на документ, проект и строку таблицы документов")
+    parser.add_argument('--documents', type=int, default=50000)
+    parser.add_argument('--projects', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--budget', default=BUDGET_PATH)
+    parser.add_argument('--update-budget', action='store_true')
+    parser.add_argument('--headroom', type=float, default=0.15, help="запас при обновлении бюджета")
+    parser.add_argument('--json', action='store_true', help="вывести результаты в JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results = run(workdir, args.documents, args.projects, args.seed)
+
+    if args.json:
+        print(json.dumps({name: f.to_dict() for name, f in results.items()}, ensure_ascii=False, indent=2))
+    else:
+        for name, footprint in results.items():
+            resident = f", RSS {footprint.resident / footprint.count:8.0f} Б/объект" if footprint.resident else ""
+            print(f"{name:>14}: {footprint.count:8d} шт., {footprint.per_item:8.0f} Б/объект, "
+                  f"пик {footprint.peak / 2 ** 20:7.1f} МБ{resident}")
+            for site in footprint.top:
+                print(f"{'':>16}{site}")
+
+    budget = load_budget(args.budget)
+    if args.update_budget:
+        budget['documents'], budget['projects'] = args.documents, args.projects
+        budget['per_item'] = {**budget.get('per_item', {}),
+                              **{name: int(f.per_item * (1 + args.headroom)) for name, f in results.items()}}
+        budget['peak_per_item'] = {**budget.get('peak_per_item', {}),
+                                   **{name: int(f.peak / f.count * (1 + args.headroom))
+                                      for name, f in results.items() if f.count}}
+        with open(args.budget, 'w', encoding='utf-8') as f:
+            json.dump(budget, f, ensure_ascii=False, indent=2)
+        return 0
+
+    violations = check(results, budget)
+    for line in violations:
+        print(f"ПРЕВЫШЕНИЕ {line}", file=sys.stderr)
+    return 1 if violations else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.data_generator import SyntheticDataGenerator
+from repositories.document_repository import DocumentRepository
+from repositories.project_repository import ProjectRepository
+from repositories.write_queue import WriteQueue
+from services.document_service import DocumentService
+from services.project_service import ProjectService
+from strategies.search_strategy import SimpleSearchStrategy, AdvancedSearchStrategy
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+class BenchmarkContext:
+    def __init__(self, workdir: str, documents: int, projects: int, seed: int):
+        self.generator = SyntheticDataGenerator(seed=seed)
+        self.document_repository = DocumentRepository(os.path.join(workdir, "documents.db"))
+        self.project_repository = ProjectRepository(os.path.join(workdir, "projects.db"))
+        self.generator.populate_documents(self.document_repository.db_path, documents)
+        self.generator.populate_projects(self.project_repository.db_path, projects)
+        self.document_service = DocumentService(self.document_repository)
+        self.project_service = ProjectService(self.project_repository)
+        self.documents = self.document_repository.get_all_documents()
+        self.new_documents = list(self.generator.documents(200))
+        self.new_projects = list(self.generator.projects(200))
+
+def save_documents(ctx: BenchmarkContext):
+    for document in ctx.new_documents:
+        document.doc_id = 0
+        ctx.document_repository.save_document(document)
+
+def save_documents_queued(ctx: BenchmarkContext):
+    write_queue = WriteQueue()
+    service = DocumentService(ctx.document_repository, write_queue)
+    futures = []
+    for document in ctx.new_documents:
+        document.doc_id = 0
+        futures.append(service.save_document(document))
+    for future in futures:
+        future.result()
+    write_queue.close()
+
+def save_projects(ctx: BenchmarkContext):
+    for project in ctx.new_projects:
+        project.project_id = 0
+        ctx.project_repository.save_project(project)
+
+BENCHMARKS: Dict[str, Callable[[BenchmarkContext], object]] = {
+    'get_all_documents': lambda ctx: ctx.document_repository.get_all_documents(),
+    'get_all_projects': lambda ctx: ctx.project_repository.get_all_projects(),
+    'save_document x200': save_documents,
+    'save_document x200 (WriteQueue)': save_documents_queued,
+    'save_project x200': save_projects,
+    'search_documents': lambda ctx: ctx.document_repository.search_documents("приказ"),
+    'search_documents_advanced': lambda ctx: ctx.document_service.search_documents_advanced(
+        {'status': "Опубликован", 'author': "Иванов"}),
+    'SimpleSearchStrategy.search': lambda ctx: SimpleSearchStrategy().search(ctx.documents, "закупках"),
+    'AdvancedSearchStrategy.search': lambda ctx: AdvancedSearchStrategy().search(
+        ctx.documents, 'status:опубликован author:Петров охране'),
+    'find_authors': lambda ctx: ctx.document_service.find_authors("Ивонов"),
+    'get_project_progress_stats': lambda ctx: ctx.project_service.get_project_progress_stats(),
+}
+
+def run_benchmarks(ctx: BenchmarkContext, repeat: int, selected: List[str] = None) -> Dict[str, float]:
+    results = {}
+    for name, benchmark in BENCHMARKS.items():
+        if selected and name not in selected:
+            continue
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            benchmark(ctx)
+            timings.append(time.perf_counter() - started)
+        results[name] = min(timings)
+    return results
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    regressions = []
+    for name, elapsed in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            if baseline:
+                regressions.append(f"{name}: нет в базе, обновите её с --update-baseline")
+        elif elapsed > reference * (1 + threshold):
+            regressions.append(f"{name}: {elapsed * 1000:.1f} мс против {reference * 1000:.1f} мс "
+                               f"(+{(elapsed / reference - 1) * 100:.0f}%)")
+    return regressions
+
+def load_baseline(path: str, documents: int, projects: int) -> Dict[str, float]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('documents') != documents or data.get('projects') != projects:
+        return {}
+    return data.get('results', {})
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарки репозиториев, сервисов и стратегий поиска")
+    parser.add_argument('--documents', type=int, default=100000)
+    parser.add_argument('--projects', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--threshold', type=float, default=0.25, help="допустимое замедление относительно базы")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--only', nargs='*', help="запустить только указанные бенчмарки")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        ctx = BenchmarkContext(workdir, args.documents, args.projects, args.seed)
+        results = run_benchmarks(ctx, args.repeat, args.only)
+
+    baseline = load_baseline(args.baseline, args.documents, args.projects)
+    for name, elapsed in results.items():
+        reference = baseline.get(name)
+        suffix = f"  (база {reference * 1000:.1f} мс)" if reference else ""
+        print(f"{name:>32}: {elapsed * 1000:10.1f} мс{suffix}")
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'documents': args.documents, 'projects': args.projects,
+                       'results': {**baseline, **results}}, f, ensure_ascii=False, indent=2)
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for line in regressions:
+        print(f"РЕГРЕССИЯ {line}", file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
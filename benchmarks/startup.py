@@ -0,0 +1,79 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from benchmarks.data_generator import SyntheticDataGenerator
+from repositories.document_repository import DocumentRepository
+from repositories.project_repository import ProjectRepository
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def populate(workdir: str, documents: int, projects: int, seed: int = 42):
+    generator = SyntheticDataGenerator(seed=seed)
+    generator.populate_projects(ProjectRepository(os.path.join(workdir, "projects.db")).db_path, projects)
+    generator.populate_documents(DocumentRepository(os.path.join(workdir, "documents.db")).db_path, documents)
+
+def measure_once() -> Dict[str, float]:
+    started = time.perf_counter()
+    import tkinter as tk
+    from main import MainApplication
+    imported = time.perf_counter()
+
+    root = tk.Tk()
+    app = MainApplication(root)
+    root.update_idletasks()
+    root.update()
+    first_paint = time.perf_counter()
+
+    app.notebook.select(1)
+    root.update()
+    documents_tab = time.perf_counter()
+    root.destroy()
+
+    return {
+        'import': imported - started,
+        'first_paint': first_paint - started,
+        'documents_tab': documents_tab - first_paint,
+    }
+
+def run(documents: int, projects: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    samples: Dict[str, List[float]] = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        populate(workdir, documents, projects)
+        env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+        for _ in range(repeat):
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.startup', '--child'],
+                cwd=workdir, env=env, check=True, capture_output=True, text=True
+            ).stdout
+            for key, value in json.loads(output.splitlines()[-1]).items():
+                samples.setdefault(key, []).append(value)
+    return {
+        key: {'median': statistics.median(values), 'max': max(values)}
+        for key, values in samples.items()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Время до первой отрисовки главного окна")
+    parser.add_argument('--documents', type=int, default=200000)
+    parser.add_argument('--projects', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure_once()))
+        return
+
+    results = run(args.documents, args.projects, args.repeat)
+    for key, values in results.items():
+        print(f"{key:>15}: median {values['median'] * 1000:8.1f} ms, max {values['max'] * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
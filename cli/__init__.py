@@ -0,0 +1,3 @@
+"""
+headless batch operations
+"""
@@ -0,0 +1,349 @@
+import argparse
+import json
+import os
+import sys
+import threading
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from models.enums import DocumentStatus, DocumentCategory, ProjectStatus, RouteStatus
+from models.transitions import TransitionOutcome
+from models.serialization import document_to_dict, document_from_dict, project_to_dict, project_from_dict
+from repositories.document_repository import DocumentRepository
+from repositories.project_repository import ProjectRepository
+
+def parse_enum(enum_cls, text: str):
+    for member in enum_cls:
+        if text in (member.name, member.value) or text.lower() == member.value.lower():
+            return member
+    raise ValueError(f"Неизвестное значение {enum_cls.__name__}: {text}")
+
+def batched(items: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+def emit(records: Iterable[Dict], out=None):
+    out = out or sys.stdout
+    for record in records:
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    out.flush()
+
+def read_records(path: Optional[str]) -> Iterator[Dict]:
+    stream = open(path, encoding='utf-8') if path and path != '-' else sys.stdin
+    try:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+def document_service(args):
+    from services.document_service import DocumentService
+    return DocumentService(DocumentRepository(args.documents_db))
+
+def project_service(args):
+    from services.project_service import ProjectService
+    return ProjectService(ProjectRepository(args.projects_db))
+
+def cmd_search(args):
+    if args.content:
+        emit(document_to_dict(doc) for doc in document_service(args).search_content(args.query, args.limit))
+        return
+    if args.parallel or args.regex:
+        from strategies.parallel_search import ParallelSearch
+        with ParallelSearch(DocumentRepository(args.documents_db), args.parallel or None) as search:
+            doc_ids = search.search_ids(args.query, args.advanced, args.regex)
+            for batch in batched(doc_ids, args.batch_size):
+                emit(document_to_dict(doc) for doc in search.repository.get_documents_by_ids(batch))
+        return
+    from strategies.search_strategy import SimpleSearchStrategy, AdvancedSearchStrategy
+    strategy = AdvancedSearchStrategy() if args.advanced else SimpleSearchStrategy()
+    service = document_service(args)
+    for batch in batched(service.iter_documents(args.batch_size), args.batch_size):
+        emit(document_to_dict(doc) for doc in strategy.search(batch, args.query))
+
+def cmd_advanced_search(args):
+    params = {}
+    if args.status:
+        params['status'] = parse_enum(DocumentStatus, args.status).value
+    if args.category:
+        params['category'] = parse_enum(DocumentCategory, args.category).value
+    if args.author:
+        params['author'] = args.author
+    if args.date_from:
+        params['date_from'] = datetime.strptime(args.date_from, '%Y-%m-%d')
+    if args.date_to:
+        params['date_to'] = datetime.strptime(args.date_to, '%Y-%m-%d')
+    emit(document_to_dict(doc) for doc in document_service(args).search_documents_advanced(params))
+
+def cmd_authors(args):
+    emit({'author': author} for author in document_service(args).find_authors(args.query, args.limit))
+
+def cmd_stats(args):
+    service = project_service(args)
+    with service.snapshot():
+        emit([service.get_project_progress_stats()])
+
+def cmd_analytics(args):
+    service = project_service(args)
+    analytics = service.get_portfolio_analytics()
+    with service.snapshot():
+        if args.report == 'deviations':
+            emit([analytics.deviation_distribution(args.bins)])
+        elif args.report == 'trend':
+            emit(analytics.slip_trend_by_month())
+        else:
+            emit({'manager': name, **rates} for name, rates in analytics.manager_on_time_rates(args.tolerance).items())
+
+def cmd_export(args):
+    if args.entity == 'documents':
+        service = document_service(args)
+        with service.snapshot():
+            emit(document_to_dict(doc) for doc in service.iter_documents(args.batch_size))
+    else:
+        service = project_service(args)
+        with service.snapshot():
+            emit(project_to_dict(project) for project in service.iter_projects(args.batch_size))
+
+def cmd_import(args):
+    imported = 0
+    if args.entity == 'documents':
+        service = document_service(args)
+        for batch in batched(read_records(args.file), args.batch_size):
+            imported += service.import_documents([document_from_dict(record) for record in batch])
+    else:
+        service = project_service(args)
+        for batch in batched(read_records(args.file), args.batch_size):
+            imported += service.import_projects([project_from_dict(record) for record in batch])
+    emit([{'imported': imported}])
+
+def cmd_report(args):
+    filters = {}
+    if args.status:
+        filters['status'] = parse_enum(ProjectStatus if args.entity == 'projects' else DocumentStatus, args.status)
+    if args.category:
+        filters['category'] = parse_enum(DocumentCategory, args.category)
+    if args.author:
+        filters['author'] = args.author
+    if args.type:
+        filters['type'] = args.type
+    if args.manager:
+        filters['manager'] = args.manager
+    if args.date_from:
+        filters['date_from'] = datetime.strptime(args.date_from, '%Y-%m-%d')
+    if args.date_to:
+        filters['date_to'] = datetime.strptime(args.date_to, '%Y-%m-%d')
+
+    def progress(done, total):
+        if not args.quiet:
+            print(f"{done}/{total}", file=sys.stderr, flush=True)
+
+    if args.entity == 'documents':
+        exported = document_service(args).export_register(args.output, args.columns, filters, progress,
+                                                          batch_size=args.batch_size)
+    else:
+        exported = project_service(args).export_report(args.output, args.columns, filters, progress,
+                                                       batch_size=args.batch_size)
+    emit([{'exported': exported, 'file': args.output}])
+
+def cmd_transition(args):
+    if args.entity == 'projects':
+        service = project_service(args)
+        target = parse_enum(ProjectStatus, args.to)
+        ids = list(args.ids or [])
+        if args.from_status:
+            ids.extend(service.get_ids_by_status(parse_enum(ProjectStatus, args.from_status)))
+        results = service.transition_projects(ids, target)
+    elif args.entity == 'routes':
+        target = parse_enum(RouteStatus, args.to)
+        results = document_service(args).transition_routes(list(args.ids or []), target)
+    else:
+        service = document_service(args)
+        target = parse_enum(DocumentStatus, args.to)
+        ids = list(args.ids or [])
+        if args.from_status:
+            ids.extend(service.get_ids_by_status(parse_enum(DocumentStatus, args.from_status)))
+        if args.force:
+            emit([{'status': target.value, 'updated': service.set_status(ids, target)}])
+            return
+        results = service.transition_documents(ids, target)
+    record = {'status': target.value,
+              'updated': sum(outcome == TransitionOutcome.APPLIED for outcome in results.values())}
+    for outcome in (TransitionOutcome.UNCHANGED, TransitionOutcome.FORBIDDEN, TransitionOutcome.NOT_FOUND):
+        record[outcome.name.lower()] = [i for i, o in results.items() if o == outcome]
+    emit([record])
+
+def cmd_scheduler(args):
+    from services.status_scheduler import StatusScheduler
+    repository = DocumentRepository(args.documents_db)
+
+    def report(applied):
+        emit({'id': doc_id, 'status': status.value} for doc_id, status in applied)
+
+    scheduler = StatusScheduler(repository, report)
+    if args.once:
+        scheduler.run_due()
+        return
+    scheduler.start()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        scheduler.stop()
+
+def cmd_migrate(args):
+    from repositories import document_repository, project_repository
+    from repositories.migrations import MigrationRunner
+    for db_path, migrations in ((args.projects_db, project_repository.MIGRATIONS),
+                                (args.documents_db, document_repository.MIGRATIONS)):
+        runner = MigrationRunner(db_path, migrations)
+        record = {'database': db_path, 'version': runner.current_version(), 'target': runner.target_version}
+        if args.dry_run:
+            record['plan'] = runner.plan()
+        else:
+            record['applied'] = runner.run()
+        emit([record])
+
+def cmd_index(args):
+    from repositories.blob_store import BlobStore
+    from services.content_indexer import ContentIndexer
+    repository = DocumentRepository(args.documents_db)
+    indexer = ContentIndexer(repository, BlobStore(args.blobs, repository.db_path), args.base_dir, args.workers)
+    emit([{'indexed': indexer.run_once()}])
+
+def backup_service(args):
+    from services.backup_service import BackupService
+    return BackupService(args.projects_db, args.documents_db, args.dir, args.pages)
+
+def cmd_backup(args):
+    service = backup_service(args)
+    if args.list:
+        emit(snapshot.to_dict() for snapshot in service.list_snapshots())
+    else:
+        emit([service.create_snapshot().to_dict()])
+
+def cmd_restore(args):
+    service = backup_service(args)
+    at = datetime.strptime(args.at, '%Y-%m-%d %H:%M:%S') if args.at else None
+    snapshot = service.find_snapshot(args.snapshot, at)
+    safety = service.restore(snapshot, backup_current=not args.no_safety_copy)
+    emit([{'restored': snapshot.snapshot_id, 'safety_copy': safety.snapshot_id if safety else None}])
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Пакетные операции без графического интерфейса")
+    parser.add_argument('--projects-db', default="projects.db")
+    parser.add_argument('--documents-db', default="documents.db")
+    parser.add_argument('--batch-size', type=int, default=1000)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    search = commands.add_parser('search', help="поиск документов")
+    search.add_argument('query')
+    search.add_argument('--advanced', action='store_true', help="запрос с операторами status:, author:, category:")
+    search.add_argument('--regex', action='store_true', help="запрос как регулярное выражение")
+    search.add_argument('--content', action='store_true', help="поиск по тексту прикрепленных файлов")
+    search.add_argument('--limit', type=int, default=1000)
+    search.add_argument('--parallel', type=int, default=0, metavar='N',
+                        help="искать в N процессах, разбив документы по диапазонам id")
+    search.set_defaults(handler=cmd_search)
+
+    advanced = commands.add_parser('advanced-search', help="поиск документов по фильтрам")
+    advanced.add_argument('--status')
+    advanced.add_argument('--category')
+    advanced.add_argument('--author')
+    advanced.add_argument('--date-from')
+    advanced.add_argument('--date-to')
+    advanced.set_defaults(handler=cmd_advanced_search)
+
+    authors = commands.add_parser('authors', help="авторы, похожие на запрос, с учетом опечаток и транслитерации")
+    authors.add_argument('query')
+    authors.add_argument('--limit', type=int, default=10)
+    authors.set_defaults(handler=cmd_authors)
+
+    stats = commands.add_parser('stats', help="статистика проектов")
+    stats.set_defaults(handler=cmd_stats)
+
+    analytics = commands.add_parser('analytics', help="аналитика отклонений сроков по портфелю")
+    analytics.add_argument('report', choices=['deviations', 'trend', 'managers'])
+    analytics.add_argument('--bins', type=int, default=20)
+    analytics.add_argument('--tolerance', type=int, default=0, help="допустимое опоздание в днях")
+    analytics.set_defaults(handler=cmd_analytics)
+
+    export = commands.add_parser('export', help="выгрузка в JSON lines")
+    export.add_argument('entity', choices=['documents', 'projects'])
+    export.set_defaults(handler=cmd_export)
+
+    import_ = commands.add_parser('import', help="загрузка из JSON lines")
+    import_.add_argument('entity', choices=['documents', 'projects'])
+    import_.add_argument('--file', help="файл JSON lines, по умолчанию stdin")
+    import_.set_defaults(handler=cmd_import)
+
+    report = commands.add_parser('report', help="отчет в CSV или XLSX с выбором колонок и фильтрами")
+    report.add_argument('entity', choices=['documents', 'projects'])
+    report.add_argument('--output', '-o', required=True, help="файл .csv или .xlsx")
+    report.add_argument('--columns', nargs='*', help="колонки отчета, по умолчанию все")
+    report.add_argument('--status')
+    report.add_argument('--category', help="документы: категория")
+    report.add_argument('--author', help="документы: часть имени автора")
+    report.add_argument('--type', help="проекты: тип")
+    report.add_argument('--manager', help="проекты: часть имени руководителя")
+    report.add_argument('--date-from')
+    report.add_argument('--date-to')
+    report.add_argument('--quiet', action='store_true', help="не выводить ход выгрузки в stderr")
+    report.set_defaults(handler=cmd_report)
+
+    transition = commands.add_parser('transition', help="массовая смена статуса по таблице допустимых переходов")
+    transition.add_argument('entity', nargs='?', choices=['documents', 'projects', 'routes'], default='documents')
+    transition.add_argument('--to', required=True)
+    transition.add_argument('--from', dest='from_status')
+    transition.add_argument('--ids', type=int, nargs='*')
+    transition.add_argument('--force', action='store_true', help="документы: сменить статус без проверки переходов")
+    transition.set_defaults(handler=cmd_transition)
+
+    index = commands.add_parser('index', help="проиндексировать содержимое новых и измененных файлов")
+    index.add_argument('--blobs', default="blobs", help="каталог хранилища файлов")
+    index.add_argument('--base-dir', default="", help="каталог для относительных путей file_path")
+    index.add_argument('--workers', type=int, default=2)
+    index.set_defaults(handler=cmd_index)
+
+    backup = commands.add_parser('backup', help="онлайн-копия обеих баз")
+    backup.add_argument('--dir', default="backups")
+    backup.add_argument('--pages', type=int, default=256, help="страниц за шаг копирования")
+    backup.add_argument('--list', action='store_true', help="список имеющихся копий")
+    backup.set_defaults(handler=cmd_backup)
+
+    restore = commands.add_parser('restore', help="восстановление из копии")
+    restore.add_argument('--dir', default="backups")
+    restore.add_argument('--pages', type=int, default=256)
+    restore.add_argument('--snapshot', help="идентификатор копии")
+    restore.add_argument('--at', help="последняя копия не позже момента 'ГГГГ-ММ-ДД ЧЧ:ММ:СС'")
+    restore.add_argument('--no-safety-copy', action='store_true', help="не сохранять текущее состояние перед восстановлением")
+    restore.set_defaults(handler=cmd_restore)
+
+    scheduler = commands.add_parser('scheduler', help="публикация и истечение срока действия документов по расписанию")
+    scheduler.add_argument('--once', action='store_true', help="применить наступившие переходы и выйти")
+    scheduler.set_defaults(handler=cmd_scheduler)
+
+    migrate = commands.add_parser('migrate', help="применить миграции схемы")
+    migrate.add_argument('--dry-run', action='store_true', help="показать план без изменений")
+    migrate.set_defaults(handler=cmd_migrate)
+
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        args.handler(args)
+    except BrokenPipeError:
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except (ValueError, KeyError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 2
+    return 0
@@ -0,0 +1,2 @@
+from .instrumentation import Instrumentation, OperationStats, instrumentation, timed
+from .sql_trace import SqlTracer, QueryRecord, sql_tracer, ui_action
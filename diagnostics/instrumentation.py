@@ -0,0 +1,96 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict
+
+class OperationStats:
+    def __init__(self, max_samples: int = 10000):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=max_samples)
+
+    def add(self, elapsed: float):
+        self.count += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+        self.samples.append(elapsed)
+
+    def percentile(self, percent: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, int(round(percent / 100 * len(ordered))) - 1))
+        return ordered[index]
+
+    def summary(self) -> Dict:
+        return {
+            'count': self.count,
+            'total_ms': self.total * 1000,
+            'p50_ms': self.percentile(50) * 1000,
+            'p95_ms': self.percentile(95) * 1000,
+            'max_ms': self.max * 1000
+        }
+
+class Instrumentation:
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.operations: Dict[str, OperationStats] = {}
+        self.lock = threading.Lock()
+
+    def record(self, name: str, elapsed: float):
+        with self.lock:
+            stats = self.operations.get(name)
+            if stats is None:
+                stats = self.operations[name] = OperationStats()
+            stats.add(elapsed)
+
+    @contextmanager
+    def timer(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def timed(self, name: str) -> Callable:
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - started)
+            return wrapper
+        return decorator
+
+    def summary(self) -> Dict[str, Dict]:
+        with self.lock:
+            return {name: stats.summary() for name, stats in sorted(self.operations.items())}
+
+    def status_line(self, limit: int = 3) -> str:
+        slowest = sorted(self.summary().items(), key=lambda item: item[1]['p95_ms'], reverse=True)[:limit]
+        return " | ".join(f"{name}: p95 {stats['p95_ms']:.1f} мс ({stats['count']})" for name, stats in slowest)
+
+    def export_json(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'exported_at': time.time(), 'operations': self.summary()}, f, ensure_ascii=False, indent=2)
+
+    def reset(self):
+        with self.lock:
+            self.operations.clear()
+
+instrumentation = Instrumentation(enabled=os.environ.get('APP_PROFILE') == '1')
+
+def timed(name: str) -> Callable:
+    return instrumentation.timed(name)
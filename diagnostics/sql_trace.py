@@ -0,0 +1,237 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, List, Optional
+
+NO_ACTION = "(вне действия)"
+
+def parameters_shape(parameters) -> str:
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(sorted(parameters)) + "}"
+    types = [type(value).__name__ for value in parameters]
+    if len(types) > 3 and len(set(types)) == 1:
+        return f"({len(types)}×{types[0]})"
+    return "(" + ", ".join(types) + ")"
+
+class QueryRecord:
+    def __init__(self, sql: str, params_shape: str, action: str):
+        self.sql = " ".join(sql.split())
+        self.params_shape = params_shape
+        self.action = action
+        self.rows = 0
+        self.elapsed = 0.0
+        self.started_at = time.time()
+
+    def to_dict(self) -> Dict:
+        return {
+            'sql': self.sql,
+            'params': self.params_shape,
+            'rows': self.rows,
+            'elapsed_ms': self.elapsed * 1000,
+            'action': self.action,
+            'started_at': self.started_at
+        }
+
+class TracedCursor(sqlite3.Cursor):
+    def __init__(self, connection):
+        super().__init__(connection)
+        self.record: Optional[QueryRecord] = None
+        connection.cursors.add(self)
+
+    def _timed(self, record: QueryRecord, method, *args):
+        self.finish()
+        self.record = record
+        started = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            record.elapsed += time.perf_counter() - started
+
+    def execute(self, sql, parameters=()):
+        record = self.connection.tracer.start_query(sql, parameters_shape(parameters))
+        return self._timed(record, super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        seq_of_parameters = list(seq_of_parameters)
+        shape = f"{len(seq_of_parameters)}×" + (parameters_shape(seq_of_parameters[0]) if seq_of_parameters else "()")
+        record = self.connection.tracer.start_query(sql, shape)
+        return self._timed(record, super().executemany, sql, seq_of_parameters)
+
+    def _fetch(self, method, *args):
+        started = time.perf_counter()
+        result = method(*args)
+        if self.record is not None:
+            self.record.elapsed += time.perf_counter() - started
+            if isinstance(result, list):
+                self.record.rows += len(result)
+            elif result is not None:
+                self.record.rows += 1
+        return result
+
+    def fetchone(self):
+        return self._fetch(super().fetchone)
+
+    def fetchmany(self, size=None):
+        return self._fetch(super().fetchmany, size if size is not None else self.arraysize)
+
+    def fetchall(self):
+        return self._fetch(super().fetchall)
+
+    def finish(self):
+        if self.record is not None:
+            if self.record.rows == 0 and self.rowcount > 0:
+                self.record.rows = self.rowcount
+            self.connection.tracer.finish_query(self.record)
+            self.record = None
+
+    def close(self):
+        self.finish()
+        super().close()
+
+class TracedConnection(sqlite3.Connection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tracer: Optional['SqlTracer'] = None
+        self.cursors = weakref.WeakSet()
+
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def close(self):
+        for cursor in list(self.cursors):
+            cursor.finish()
+        super().close()
+
+class SqlTracer:
+    def __init__(self, capacity: int = 1000, slow_threshold_ms: float = 100.0,
+                 slow_log_path: str = "slow_queries.log"):
+        self.enabled = False
+        self.records = deque(maxlen=capacity)
+        self.slow_threshold_ms = slow_threshold_ms
+        self.slow_log_path = slow_log_path
+        self.actions: Dict[str, Dict] = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.logger = None
+        self.handler = None
+
+    def enable(self, slow_threshold_ms: Optional[float] = None, slow_log_path: Optional[str] = None):
+        if slow_threshold_ms is not None:
+            self.slow_threshold_ms = slow_threshold_ms
+        if slow_log_path is not None and slow_log_path != self.slow_log_path:
+            self._close_handler()
+            self.slow_log_path = slow_log_path
+        if self.handler is None:
+            import logging
+            self.logger = logging.getLogger("sql.slow")
+            self.logger.propagate = False
+            self.handler = logging.FileHandler(self.slow_log_path, encoding='utf-8', delay=True)
+            self.handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self.logger.addHandler(self.handler)
+            self.logger.setLevel(logging.WARNING)
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        self._close_handler()
+
+    def _close_handler(self):
+        if self.handler is not None:
+            self.logger.removeHandler(self.handler)
+            self.handler.close()
+            self.handler = None
+            self.logger = None
+
+    def connect(self, db_path: str, **kwargs) -> TracedConnection:
+        conn = sqlite3.connect(db_path, factory=TracedConnection, **kwargs)
+        conn.tracer = self
+        conn.set_trace_callback(self._on_statement)
+        return conn
+
+    def current_action(self) -> str:
+        return getattr(self.local, 'action', None) or NO_ACTION
+
+    @contextmanager
+    def action(self, name: str):
+        if getattr(self.local, 'action', None) is not None:
+            yield
+            return
+        self.local.action = name
+        try:
+            yield
+        finally:
+            self.local.action = None
+
+    def ui_action(self, name: str) -> Callable:
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.action(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _action_stats(self, action: str) -> Dict:
+        stats = self.actions.get(action)
+        if stats is None:
+            stats = self.actions[action] = {'statements': 0, 'queries': 0, 'rows': 0, 'total_ms': 0.0}
+        return stats
+
+    def _on_statement(self, statement: str):
+        with self.lock:
+            self._action_stats(self.current_action())['statements'] += 1
+
+    def start_query(self, sql: str, params_shape: str) -> QueryRecord:
+        record = QueryRecord(sql, params_shape, self.current_action())
+        with self.lock:
+            self.records.append(record)
+        return record
+
+    def finish_query(self, record: QueryRecord):
+        with self.lock:
+            stats = self._action_stats(record.action)
+            stats['queries'] += 1
+            stats['rows'] += record.rows
+            stats['total_ms'] += record.elapsed * 1000
+        if self.logger is not None and record.elapsed * 1000 >= self.slow_threshold_ms:
+            self.logger.warning("%.1f ms rows=%d params=%s action=%s sql=%s", record.elapsed * 1000,
+                                record.rows, record.params_shape, record.action, record.sql)
+
+    def recent(self, limit: int = 100) -> List[Dict]:
+        with self.lock:
+            return [record.to_dict() for record in list(self.records)[-limit:]]
+
+    def report(self) -> Dict[str, Dict]:
+        with self.lock:
+            return {action: dict(stats) for action, stats in sorted(self.actions.items())}
+
+    def export_json(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'actions': self.report(), 'recent': self.recent(len(self.records))},
+                      f, ensure_ascii=False, indent=2)
+
+    def reset(self):
+        with self.lock:
+            self.records.clear()
+            self.actions.clear()
+
+sql_tracer = SqlTracer(slow_threshold_ms=float(os.environ.get('APP_SLOW_QUERY_MS', 100)))
+if os.environ.get('APP_SQL_TRACE') == '1':
+    sql_tracer.enable()
+
+def ui_action(name: str) -> Callable:
+    return sql_tracer.ui_action(name)
@@ -1,11 +1,20 @@
+import os
+import threading
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, filedialog, messagebox
 from repositories.project_repository import ProjectRepository
 from repositories.document_repository import DocumentRepository
+from repositories.project_document_repository import ProjectDocumentRepository
+from repositories.write_queue import WriteQueue
+from repositories.blob_store import BlobStore
 from services.project_service import ProjectService
 from services.document_service import DocumentService
+from services.content_indexer import ContentIndexer
+from services.status_scheduler import StatusScheduler
 from ui.project_view import ProjectView
-from ui.document_view import DocumentView
+from ui.refresh_scheduler import RefreshScheduler
+from diagnostics.instrumentation import instrumentation
+from diagnostics.sql_trace import sql_tracer
 
 class MainApplication:
     def __init__(self, root):
@@ -14,11 +23,22 @@ class MainApplication:
         
         self.project_repository = ProjectRepository("projects.db")
         self.document_repository = DocumentRepository("documents.db")
+        self.write_queue = WriteQueue()
         
-        self.project_service = ProjectService(self.project_repository)
-        self.document_service = DocumentService(self.document_repository)
+        self.project_service = ProjectService(
+            self.project_repository,
+            ProjectDocumentRepository(self.project_repository, self.document_repository),
+            self.write_queue
+        )
+        self.blob_store = BlobStore("blobs", self.document_repository.db_path)
+        self.status_scheduler = StatusScheduler(self.document_repository, self.on_status_transition, self.root)
+        self.document_service = DocumentService(self.document_repository, self.write_queue, self.blob_store,
+                                                self.status_scheduler)
+        self.content_indexer = ContentIndexer(self.document_repository, self.blob_store)
+        self.content_indexer.start()
         
         self.setup_ui()
+        self.status_scheduler.start()
 
     def setup_app(self):
         self.root.title("Система управления проектами и документами")
@@ -28,37 +48,164 @@ class MainApplication:
         style.theme_use('clam')
 
     def setup_ui(self):
+        self.status_var = tk.StringVar()
+        self.status_job = None
+        self.status_bar = ttk.Label(self.root, textvariable=self.status_var, anchor="w")
+        
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         project_frame = ttk.Frame(self.notebook)
-        document_frame = ttk.Frame(self.notebook)
+        self.document_frame = ttk.Frame(self.notebook)
         
         self.notebook.add(project_frame, text="Управление проектами")
-        self.notebook.add(document_frame, text="Управление документами")
+        self.notebook.add(self.document_frame, text="Управление документами")
         
-        self.project_view = ProjectView(project_frame, self.project_service)
-        self.document_view = DocumentView(document_frame, self.document_service)
+        self.refresh_scheduler = RefreshScheduler(self.root)
+        self.project_view = ProjectView(project_frame, self.project_service, self.refresh_scheduler)
+        self.document_view = None
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
         
         self.setup_menu()
 
+    def on_tab_changed(self, event):
+        if self.document_view is None and self.notebook.select() == str(self.document_frame):
+            self.ensure_document_view()
+
+    def ensure_document_view(self):
+        if self.document_view is None:
+            from ui.document_view import DocumentView
+            self.document_view = DocumentView(self.document_frame, self.document_service, self.refresh_scheduler)
+        return self.document_view
+
+    def on_status_transition(self, applied):
+        if self.document_view is not None:
+            self.document_view.refresh_documents([doc_id for doc_id, _ in applied])
+
     def setup_menu(self):
         menubar = tk.Menu(self.root)
         self.root.config(menu=menubar)
         
         file_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Файл", menu=file_menu)
+        file_menu.add_command(label="Экспорт профиля...", command=self.export_profile)
+        file_menu.add_command(label="Отчет по SQL-запросам...", command=self.export_sql_report)
+        file_menu.add_separator()
+        file_menu.add_command(label="Резервная копия", command=self.create_backup)
+        file_menu.add_command(label="Восстановить из копии...", command=self.restore_backup)
+        file_menu.add_separator()
         file_menu.add_command(label="Выход", command=self.root.quit)
         
         view_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Вид", menu=view_menu)
         view_menu.add_command(label="Проекты", command=lambda: self.notebook.select(0))
         view_menu.add_command(label="Документы", command=lambda: self.notebook.select(1))
+        view_menu.add_separator()
+        self.profiling_var = tk.BooleanVar(value=instrumentation.enabled)
+        view_menu.add_checkbutton(label="Профилирование", variable=self.profiling_var,
+                                  command=self.toggle_profiling)
+        self.sql_trace_var = tk.BooleanVar(value=sql_tracer.enabled)
+        view_menu.add_checkbutton(label="Трассировка SQL", variable=self.sql_trace_var,
+                                  command=self.toggle_sql_trace)
+        if instrumentation.enabled:
+            self.toggle_profiling()
         
         help_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Справка", menu=help_menu)
         help_menu.add_command(label="О программе", command=self.show_about)
 
+    def toggle_profiling(self):
+        instrumentation.enabled = self.profiling_var.get()
+        if self.status_job is not None:
+            self.root.after_cancel(self.status_job)
+            self.status_job = None
+        if instrumentation.enabled:
+            self.status_bar.pack(side=tk.BOTTOM, fill=tk.X, padx=10, before=self.notebook)
+            self.update_status_bar()
+        else:
+            self.status_bar.pack_forget()
+
+    def update_status_bar(self):
+        self.status_var.set(instrumentation.status_line() or "Профилирование включено")
+        self.status_job = self.root.after(1000, self.update_status_bar)
+
+    def export_profile(self):
+        path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", "*.json")])
+        if path:
+            instrumentation.export_json(path)
+
+    def toggle_sql_trace(self):
+        if self.sql_trace_var.get():
+            sql_tracer.enable()
+        else:
+            sql_tracer.disable()
+
+    def export_sql_report(self):
+        path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", "*.json")])
+        if path:
+            sql_tracer.export_json(path)
+
+    def backup_service(self):
+        from services.backup_service import BackupService
+        return BackupService(self.project_repository.db_path, self.document_repository.db_path)
+
+    def run_backup_task(self, title: str, task, on_done):
+        state = {'progress': "", 'result': None, 'error': None, 'done': False}
+
+        def progress(name, copied, total):
+            state['progress'] = f"{title}: {name} {copied}/{total} страниц"
+
+        def worker():
+            try:
+                state['result'] = task(progress)
+            except Exception as e:
+                state['error'] = e
+            state['done'] = True
+
+        def poll():
+            if not state['done']:
+                self.status_var.set(state['progress'] or title)
+                self.root.after(200, poll)
+                return
+            if not instrumentation.enabled:
+                self.status_bar.pack_forget()
+            if state['error'] is not None:
+                messagebox.showerror("Ошибка", f"{title}: {state['error']}")
+            else:
+                on_done(state['result'])
+
+        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X, padx=10, before=self.notebook)
+        threading.Thread(target=worker, name="backup", daemon=True).start()
+        poll()
+
+    def create_backup(self):
+        service = self.backup_service()
+        self.run_backup_task("Резервное копирование", lambda progress: service.create_snapshot(progress),
+                             lambda snapshot: messagebox.showinfo("Резервная копия", f"Копия {snapshot.snapshot_id} создана"))
+
+    def restore_backup(self):
+        service = self.backup_service()
+        path = filedialog.askdirectory(initialdir=service.backup_dir, mustexist=True)
+        if not path:
+            return
+        try:
+            snapshot = service.find_snapshot(snapshot_id=os.path.basename(os.path.normpath(path)))
+        except ValueError as e:
+            messagebox.showerror("Ошибка", str(e))
+            return
+        if not messagebox.askyesno("Восстановление", f"Восстановить данные на {snapshot.created_at:%d.%m.%Y %H:%M:%S}? "
+                                   "Текущее состояние будет сохранено в отдельную копию."):
+            return
+        self.write_queue.flush()
+
+        def done(safety):
+            self.project_view.refresh_projects()
+            if self.document_view is not None:
+                self.document_view.refresh_documents()
+            messagebox.showinfo("Восстановление", "Данные восстановлены")
+
+        self.run_backup_task("Восстановление", lambda progress: service.restore(snapshot, progress), done)
+
     def show_about(self):
         about_text = """
 Система управления проектами и документами
@@ -76,6 +223,9 @@ def main():
     root = tk.Tk()
     app = MainApplication(root)
     root.mainloop()
+    app.status_scheduler.stop()
+    app.content_indexer.stop()
+    app.write_queue.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
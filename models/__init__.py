@@ -1,3 +1,3 @@
 from .enums import ProjectStatus, ProjectType, DocumentStatus, DocumentCategory, RouteStatus
-from .project import Project, ProjectStage, Milestone
+from .project import Project, ProjectStage, Milestone, Task
 from .document import Document, DocumentVersion, ApprovalRoute, ApprovalStage
\ No newline at end of file
@@ -15,6 +15,11 @@ class Document:
         self.description = ""
         self.comments = []
         self.file_path = ""
+        self.content_hash = None
+        self.valid_until = None
+        self.publish_at = None
+        self.search_terms = None
+        self.search_text = None
         self.previous_versions = []
 
 class DocumentVersion:
@@ -24,6 +29,7 @@ class DocumentVersion:
         self.author = author
         self.changes = changes
         self.version_date = datetime.now()
+        self.content_hash = None
 
 class ApprovalRoute:
     def __init__(self, route_id: int, name: str, status: str):
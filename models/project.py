@@ -36,4 +36,13 @@ class Milestone:
         self.milestone_id = milestone_id
         self.name = name
         self.due_date = due_date
-        self.completed = completed
\ No newline at end of file
+        self.completed = completed
+
+class Task:
+    def __init__(self, task_id: int, name: str, stage_id: int, duration: int,
+                 predecessors: Optional[List[int]] = None):
+        self.task_id = task_id
+        self.name = name
+        self.stage_id = stage_id
+        self.duration = duration
+        self.predecessors = list(predecessors or [])
\ No newline at end of file
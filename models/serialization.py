@@ -0,0 +1,82 @@
+from datetime import datetime
+from typing import Dict, Optional
+from .document import Document
+from .project import Project
+from .enums import DocumentStatus, DocumentCategory, ProjectStatus, ProjectType
+
+def _format_date(value: Optional[datetime]) -> Optional[str]:
+    return value.strftime('%Y-%m-%d') if value else None
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    return datetime.strptime(value[:10], '%Y-%m-%d') if value else None
+
+def _format_timestamp(value: Optional[datetime]) -> Optional[str]:
+    return value.strftime('%Y-%m-%d %H:%M:%S') if value else None
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    return datetime.strptime(value, '%Y-%m-%d %H:%M:%S') if value else None
+
+def document_to_dict(document: Document) -> Dict:
+    return {
+        'id': document.doc_id,
+        'name': document.name,
+        'category': document.category.value,
+        'status': document.status.value,
+        'author': document.author,
+        'version': document.version,
+        'creation_date': _format_date(document.creation_date),
+        'description': document.description,
+        'file_path': document.file_path,
+        'content_hash': document.content_hash,
+        'valid_until': _format_timestamp(document.valid_until),
+        'publish_at': _format_timestamp(document.publish_at)
+    }
+
+def document_from_dict(data: Dict) -> Document:
+    document = Document(
+        doc_id=data.get('id') or 0,
+        name=data['name'],
+        category=DocumentCategory(data['category']),
+        status=DocumentStatus(data.get('status', DocumentStatus.DRAFT.value)),
+        author=data['author'],
+        version=data.get('version', "1.0")
+    )
+    if 'creation_date' in data:
+        document.creation_date = _parse_date(data['creation_date'])
+    document.description = data.get('description') or ""
+    document.file_path = data.get('file_path') or ""
+    document.content_hash = data.get('content_hash')
+    document.valid_until = _parse_timestamp(data.get('valid_until'))
+    document.publish_at = _parse_timestamp(data.get('publish_at'))
+    return document
+
+def project_to_dict(project: Project) -> Dict:
+    return {
+        'id': project.project_id,
+        'name': project.name,
+        'type': project.project_type.value,
+        'status': project.status.value,
+        'start_date': _format_date(project.start_date),
+        'end_date': _format_date(project.end_date),
+        'actual_start': _format_date(project.actual_start),
+        'actual_end': _format_date(project.actual_end),
+        'manager': project.manager,
+        'description': project.description,
+        'progress': project.progress
+    }
+
+def project_from_dict(data: Dict) -> Project:
+    project = Project(
+        project_id=data.get('id') or 0,
+        name=data['name'],
+        project_type=ProjectType(data['type']),
+        status=ProjectStatus(data.get('status', ProjectStatus.CREATED.value)),
+        start_date=_parse_date(data['start_date']),
+        end_date=_parse_date(data['end_date']),
+        manager=data['manager'],
+        description=data.get('description') or ""
+    )
+    project.actual_start = _parse_date(data.get('actual_start'))
+    project.actual_end = _parse_date(data.get('actual_end'))
+    project.progress = data.get('progress', 0)
+    return project
@@ -0,0 +1,79 @@
+from enum import Enum
+from typing import Dict, FrozenSet, Type
+from .enums import DocumentStatus, ProjectStatus, RouteStatus
+
+class TransitionOutcome(Enum):
+    APPLIED = "Переход выполнен"
+    UNCHANGED = "Статус не изменился"
+    FORBIDDEN = "Переход запрещен"
+    NOT_FOUND = "Объект не найден"
+
+def _table(spec: Dict[Enum, tuple]) -> Dict[Enum, FrozenSet[Enum]]:
+    return {status: frozenset(targets) for status, targets in spec.items()}
+
+D = DocumentStatus
+DOCUMENT_TRANSITIONS = _table({
+    D.DRAFT: (D.APPROVAL, D.PUBLISHED, D.PUBLICATION_WAITING, D.DELETED),
+    D.APPROVAL: (D.APPROVED, D.REFINEMENT, D.DRAFT),
+    D.APPROVED: (D.APPROVAL_WAITING, D.PUBLISHED, D.PUBLICATION_WAITING, D.REFINEMENT),
+    D.APPROVAL_WAITING: (D.APPROVED_FINAL, D.REFINEMENT),
+    D.APPROVED_FINAL: (D.PUBLISHED, D.PUBLICATION_WAITING),
+    D.PUBLICATION_WAITING: (D.PUBLISHED, D.DRAFT),
+    D.PUBLISHED: (D.VERIFICATION, D.UPDATING, D.RECALLED, D.EXPIRED, D.ARCHIVED),
+    D.VERIFICATION: (D.PUBLISHED, D.REFINEMENT, D.RECALLED),
+    D.REFINEMENT: (D.APPROVAL, D.DRAFT, D.DELETED),
+    D.UPDATING: (D.UPDATED, D.PUBLISHED, D.REFINEMENT),
+    D.UPDATED: (D.APPROVAL, D.PUBLISHED, D.PUBLICATION_WAITING),
+    D.RECALLED: (D.DRAFT, D.ARCHIVED, D.DELETED),
+    D.EXPIRED: (D.UPDATING, D.ARCHIVED),
+    D.ARCHIVED: (D.DRAFT, D.DELETED),
+    D.DELETED: (),
+})
+
+P = ProjectStatus
+PROJECT_TRANSITIONS = _table({
+    P.CREATED: (P.PLANNED, P.CANCELLED),
+    P.PLANNED: (P.IN_PROGRESS, P.APPROVAL, P.FROZEN, P.CANCELLED),
+    P.IN_PROGRESS: (P.APPROVAL, P.VERIFICATION, P.FROZEN, P.COMPLETED, P.CANCELLED),
+    P.APPROVAL: (P.APPROVAL_WAITING, P.IN_PROGRESS, P.REQUIRES_REFINEMENT, P.CANCELLED),
+    P.APPROVAL_WAITING: (P.PLANNED, P.IN_PROGRESS, P.REQUIRES_REFINEMENT, P.CANCELLED),
+    P.VERIFICATION: (P.IN_PROGRESS, P.COMPLETED, P.REQUIRES_REFINEMENT),
+    P.REQUIRES_REFINEMENT: (P.IN_PROGRESS, P.APPROVAL, P.VERIFICATION, P.CANCELLED),
+    P.FROZEN: (P.PLANNED, P.IN_PROGRESS, P.CANCELLED),
+    P.COMPLETED: (P.IN_PROGRESS, P.CLOSED, P.ARCHIVED),
+    P.CLOSED: (P.ARCHIVED,),
+    P.ARCHIVED: (),
+    P.CANCELLED: (P.ARCHIVED,),
+})
+
+R = RouteStatus
+ROUTE_TRANSITIONS = _table({
+    R.DRAFT: (R.APPROVAL,),
+    R.APPROVAL: (R.APPROVED, R.REJECTED, R.EDITING),
+    R.EDITING: (R.APPROVAL, R.DRAFT),
+    R.REJECTED: (R.EDITING, R.DRAFT),
+    R.APPROVED: (R.ACTIVE, R.EDITING),
+    R.ACTIVE: (R.EDITING,),
+})
+
+del D, P, R
+
+TRANSITIONS: Dict[Type[Enum], Dict[Enum, FrozenSet[Enum]]] = {
+    DocumentStatus: DOCUMENT_TRANSITIONS,
+    ProjectStatus: PROJECT_TRANSITIONS,
+    RouteStatus: ROUTE_TRANSITIONS,
+}
+
+SOURCES: Dict[Type[Enum], Dict[Enum, FrozenSet[Enum]]] = {
+    enum_cls: {target: frozenset(s for s, targets in table.items() if target in targets) for target in enum_cls}
+    for enum_cls, table in TRANSITIONS.items()
+}
+
+def allowed_targets(status: Enum) -> FrozenSet[Enum]:
+    return TRANSITIONS[type(status)][status]
+
+def allowed_sources(target: Enum) -> FrozenSet[Enum]:
+    return SOURCES[type(target)][target]
+
+def can_transition(source: Enum, target: Enum) -> bool:
+    return target in TRANSITIONS[type(source)][source]
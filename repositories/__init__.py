@@ -1,2 +1,14 @@
 from .project_repository import ProjectRepository
-from .document_repository import DocumentRepository
\ No newline at end of file
+from .document_repository import DocumentRepository
+
+def __getattr__(name):
+    if name in ('ConnectionPool', 'connect'):
+        from . import connection
+        return getattr(connection, name)
+    if name == 'ProjectDocumentRepository':
+        from .project_document_repository import ProjectDocumentRepository
+        return ProjectDocumentRepository
+    if name == 'WriteQueue':
+        from .write_queue import WriteQueue
+        return WriteQueue
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,117 @@
+import hashlib
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Tuple
+from diagnostics.instrumentation import timed
+from repositories.connection import connect
+
+CHUNK_SIZE = 1024 * 1024
+
+class BlobStore:
+    def __init__(self, root: str, db_path: str):
+        self.root = root
+        self.db_path = db_path
+        os.makedirs(os.path.join(self.root, "tmp"), exist_ok=True)
+
+    def path(self, content_hash: str) -> str:
+        return os.path.join(self.root, content_hash[:2], content_hash[2:])
+
+    @timed("BlobStore.put_file")
+    def put_file(self, path: str) -> Tuple[str, int]:
+        with open(path, 'rb') as f:
+            return self.put_stream(f)
+
+    def put_stream(self, stream: BinaryIO) -> Tuple[str, int]:
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp_path = tempfile.mkstemp(dir=os.path.join(self.root, "tmp"))
+        try:
+            with os.fdopen(fd, 'wb') as temp:
+                while True:
+                    chunk = stream.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    temp.write(chunk)
+                    size += len(chunk)
+                temp.flush()
+                os.fsync(temp.fileno())
+            content_hash = digest.hexdigest()
+            self._commit_blob(content_hash, size, temp_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+        return content_hash, size
+
+    def _commit_blob(self, content_hash: str, size: int, temp_path: str):
+        conn = connect(self.db_path)
+        c = conn.cursor()
+        c.execute('BEGIN IMMEDIATE')
+        c.execute('''
+            INSERT INTO blobs (hash, size) VALUES (?, ?)
+            ON CONFLICT(hash) DO UPDATE SET created_at = CURRENT_TIMESTAMP
+        ''', (content_hash, size))
+        target = self.path(content_hash)
+        if not os.path.exists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(temp_path, target)
+        conn.commit()
+        conn.close()
+
+    def exists(self, content_hash: str) -> bool:
+        return os.path.exists(self.path(content_hash))
+
+    def size(self, content_hash: str) -> int:
+        return os.path.getsize(self.path(content_hash))
+
+    def refcount(self, content_hash: str) -> int:
+        conn = connect(self.db_path)
+        c = conn.cursor()
+        c.execute('SELECT refcount FROM blobs WHERE hash=?', (content_hash,))
+        row = c.fetchone()
+        conn.close()
+        return row[0] if row else 0
+
+    @contextmanager
+    def open(self, content_hash: str) -> Iterator[memoryview]:
+        with open(self.path(content_hash), 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                yield memoryview(b"")
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    yield view
+                finally:
+                    view.release()
+
+    def read_range(self, content_hash: str, offset: int = 0, length: int = 4096) -> bytes:
+        with self.open(content_hash) as view:
+            return bytes(view[offset:offset + length])
+
+    def verify(self, content_hash: str) -> bool:
+        digest = hashlib.sha256()
+        with self.open(content_hash) as view:
+            for offset in range(0, len(view), CHUNK_SIZE):
+                digest.update(view[offset:offset + CHUNK_SIZE])
+        return digest.hexdigest() == content_hash
+
+    @timed("BlobStore.collect_garbage")
+    def collect_garbage(self, grace_seconds: int = 3600) -> Tuple[int, int]:
+        conn = connect(self.db_path)
+        c = conn.cursor()
+        c.execute('BEGIN IMMEDIATE')
+        c.execute('''
+            SELECT hash, size FROM blobs
+            WHERE refcount <= 0 AND created_at <= datetime('now', ?)
+        ''', (f'-{grace_seconds} seconds',))
+        garbage = c.fetchall()
+        for content_hash, _ in garbage:
+            c.execute('DELETE FROM blobs WHERE hash=?', (content_hash,))
+            if self.exists(content_hash):
+                os.unlink(self.path(content_hash))
+        conn.commit()
+        conn.close()
+        return len(garbage), sum(size for _, size in garbage)
@@ -0,0 +1,139 @@
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+from urllib.parse import quote
+from diagnostics.sql_trace import sql_tracer
+
+def connect(db_path: str, **kwargs) -> sqlite3.Connection:
+    if sql_tracer.enabled:
+        return sql_tracer.connect(db_path, **kwargs)
+    return sqlite3.connect(db_path, **kwargs)
+
+def read_only_uri(db_path: str) -> str:
+    return f"file:{quote(os.path.abspath(db_path))}?mode=ro"
+
+def enable_wal(db_path: str):
+    conn = sqlite3.connect(db_path)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.close()
+
+class PooledConnection:
+    def __init__(self, pool: 'ConnectionPool', conn: sqlite3.Connection):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self):
+        if self._conn is not None:
+            self._pool.release(self._conn)
+            self._conn = None
+
+class ConnectionPool:
+    def __init__(self, db_path: str, size: int = 4, timeout: float = 30.0, **connect_kwargs):
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self.connect_kwargs = dict(connect_kwargs, check_same_thread=False)
+        self.idle = queue.Queue()
+        self.created = 0
+        self.lock = threading.Lock()
+
+    def acquire(self) -> PooledConnection:
+        try:
+            conn = self.idle.get_nowait()
+        except queue.Empty:
+            with self.lock:
+                can_create = self.created < self.size
+                if can_create:
+                    self.created += 1
+            if can_create:
+                conn = connect(self.db_path, **self.connect_kwargs)
+            else:
+                try:
+                    conn = self.idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise TimeoutError(f"Нет свободных соединений с {self.db_path}")
+        return PooledConnection(self, conn)
+
+    def release(self, conn: sqlite3.Connection):
+        if conn.in_transaction:
+            conn.rollback()
+        self.idle.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                break
+        self.created = 0
+
+
+class ReadOnlyPool(ConnectionPool):
+    def __init__(self, db_path: str, size: int = 4, timeout: float = 30.0):
+        enable_wal(db_path)
+        super().__init__(read_only_uri(db_path), size, timeout, uri=True)
+        self.source_path = db_path
+
+class SnapshotConnection:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+class SnapshotScope:
+    def __init__(self, db_path: str, read_pool: Optional[ReadOnlyPool] = None):
+        self.db_path = db_path
+        self.read_pool = read_pool
+        self.local = threading.local()
+        self.wal_enabled = read_pool is not None
+        self.attachments: Dict[str, str] = {}
+
+    def attach(self, alias: str, db_path: str):
+        enable_wal(db_path)
+        self.attachments[alias] = db_path
+
+    def current(self) -> Optional[SnapshotConnection]:
+        return getattr(self.local, 'conn', None)
+
+    def _open(self):
+        if self.read_pool is not None:
+            return self.read_pool.acquire()
+        if not self.wal_enabled:
+            enable_wal(self.db_path)
+            self.wal_enabled = True
+        return connect(read_only_uri(self.db_path), uri=True)
+
+    @contextmanager
+    def snapshot(self) -> Iterator[SnapshotConnection]:
+        current = self.current()
+        if current is not None:
+            yield current
+            return
+        conn = self._open()
+        try:
+            for alias, path in self.attachments.items():
+                if conn.execute('SELECT 1 FROM pragma_database_list WHERE name=?', (alias,)).fetchone() is None:
+                    conn.execute(f'ATTACH DATABASE ? AS {alias}', (read_only_uri(path),))
+            conn.execute('BEGIN')
+            for schema in ('main', *self.attachments):
+                conn.execute(f'SELECT COUNT(*) FROM {schema}.sqlite_master').fetchone()
+            self.local.conn = SnapshotConnection(conn)
+            yield self.local.conn
+        finally:
+            self.local.conn = None
+            if conn.in_transaction:
+                conn.rollback()
+            conn.close()
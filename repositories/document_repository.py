@@ -1,19 +1,20 @@
+import json
 import sqlite3
+import threading
 from datetime import datetime
-from typing import List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from models.document import Document, DocumentVersion, ApprovalRoute
 from models.enums import DocumentStatus, DocumentCategory, RouteStatus
+from models.transitions import TransitionOutcome
+from diagnostics.instrumentation import instrumentation, timed
+from repositories.connection import connect, ConnectionPool, ReadOnlyPool, SnapshotScope
+from repositories.migrations import Migration, MigrationRunner, Execute, AddColumn, CreateIndex, Backfill
+from repositories.status_transitions import apply_transition
+from strategies.stemmer import document_terms, document_text, normalize_text, stem_words
 
-class DocumentRepository:
-    def __init__(self, db_path: str):
-        self.db_path = db_path
-        self.init_database()
-
-    def init_database(self):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
-        c.execute('''
+MIGRATIONS = [
+    Migration(1, "Документы, версии и маршруты согласования", [Execute(
+        '''
             CREATE TABLE IF NOT EXISTS documents (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 name TEXT NOT NULL,
@@ -25,9 +26,8 @@ class DocumentRepository:
                 description TEXT,
                 file_path TEXT
             )
-        ''')
-        
-        c.execute('''
+        ''',
+        '''
             CREATE TABLE IF NOT EXISTS document_versions (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 doc_id INTEGER,
@@ -37,17 +37,15 @@ class DocumentRepository:
                 version_date DATE,
                 FOREIGN KEY (doc_id) REFERENCES documents(id)
             )
-        ''')
-        
-        c.execute('''
+        ''',
+        '''
             CREATE TABLE IF NOT EXISTS approval_routes (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 name TEXT NOT NULL,
                 status TEXT NOT NULL
             )
-        ''')
-        
-        c.execute('''
+        ''',
+        '''
             CREATE TABLE IF NOT EXISTS approval_stages (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 route_id INTEGER,
@@ -58,77 +56,549 @@ class DocumentRepository:
                 comment TEXT,
                 FOREIGN KEY (route_id) REFERENCES approval_routes(id)
             )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        '''
+    )]),
+    Migration(2, "Индексы для фильтров по статусу и автору", [
+        CreateIndex("idx_documents_status", "documents", "status"),
+        CreateIndex("idx_documents_author", "documents", "author")
+    ]),
+    Migration(3, "Хранилище содержимого файлов со счетчиками ссылок", [
+        AddColumn("documents", "content_hash", "TEXT"),
+        AddColumn("document_versions", "content_hash", "TEXT"),
+        Execute(
+            '''
+                CREATE TABLE IF NOT EXISTS blobs (
+                    hash TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    refcount INTEGER NOT NULL DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                ) WITHOUT ROWID
+            ''',
+            *(
+                statement
+                for table in ('documents', 'document_versions')
+                for statement in (
+                    f'''
+                        CREATE TRIGGER IF NOT EXISTS {table}_blob_insert AFTER INSERT ON {table}
+                        WHEN NEW.content_hash IS NOT NULL BEGIN
+                            UPDATE blobs SET refcount = refcount + 1 WHERE hash = NEW.content_hash;
+                        END
+                    ''',
+                    f'''
+                        CREATE TRIGGER IF NOT EXISTS {table}_blob_update AFTER UPDATE OF content_hash ON {table}
+                        WHEN OLD.content_hash IS NOT NEW.content_hash BEGIN
+                            UPDATE blobs SET refcount = refcount - 1 WHERE hash = OLD.content_hash;
+                            UPDATE blobs SET refcount = refcount + 1 WHERE hash = NEW.content_hash;
+                        END
+                    ''',
+                    f'''
+                        CREATE TRIGGER IF NOT EXISTS {table}_blob_delete AFTER DELETE ON {table}
+                        WHEN OLD.content_hash IS NOT NULL BEGIN
+                            UPDATE blobs SET refcount = refcount - 1 WHERE hash = OLD.content_hash;
+                        END
+                    '''
+                )
+            )
+        ),
+        CreateIndex("idx_documents_content_hash", "documents", "content_hash")
+    ]),
+    Migration(4, "Полнотекстовый индекс содержимого файлов", [Execute(
+        '''
+            CREATE VIRTUAL TABLE IF NOT EXISTS document_content
+            USING fts5(body, tokenize = 'unicode61 remove_diacritics 2')
+        ''',
+        '''
+            CREATE TABLE IF NOT EXISTS content_index_state (
+                doc_id INTEGER PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                error TEXT
+            )
+        '''
+    )]),
+    Migration(5, "Сроки действия и отложенная публикация документов", [
+        AddColumn("documents", "valid_until", "TIMESTAMP"),
+        AddColumn("documents", "publish_at", "TIMESTAMP"),
+        CreateIndex("idx_documents_valid_until", "documents", "valid_until"),
+        CreateIndex("idx_documents_publish_at", "documents", "publish_at")
+    ]),
+    Migration(6, "Нормализованные основы слов для поиска", [
+        AddColumn("documents", "search_terms", "TEXT"),
+        Execute(
+            '''
+                CREATE VIRTUAL TABLE IF NOT EXISTS document_terms
+                USING fts5(terms, tokenize = 'unicode61 remove_diacritics 0')
+            ''',
+            '''
+                CREATE TRIGGER IF NOT EXISTS documents_terms_insert AFTER INSERT ON documents
+                WHEN NEW.search_terms IS NOT NULL BEGIN
+                    INSERT INTO document_terms(rowid, terms) VALUES (NEW.id, NEW.search_terms);
+                END
+            ''',
+            '''
+                CREATE TRIGGER IF NOT EXISTS documents_terms_update AFTER UPDATE OF search_terms ON documents
+                WHEN OLD.search_terms IS NOT NEW.search_terms BEGIN
+                    DELETE FROM document_terms WHERE rowid = OLD.id;
+                    INSERT INTO document_terms(rowid, terms) SELECT NEW.id, NEW.search_terms
+                    WHERE NEW.search_terms IS NOT NULL;
+                END
+            ''',
+            '''
+                CREATE TRIGGER IF NOT EXISTS documents_terms_delete AFTER DELETE ON documents BEGIN
+                    DELETE FROM document_terms WHERE rowid = OLD.id;
+                END
+            '''
+        ),
+        Backfill("documents", ["name", "author", "description"], ["search_terms"],
+                 transform=lambda row: (document_terms(*row),))
+    ]),
+    Migration(7, "Нормализованный текст документов для поиска по фрагментам", [
+        AddColumn("documents", "search_text", "TEXT"),
+        Backfill("documents", ["name", "author", "description"], ["search_text"],
+                 transform=lambda row: (document_text(*row),))
+    ])
+]
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+TIMED_TRANSITIONS = (
+    ('publish_at', DocumentStatus.PUBLICATION_WAITING, DocumentStatus.PUBLISHED),
+    ('valid_until', DocumentStatus.PUBLISHED, DocumentStatus.EXPIRED)
+)
+
+def _format_timestamp(value: Optional[datetime]) -> Optional[str]:
+    return value.strftime(TIMESTAMP_FORMAT) if value else None
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    return datetime.strptime(value, TIMESTAMP_FORMAT) if value else None
+
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+REPORT_COLUMNS = {
+    'id': ("ID", 'id'),
+    'name': ("Название", 'name'),
+    'category': ("Категория", 'category'),
+    'status': ("Статус", 'status'),
+    'author': ("Автор", 'author'),
+    'version': ("Версия", 'version'),
+    'creation_date': ("Дата создания", 'creation_date'),
+    'description': ("Описание", 'description'),
+    'file_path': ("Файл", 'file_path'),
+    'publish_at': ("Публикация", 'publish_at'),
+    'valid_until': ("Действует до", 'valid_until'),
+}
+
+class BulkActionCancelled(Exception):
+    pass
 
+class DocumentRepository:
+    def __init__(self, db_path: str, pool: Optional[ConnectionPool] = None, read_pool: Optional[ReadOnlyPool] = None):
+        self.db_path = db_path
+        self.pool = pool
+        self.init_database()
+        self.snapshots = SnapshotScope(db_path, read_pool)
+
+    def snapshot(self):
+        return self.snapshots.snapshot()
+
+    def _connect(self):
+        snapshot = self.snapshots.current()
+        if snapshot is not None:
+            return snapshot
+        if self.pool is not None:
+            return self.pool.acquire()
+        return connect(self.db_path)
+
+    def init_database(self):
+        MigrationRunner(self.db_path, MIGRATIONS).run()
+
+    def _row_to_document(self, row) -> Document:
+        doc = Document(
+            doc_id=row[0],
+            name=row[1],
+            category=DocumentCategory(row[2]),
+            status=DocumentStatus(row[3]),
+            author=row[4],
+            version=row[5]
+        )
+        doc.creation_date = datetime.strptime(row[6], '%Y-%m-%d') if row[6] else None
+        doc.description = row[7] or ""
+        doc.file_path = row[8] or ""
+        doc.content_hash = row[9]
+        doc.valid_until = _parse_timestamp(row[10])
+        doc.publish_at = _parse_timestamp(row[11])
+        doc.search_terms = row[12]
+        doc.search_text = row[13]
+        return doc
+
+    @timed("DocumentRepository.get_all_documents")
     def get_all_documents(self) -> List[Document]:
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
+        c = conn.cursor()
+        with instrumentation.timer("DocumentRepository.get_all_documents.sql"):
+            c.execute('SELECT * FROM documents')
+            rows = c.fetchall()
+        conn.close()
+        with instrumentation.timer("DocumentRepository.get_all_documents.hydrate"):
+            return [self._row_to_document(row) for row in rows]
+
+    @timed("DocumentRepository.get_authors")
+    def get_authors(self) -> List[str]:
+        conn = self._connect()
+        c = conn.cursor()
+        c.execute('SELECT DISTINCT author FROM documents WHERE author IS NOT NULL')
+        authors = [row[0] for row in c.fetchall()]
+        conn.close()
+        return authors
+
+    @timed("DocumentRepository.get_ids_by_status")
+    def get_ids_by_status(self, status: DocumentStatus) -> List[int]:
+        conn = self._connect()
+        c = conn.cursor()
+        c.execute('SELECT id FROM documents WHERE status=? ORDER BY id', (status.value,))
+        doc_ids = [row[0] for row in c.fetchall()]
+        conn.close()
+        return doc_ids
+
+    @timed("DocumentRepository.get_documents_by_ids")
+    def get_documents_by_ids(self, doc_ids: List[int]) -> List[Document]:
+        doc_ids = list(doc_ids)
+        conn = self._connect()
         c = conn.cursor()
-        c.execute('SELECT * FROM documents')
         documents = []
-        for row in c.fetchall():
-            doc = Document(
-                doc_id=row[0],
-                name=row[1],
-                category=DocumentCategory(row[2]),
-                status=DocumentStatus(row[3]),
-                author=row[4],
-                version=row[5]
-            )
-            doc.creation_date = datetime.strptime(row[6], '%Y-%m-%d') if row[6] else None
-            doc.description = row[7] or ""
-            doc.file_path = row[8] or ""
-            documents.append(doc)
+        for i in range(0, len(doc_ids), 500):
+            chunk = doc_ids[i:i + 500]
+            c.execute(f'SELECT * FROM documents WHERE id IN ({",".join("?" * len(chunk))})', chunk)
+            documents.extend(self._row_to_document(row) for row in c.fetchall())
         conn.close()
+        documents.sort(key=lambda d: d.doc_id)
         return documents
 
-    def save_document(self, document: Document):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
+    def _write_document(self, c, document: Document):
+        document.search_terms = document_terms(document.name, document.author, document.description)
+        document.search_text = document_text(document.name, document.author, document.description)
         if document.doc_id:
             c.execute('''
                 UPDATE documents SET name=?, category=?, status=?, author=?, version=?,
-                creation_date=?, description=?, file_path=? WHERE id=?
+                creation_date=?, description=?, file_path=?, content_hash=?, valid_until=?, publish_at=?,
+                search_terms=?, search_text=?
+                WHERE id=?
             ''', (
                 document.name, document.category.value, document.status.value,
                 document.author, document.version,
                 document.creation_date.strftime('%Y-%m-%d') if document.creation_date else None,
-                document.description, document.file_path, document.doc_id
+                document.description, document.file_path, document.content_hash,
+                _format_timestamp(document.valid_until), _format_timestamp(document.publish_at),
+                document.search_terms, document.search_text, document.doc_id
             ))
         else:
             c.execute('''
-                INSERT INTO documents (name, category, status, author, version, creation_date, description, file_path)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO documents (name, category, status, author, version, creation_date, description,
+                                       file_path, content_hash, valid_until, publish_at, search_terms, search_text)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
                 document.name, document.category.value, document.status.value,
                 document.author, document.version,
                 document.creation_date.strftime('%Y-%m-%d') if document.creation_date else datetime.now().strftime('%Y-%m-%d'),
-                document.description, document.file_path
+                document.description, document.file_path, document.content_hash,
+                _format_timestamp(document.valid_until), _format_timestamp(document.publish_at),
+                document.search_terms, document.search_text
             ))
             document.doc_id = c.lastrowid
+
+    @timed("DocumentRepository.save_document")
+    def save_document(self, document: Document):
+        conn = self._connect()
+        c = conn.cursor()
+        self._write_document(c, document)
+        conn.commit()
+        conn.close()
+
+    @timed("DocumentRepository.save_documents")
+    def save_documents(self, documents: List[Document]):
+        conn = self._connect()
+        c = conn.cursor()
+        for document in documents:
+            self._write_document(c, document)
+        conn.commit()
+        conn.close()
+
+    @timed("DocumentRepository.import_documents")
+    def import_documents(self, documents: List[Document]) -> int:
+        conn = self._connect()
+        c = conn.cursor()
+        imported = 0
+        for document in documents:
+            document.search_terms = document_terms(document.name, document.author, document.description)
+            document.search_text = document_text(document.name, document.author, document.description)
+            c.execute('''
+                INSERT INTO documents (id, name, category, status, author, version, creation_date, description,
+                                       file_path, content_hash, valid_until, publish_at, search_terms, search_text)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET name=excluded.name, category=excluded.category,
+                    status=excluded.status, author=excluded.author, version=excluded.version,
+                    creation_date=excluded.creation_date, description=excluded.description,
+                    file_path=excluded.file_path, content_hash=excluded.content_hash,
+                    valid_until=excluded.valid_until, publish_at=excluded.publish_at,
+                    search_terms=excluded.search_terms, search_text=excluded.search_text
+                RETURNING id
+            ''', (
+                document.doc_id or None, document.name, document.category.value, document.status.value,
+                document.author, document.version,
+                document.creation_date.strftime('%Y-%m-%d') if document.creation_date else datetime.now().strftime('%Y-%m-%d'),
+                document.description, document.file_path, document.content_hash,
+                _format_timestamp(document.valid_until), _format_timestamp(document.publish_at),
+                document.search_terms, document.search_text
+            ))
+            row = c.fetchone()
+            if row is not None:
+                document.doc_id = row[0]
+                imported += 1
+        conn.commit()
+        conn.close()
+        return imported
+
+    @timed("DocumentRepository.save_version")
+    def save_version(self, version: DocumentVersion):
+        conn = self._connect()
+        c = conn.cursor()
+        c.execute('''
+            INSERT INTO document_versions (doc_id, version, author, changes, version_date, content_hash)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (
+            version.doc_id, version.version, version.author, version.changes,
+            version.version_date.strftime('%Y-%m-%d'), version.content_hash
+        ))
+        conn.commit()
+        conn.close()
+
+    @timed("DocumentRepository.update_status")
+    def update_status(self, doc_ids: List[int], status: DocumentStatus) -> int:
+        doc_ids = list(doc_ids)
+        conn = self._connect()
+        c = conn.cursor()
+        updated = 0
+        for i in range(0, len(doc_ids), 500):
+            chunk = doc_ids[i:i + 500]
+            c.execute(f'UPDATE documents SET status=? WHERE id IN ({",".join("?" * len(chunk))})',
+                      [status.value] + chunk)
+            updated += c.rowcount
+        conn.commit()
+        conn.close()
+        return updated
+
+    @timed("DocumentRepository.transition_documents")
+    def transition_documents(self, doc_ids: Iterable[int], target: DocumentStatus) -> Dict[int, TransitionOutcome]:
+        conn = self._connect()
+        c = conn.cursor()
+        c.execute('BEGIN IMMEDIATE')
+        results = apply_transition(c, 'documents', doc_ids, target)
+        conn.commit()
+        conn.close()
+        return results
+
+    @timed("DocumentRepository.transition_routes")
+    def transition_routes(self, route_ids: Iterable[int], target: RouteStatus) -> Dict[int, TransitionOutcome]:
+        conn = self._connect()
+        c = conn.cursor()
+        c.execute('BEGIN IMMEDIATE')
+        results = apply_transition(c, 'approval_routes', route_ids, target)
+        conn.commit()
+        conn.close()
+        return results
+
+    @timed("DocumentRepository.run_chunked")
+    def run_chunked(self, doc_ids: Iterable[int], operation: Callable[[sqlite3.Cursor, List[int]], Dict],
+                    chunk_size: int = 500, progress: Optional[Callable[[int, int], None]] = None,
+                    cancel: Optional[threading.Event] = None) -> Dict[int, TransitionOutcome]:
+        doc_ids = list(dict.fromkeys(doc_ids))
+        conn = self._connect()
+        c = conn.cursor()
+        results = {}
+        try:
+            c.execute('BEGIN IMMEDIATE')
+            for i in range(0, len(doc_ids), chunk_size):
+                if cancel is not None and cancel.is_set():
+                    raise BulkActionCancelled("Операция отменена, изменения не сохранены")
+                results.update(operation(c, doc_ids[i:i + chunk_size]))
+                if progress is not None:
+                    progress(min(i + chunk_size, len(doc_ids)), len(doc_ids))
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        return results
+
+    @staticmethod
+    def write_category(c, doc_ids: List[int], category: DocumentCategory) -> Dict[int, TransitionOutcome]:
+        results = dict.fromkeys(doc_ids, TransitionOutcome.NOT_FOUND)
+        c.execute('SELECT id, category FROM documents WHERE id IN (SELECT value FROM json_each(?))', (json.dumps(doc_ids),))
+        changed = []
+        for doc_id, current in c.fetchall():
+            if current == category.value:
+                results[doc_id] = TransitionOutcome.UNCHANGED
+            else:
+                results[doc_id] = TransitionOutcome.APPLIED
+                changed.append(doc_id)
+        if changed:
+            c.execute('UPDATE documents SET category=? WHERE id IN (SELECT value FROM json_each(?))',
+                      (category.value, json.dumps(changed)))
+        return results
+
+    @timed("DocumentRepository.get_status_deadlines")
+    def get_status_deadlines(self, limit: int = 1000) -> List[Tuple[datetime, int]]:
+        conn = self._connect()
+        c = conn.cursor()
+        deadlines = []
+        for column, source, _ in TIMED_TRANSITIONS:
+            c.execute(f'''
+                SELECT {column}, id FROM documents
+                WHERE {column} IS NOT NULL AND status = ?
+                ORDER BY {column} LIMIT ?
+            ''', (source.value, limit))
+            deadlines.extend((_parse_timestamp(deadline), doc_id) for deadline, doc_id in c.fetchall())
+        conn.close()
+        deadlines.sort()
+        return deadlines[:limit]
+
+    @timed("DocumentRepository.apply_timed_transitions")
+    def apply_timed_transitions(self, now: datetime) -> List[Tuple[int, DocumentStatus]]:
+        conn = self._connect()
+        c = conn.cursor()
+        c.execute('BEGIN IMMEDIATE')
+        applied = []
+        for column, source, target in TIMED_TRANSITIONS:
+            c.execute(f'''
+                UPDATE documents SET status = ?
+                WHERE {column} <= ? AND status = ?
+                RETURNING id
+            ''', (target.value, _format_timestamp(now), source.value))
+            applied.extend((row[0], target) for row in c.fetchall())
         conn.commit()
         conn.close()
+        return applied
 
+    def iter_documents(self, batch_size: int = 1000) -> Iterator[Document]:
+        conn = self._connect()
+        try:
+            c = conn.cursor()
+            c.execute('SELECT * FROM documents ORDER BY id')
+            while True:
+                rows = c.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield self._row_to_document(row)
+        finally:
+            conn.close()
+
+    def _report_filter(self, filters: Optional[Dict]) -> Tuple[str, list]:
+        clauses, params = [], []
+        filters = filters or {}
+        for key in ('status', 'category'):
+            if filters.get(key):
+                clauses.append(f'{key} = ?')
+                params.append(getattr(filters[key], 'value', filters[key]))
+        if filters.get('author'):
+            clauses.append('instr(lower_text(author), ?) > 0')
+            params.append(filters['author'].lower())
+        for key, operator in (('date_from', '>='), ('date_to', '<=')):
+            if filters.get(key):
+                clauses.append(f'creation_date {operator} ?')
+                params.append(filters[key].strftime('%Y-%m-%d'))
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def count_report_rows(self, filters: Optional[Dict] = None) -> int:
+        where, params = self._report_filter(filters)
+        conn = self._connect()
+        conn.create_function('lower_text', 1, str.lower, deterministic=True)
+        c = conn.cursor()
+        c.execute(f'SELECT COUNT(*) FROM documents{where}', params)
+        count = c.fetchone()[0]
+        conn.close()
+        return count
+
+    def iter_report_rows(self, columns: List[str], filters: Optional[Dict] = None,
+                         batch_size: int = 1000) -> Iterator[List[tuple]]:
+        where, params = self._report_filter(filters)
+        expressions = ", ".join(REPORT_COLUMNS[column][1] for column in columns)
+        conn = self._connect()
+        try:
+            conn.create_function('lower_text', 1, str.lower, deterministic=True)
+            c = conn.cursor()
+            c.execute(f'SELECT {expressions} FROM documents{where} ORDER BY id', params)
+            while True:
+                rows = c.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            conn.close()
+
+    @timed("DocumentRepository.search_documents")
     def search_documents(self, query: str) -> List[Document]:
-        conn = sqlite3.connect(self.db_path)
+        terms = stem_words(query)
+        conn = self._connect()
         c = conn.cursor()
         c.execute('''
-            SELECT * FROM documents 
-            WHERE name LIKE ? OR description LIKE ? OR author LIKE ?
-        ''', (f'%{query}%', f'%{query}%', f'%{query}%'))
+            SELECT * FROM documents
+            WHERE id IN (SELECT rowid FROM document_terms WHERE document_terms MATCH ?) OR instr(search_text, ?) > 0
+            ORDER BY id
+        ''', (f'"{" ".join(terms)}" *' if terms else '""', normalize_text(query)))
         
-        documents = []
-        for row in c.fetchall():
-            doc = Document(
-                doc_id=row[0],
-                name=row[1],
-                category=DocumentCategory(row[2]),
-                status=DocumentStatus(row[3]),
-                author=row[4],
-                version=row[5]
-            )
-            documents.append(doc)
+        documents = [self._row_to_document(row) for row in c.fetchall()]
+        conn.close()
+        return documents
+
+    def get_content_sources(self) -> List[tuple]:
+        conn = self._connect()
+        c = conn.cursor()
+        c.execute('''
+            SELECT d.id, d.file_path, d.content_hash, s.fingerprint
+            FROM documents d LEFT JOIN content_index_state s ON s.doc_id = d.id
+            ORDER BY d.id
+        ''')
+        rows = c.fetchall()
+        c.execute('SELECT doc_id FROM content_index_state WHERE doc_id NOT IN (SELECT id FROM documents)')
+        rows.extend((row[0], None, None, "") for row in c.fetchall())
+        conn.close()
+        return rows
+
+    @timed("DocumentRepository.store_content")
+    def store_content(self, results: List[tuple]):
+        conn = self._connect()
+        c = conn.cursor()
+        for doc_id, fingerprint, text, error in results:
+            c.execute('DELETE FROM document_content WHERE rowid=?', (doc_id,))
+            if text:
+                c.execute('INSERT INTO document_content (rowid, body) VALUES (?, ?)', (doc_id, text))
+            c.execute('''
+                INSERT OR REPLACE INTO content_index_state (doc_id, fingerprint, indexed_at, error)
+                VALUES (?, ?, CURRENT_TIMESTAMP, ?)
+            ''', (doc_id, fingerprint, error))
+        conn.commit()
+        conn.close()
+
+    @timed("DocumentRepository.remove_content")
+    def remove_content(self, doc_ids: List[int]):
+        conn = self._connect()
+        c = conn.cursor()
+        c.executemany('DELETE FROM document_content WHERE rowid=?', [(doc_id,) for doc_id in doc_ids])
+        c.executemany('DELETE FROM content_index_state WHERE doc_id=?', [(doc_id,) for doc_id in doc_ids])
+        conn.commit()
+        conn.close()
+
+    @timed("DocumentRepository.search_content")
+    def search_content(self, query: str, limit: int = 1000) -> List[int]:
+        terms = [term.replace('"', '""') for term in query.split()]
+        if not terms:
+            return []
+        conn = self._connect()
+        c = conn.cursor()
+        c.execute('SELECT rowid FROM document_content WHERE document_content MATCH ? ORDER BY rank LIMIT ?',
+                  (" ".join(f'"{term}"*' for term in terms), limit))
+        doc_ids = [row[0] for row in c.fetchall()]
         conn.close()
-        return documents
\ No newline at end of file
+        return doc_ids
\ No newline at end of file
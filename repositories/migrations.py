@@ -0,0 +1,143 @@
+from typing import Callable, List, Optional, Sequence
+from diagnostics.instrumentation import timed
+from repositories.connection import connect
+
+class Execute:
+    def __init__(self, *statements: str):
+        self.statements = statements
+
+    def describe(self) -> List[str]:
+        return [" ".join(statement.split()) for statement in self.statements]
+
+    def apply(self, conn):
+        c = conn.cursor()
+        c.execute('BEGIN')
+        for statement in self.statements:
+            c.execute(statement)
+        conn.commit()
+
+class AddColumn:
+    def __init__(self, table: str, column: str, definition: str):
+        self.table = table
+        self.column = column
+        self.definition = definition
+
+    def describe(self) -> List[str]:
+        return [f"ALTER TABLE {self.table} ADD COLUMN {self.column} {self.definition}"]
+
+    def apply(self, conn):
+        c = conn.cursor()
+        c.execute('SELECT 1 FROM pragma_table_info(?) WHERE name=?', (self.table, self.column))
+        if c.fetchone() is None:
+            c.execute(self.describe()[0])
+            conn.commit()
+
+class CreateIndex:
+    def __init__(self, name: str, table: str, columns: str, unique: bool = False):
+        self.name = name
+        self.table = table
+        self.columns = columns
+        self.unique = unique
+
+    def describe(self) -> List[str]:
+        unique = "UNIQUE " if self.unique else ""
+        return [f"CREATE {unique}INDEX IF NOT EXISTS {self.name} ON {self.table}({self.columns})"]
+
+    def apply(self, conn):
+        c = conn.cursor()
+        c.execute('BEGIN')
+        c.execute(self.describe()[0])
+        conn.commit()
+
+class Backfill:
+    def __init__(self, table: str, columns: Sequence[str], targets: Sequence[str],
+                 transform: Optional[Callable[[tuple], tuple]] = None, expressions: Sequence[str] = (),
+                 chunk_size: int = 5000):
+        self.table = table
+        self.columns = list(columns)
+        self.targets = list(targets)
+        self.transform = transform
+        self.expressions = list(expressions)
+        self.chunk_size = chunk_size
+
+    def describe(self) -> List[str]:
+        if self.transform is None:
+            assignments = ", ".join(f"{t} = {e}" for t, e in zip(self.targets, self.expressions))
+        else:
+            assignments = ", ".join(f"{t} = f({', '.join(self.columns)})" for t in self.targets)
+        return [f"UPDATE {self.table} SET {assignments} -- по {self.chunk_size} строк в транзакции"]
+
+    def apply(self, conn):
+        c = conn.cursor()
+        last_rowid = -1
+        while True:
+            c.execute(f'''
+                SELECT rowid{"".join(", " + column for column in self.columns)} FROM {self.table}
+                WHERE rowid > ? ORDER BY rowid LIMIT ?
+            ''', (last_rowid, self.chunk_size))
+            rows = c.fetchall()
+            if not rows:
+                break
+            if self.transform is None:
+                assignments = ", ".join(f"{t} = {e}" for t, e in zip(self.targets, self.expressions))
+                c.execute(f'UPDATE {self.table} SET {assignments} WHERE rowid BETWEEN ? AND ?',
+                          (rows[0][0], rows[-1][0]))
+            else:
+                assignments = ", ".join(f"{t} = ?" for t in self.targets)
+                c.executemany(f'UPDATE {self.table} SET {assignments} WHERE rowid = ?',
+                              [tuple(self.transform(row[1:])) + (row[0],) for row in rows])
+            conn.commit()
+            last_rowid = rows[-1][0]
+
+class Migration:
+    def __init__(self, version: int, description: str, steps: List):
+        self.version = version
+        self.description = description
+        self.steps = steps
+
+class MigrationRunner:
+    def __init__(self, db_path: str, migrations: List[Migration]):
+        self.db_path = db_path
+        self.migrations = sorted(migrations, key=lambda m: m.version)
+        self.target_version = self.migrations[-1].version if self.migrations else 0
+
+    def current_version(self, conn=None) -> int:
+        own = conn is None
+        conn = conn or connect(self.db_path)
+        c = conn.cursor()
+        c.execute('PRAGMA user_version')
+        version = c.fetchone()[0]
+        if own:
+            conn.close()
+        return version
+
+    def pending(self, version: int) -> List[Migration]:
+        return [m for m in self.migrations if m.version > version]
+
+    def plan(self) -> List[str]:
+        lines = []
+        for migration in self.pending(self.current_version()):
+            lines.append(f"{migration.version}: {migration.description}")
+            for step in migration.steps:
+                lines.extend(f"    {line}" for line in step.describe())
+        return lines
+
+    @timed("MigrationRunner.run")
+    def run(self, dry_run: bool = False) -> List[int]:
+        if dry_run:
+            return [m.version for m in self.pending(self.current_version())]
+        conn = connect(self.db_path)
+        try:
+            version = self.current_version(conn)
+            if version >= self.target_version:
+                return []
+            applied = []
+            for migration in self.pending(version):
+                for step in migration.steps:
+                    step.apply(conn)
+                conn.execute(f'PRAGMA user_version = {migration.version}')
+                conn.commit()
+                applied.append(migration.version)
+            return applied
+        finally:
+            conn.close()
@@ -0,0 +1,84 @@
+from typing import Dict, List
+from models.document import Document
+from models.project import Project
+from diagnostics.instrumentation import timed
+from repositories.project_repository import ProjectRepository
+from repositories.document_repository import DocumentRepository
+
+class ProjectDocumentRepository:
+    def __init__(self, project_repository: ProjectRepository, document_repository: DocumentRepository):
+        self.project_repository = project_repository
+        self.document_repository = document_repository
+        project_repository.snapshots.attach('docs', document_repository.db_path)
+
+    def _connect(self):
+        conn = self.project_repository._connect()
+        c = conn.cursor()
+        c.execute("SELECT 1 FROM pragma_database_list WHERE name='docs'")
+        if c.fetchone() is None:
+            c.execute('ATTACH DATABASE ? AS docs', (self.document_repository.db_path,))
+        return conn
+
+    @timed("ProjectDocumentRepository.link_documents")
+    def link_documents(self, project_id: int, doc_ids: List[int]):
+        conn = self.project_repository._connect()
+        c = conn.cursor()
+        c.executemany('INSERT OR IGNORE INTO project_documents (project_id, doc_id) VALUES (?, ?)',
+                      [(project_id, doc_id) for doc_id in doc_ids])
+        conn.commit()
+        conn.close()
+
+    @timed("ProjectDocumentRepository.unlink_documents")
+    def unlink_documents(self, project_id: int, doc_ids: List[int]):
+        conn = self.project_repository._connect()
+        c = conn.cursor()
+        c.executemany('DELETE FROM project_documents WHERE project_id=? AND doc_id=?',
+                      [(project_id, doc_id) for doc_id in doc_ids])
+        conn.commit()
+        conn.close()
+
+    @timed("ProjectDocumentRepository.get_documents_for_projects")
+    def get_documents_for_projects(self, project_ids: List[int]) -> Dict[int, List[Document]]:
+        project_ids = list(project_ids)
+        documents: Dict[int, List[Document]] = {project_id: [] for project_id in project_ids}
+        conn = self._connect()
+        c = conn.cursor()
+        for i in range(0, len(project_ids), 500):
+            chunk = project_ids[i:i + 500]
+            c.execute(f'''
+                SELECT l.project_id, d.* FROM project_documents l
+                JOIN docs.documents d ON d.id = l.doc_id
+                WHERE l.project_id IN ({",".join("?" * len(chunk))})
+                ORDER BY l.project_id, d.id
+            ''', chunk)
+            for row in c.fetchall():
+                documents[row[0]].append(self.document_repository._row_to_document(row[1:]))
+        conn.close()
+        return documents
+
+    @timed("ProjectDocumentRepository.get_projects_for_document")
+    def get_projects_for_document(self, doc_id: int) -> List[Project]:
+        conn = self.project_repository._connect()
+        c = conn.cursor()
+        c.execute('''
+            SELECT p.id, p.name, p.type, p.status, p.start_date, p.end_date, p.actual_start, p.actual_end,
+                   p.manager, p.description, p.progress
+            FROM project_documents l JOIN projects p ON p.id = l.project_id
+            WHERE l.doc_id=? ORDER BY p.id
+        ''', (doc_id,))
+        projects = [self.project_repository._row_to_project(row) for row in c.fetchall()]
+        conn.close()
+        return projects
+
+    @timed("ProjectDocumentRepository.get_document_counts")
+    def get_document_counts(self) -> Dict[int, int]:
+        conn = self._connect()
+        c = conn.cursor()
+        c.execute('''
+            SELECT l.project_id, COUNT(*) FROM project_documents l
+            JOIN docs.documents d ON d.id = l.doc_id
+            GROUP BY l.project_id
+        ''')
+        counts = dict(c.fetchall())
+        conn.close()
+        return counts
@@ -1,18 +1,44 @@
 import sqlite3
 from datetime import datetime
-from typing import List, Optional
-from models.project import Project
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from models.project import Project, ProjectStage, Task
 from models.enums import ProjectStatus, ProjectType
+from models.transitions import TransitionOutcome
+from diagnostics.instrumentation import instrumentation, timed
+from repositories.connection import connect, ConnectionPool, ReadOnlyPool, SnapshotScope
+from repositories.migrations import Migration, MigrationRunner, Execute, CreateIndex
+from repositories.status_transitions import apply_transition
 
-class ProjectRepository:
-    def __init__(self, db_path: str):
-        self.db_path = db_path
-        self.init_database()
+INTERVAL_DATES = '''{row}.start_date, {row}.end_date,
+    COALESCE({row}.actual_start, {row}.start_date), COALESCE({row}.actual_end, {row}.end_date)'''
 
-    def init_database(self):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute('''
+INTERVAL_BOUNDS = f'''{{row}}.id,
+    CAST(julianday(MIN({INTERVAL_DATES})) AS INTEGER),
+    CAST(julianday(MAX({INTERVAL_DATES})) AS INTEGER)'''
+
+INTERVAL_TRIGGERS = (
+    f'''
+        CREATE TRIGGER IF NOT EXISTS projects_intervals_insert AFTER INSERT ON projects BEGIN
+            INSERT INTO project_intervals (id, start_day, end_day) VALUES ({INTERVAL_BOUNDS.format(row='new')});
+        END
+    ''',
+    f'''
+        CREATE TRIGGER IF NOT EXISTS projects_intervals_update
+        AFTER UPDATE OF start_date, end_date, actual_start, actual_end ON projects BEGIN
+            DELETE FROM project_intervals WHERE id = old.id;
+            INSERT INTO project_intervals (id, start_day, end_day) VALUES ({INTERVAL_BOUNDS.format(row='new')});
+        END
+    '''
+)
+
+INTERVAL_BACKFILL = f'''
+    INSERT OR IGNORE INTO project_intervals (id, start_day, end_day)
+    SELECT {INTERVAL_BOUNDS.format(row='projects')} FROM projects
+'''
+
+MIGRATIONS = [
+    Migration(1, "Проекты, вехи и этапы", [Execute(
+        '''
             CREATE TABLE IF NOT EXISTS projects (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 name TEXT NOT NULL,
@@ -26,8 +52,8 @@ class ProjectRepository:
                 description TEXT,
                 progress INTEGER DEFAULT 0
             )
-        ''')
-        c.execute('''
+        ''',
+        '''
             CREATE TABLE IF NOT EXISTS project_milestones (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 project_id INTEGER,
@@ -36,8 +62,8 @@ class ProjectRepository:
                 completed BOOLEAN DEFAULT FALSE,
                 FOREIGN KEY (project_id) REFERENCES projects(id)
             )
-        ''')
-        c.execute('''
+        ''',
+        '''
             CREATE TABLE IF NOT EXISTS project_stages (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 project_id INTEGER,
@@ -47,40 +73,158 @@ class ProjectRepository:
                 end_date DATE,
                 FOREIGN KEY (project_id) REFERENCES projects(id)
             )
-        ''')
-        conn.commit()
-        conn.close()
+        '''
+    )]),
+    Migration(2, "Задачи этапов и зависимости сетевого графика", [
+        Execute(
+            '''
+                CREATE TABLE IF NOT EXISTS stage_tasks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    stage_id INTEGER NOT NULL,
+                    name TEXT NOT NULL,
+                    duration INTEGER NOT NULL DEFAULT 0,
+                    FOREIGN KEY (stage_id) REFERENCES project_stages(id)
+                )
+            ''',
+            '''
+                CREATE TABLE IF NOT EXISTS task_dependencies (
+                    task_id INTEGER NOT NULL,
+                    predecessor_id INTEGER NOT NULL,
+                    PRIMARY KEY (task_id, predecessor_id),
+                    FOREIGN KEY (task_id) REFERENCES stage_tasks(id),
+                    FOREIGN KEY (predecessor_id) REFERENCES stage_tasks(id)
+                )
+            '''
+        ),
+        CreateIndex("idx_stage_tasks_stage", "stage_tasks", "stage_id"),
+        CreateIndex("idx_task_dependencies_predecessor", "task_dependencies", "predecessor_id")
+    ]),
+    Migration(3, "Связи проектов с документами", [
+        Execute('''
+            CREATE TABLE IF NOT EXISTS project_documents (
+                project_id INTEGER NOT NULL,
+                doc_id INTEGER NOT NULL,
+                PRIMARY KEY (project_id, doc_id),
+                FOREIGN KEY (project_id) REFERENCES projects(id)
+            ) WITHOUT ROWID
+        '''),
+        CreateIndex("idx_project_documents_doc", "project_documents", "doc_id, project_id")
+    ]),
+    Migration(4, "Счетчик изменений проектов для кэша аналитики", [Execute(
+        '''
+            CREATE TABLE IF NOT EXISTS change_counter (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                generation INTEGER NOT NULL
+            )
+        ''',
+        'INSERT OR IGNORE INTO change_counter (id, generation) VALUES (1, 0)',
+        *(
+            f'''
+                CREATE TRIGGER IF NOT EXISTS projects_generation_{event.lower()} AFTER {event} ON projects BEGIN
+                    UPDATE change_counter SET generation = generation + 1 WHERE id = 1;
+                END
+            '''
+            for event in ('INSERT', 'UPDATE', 'DELETE')
+        )
+    )]),
+    Migration(5, "Интервальный индекс сроков проектов", [Execute(
+        'CREATE VIRTUAL TABLE IF NOT EXISTS project_intervals USING rtree_i32(id, start_day, end_day)',
+        *INTERVAL_TRIGGERS,
+        '''
+            CREATE TRIGGER IF NOT EXISTS projects_intervals_delete AFTER DELETE ON projects BEGIN
+                DELETE FROM project_intervals WHERE id = old.id;
+            END
+        ''',
+        INTERVAL_BACKFILL
+    )]),
+    Migration(6, "Интервалы проектов с перепутанными датами", [Execute(
+        'DROP TRIGGER IF EXISTS projects_intervals_insert',
+        'DROP TRIGGER IF EXISTS projects_intervals_update',
+        *INTERVAL_TRIGGERS,
+        'DELETE FROM project_intervals',
+        INTERVAL_BACKFILL
+    )])
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+REPORT_COLUMNS = {
+    'id': ("ID", 'id'),
+    'name': ("Название", 'name'),
+    'type': ("Тип", 'type'),
+    'status': ("Статус", 'status'),
+    'manager': ("Руководитель", 'manager'),
+    'start_date': ("Начало", 'start_date'),
+    'end_date': ("Окончание", 'end_date'),
+    'actual_start': ("Фактическое начало", 'actual_start'),
+    'actual_end': ("Фактическое окончание", 'actual_end'),
+    'progress': ("Прогресс, %", 'progress'),
+    'deviation_days': ("Отклонение, дн.", 'CAST(julianday(actual_end) - julianday(end_date) AS INTEGER)'),
+    'description': ("Описание", 'description'),
+}
+
+class ProjectRepository:
+    def __init__(self, db_path: str, pool: Optional[ConnectionPool] = None, read_pool: Optional[ReadOnlyPool] = None):
+        self.db_path = db_path
+        self.pool = pool
+        self.init_database()
+        self.snapshots = SnapshotScope(db_path, read_pool)
+
+    def snapshot(self):
+        return self.snapshots.snapshot()
+
+    def _connect(self):
+        snapshot = self.snapshots.current()
+        if snapshot is not None:
+            return snapshot
+        if self.pool is not None:
+            return self.pool.acquire()
+        return connect(self.db_path)
 
+    def init_database(self):
+        MigrationRunner(self.db_path, MIGRATIONS).run()
+
+    def _row_to_project(self, row) -> Project:
+        project = Project(
+            project_id=row[0],
+            name=row[1],
+            project_type=ProjectType(row[2]),
+            status=ProjectStatus(row[3]),
+            start_date=datetime.strptime(row[4], '%Y-%m-%d'),
+            end_date=datetime.strptime(row[5], '%Y-%m-%d'),
+            manager=row[8],
+            description=row[9] or ""
+        )
+        project.actual_start = datetime.strptime(row[6], '%Y-%m-%d') if row[6] else None
+        project.actual_end = datetime.strptime(row[7], '%Y-%m-%d') if row[7] else None
+        project.progress = row[10]
+        return project
+
+    @timed("ProjectRepository.get_all_projects")
     def get_all_projects(self) -> List[Project]:
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         c = conn.cursor()
-        c.execute('''
-            SELECT id, name, type, status, start_date, end_date, actual_start, actual_end, 
-                   manager, description, progress 
-            FROM projects
-        ''')
-        projects = []
-        for row in c.fetchall():
-            project = Project(
-                project_id=row[0],
-                name=row[1],
-                project_type=ProjectType(row[2]),
-                status=ProjectStatus(row[3]),
-                start_date=datetime.strptime(row[4], '%Y-%m-%d'),
-                end_date=datetime.strptime(row[5], '%Y-%m-%d'),
-                manager=row[8],
-                description=row[9] or ""
-            )
-            project.actual_start = datetime.strptime(row[6], '%Y-%m-%d') if row[6] else None
-            project.actual_end = datetime.strptime(row[7], '%Y-%m-%d') if row[7] else None
-            project.progress = row[10]
-            projects.append(project)
+        with instrumentation.timer("ProjectRepository.get_all_projects.sql"):
+            c.execute('''
+                SELECT id, name, type, status, start_date, end_date, actual_start, actual_end, 
+                       manager, description, progress 
+                FROM projects
+            ''')
+            rows = c.fetchall()
         conn.close()
-        return projects
+        with instrumentation.timer("ProjectRepository.get_all_projects.hydrate"):
+            return [self._row_to_project(row) for row in rows]
 
-    def save_project(self, project: Project):
-        conn = sqlite3.connect(self.db_path)
+    @timed("ProjectRepository.get_ids_by_status")
+    def get_ids_by_status(self, status: ProjectStatus) -> List[int]:
+        conn = self._connect()
         c = conn.cursor()
+        c.execute('SELECT id FROM projects WHERE status=? ORDER BY id', (status.value,))
+        project_ids = [row[0] for row in c.fetchall()]
+        conn.close()
+        return project_ids
+
+    def _write_project(self, c, project: Project):
         if project.project_id:
             c.execute('''
                 UPDATE projects SET name=?, type=?, status=?, start_date=?, end_date=?,
@@ -95,13 +239,230 @@ class ProjectRepository:
             ))
         else:
             c.execute('''
-                INSERT INTO projects (name, type, status, start_date, end_date, manager, description, progress)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO projects (name, type, status, start_date, end_date, actual_start, actual_end,
+                                      manager, description, progress)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
                 project.name, project.project_type.value, project.status.value,
                 project.start_date.strftime('%Y-%m-%d'), project.end_date.strftime('%Y-%m-%d'),
+                project.actual_start.strftime('%Y-%m-%d') if project.actual_start else None,
+                project.actual_end.strftime('%Y-%m-%d') if project.actual_end else None,
                 project.manager, project.description, project.progress
             ))
             project.project_id = c.lastrowid
+
+    @timed("ProjectRepository.save_project")
+    def save_project(self, project: Project):
+        conn = self._connect()
+        c = conn.cursor()
+        self._write_project(c, project)
         conn.commit()
-        conn.close()
\ No newline at end of file
+        conn.close()
+
+    @timed("ProjectRepository.save_projects")
+    def save_projects(self, projects: List[Project]):
+        conn = self._connect()
+        c = conn.cursor()
+        for project in projects:
+            self._write_project(c, project)
+        conn.commit()
+        conn.close()
+
+    @timed("ProjectRepository.import_projects")
+    def import_projects(self, projects: List[Project]) -> int:
+        conn = self._connect()
+        c = conn.cursor()
+        imported = 0
+        for project in projects:
+            c.execute('''
+                INSERT INTO projects (id, name, type, status, start_date, end_date, actual_start, actual_end,
+                                      manager, description, progress)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET name=excluded.name, type=excluded.type, status=excluded.status,
+                    start_date=excluded.start_date, end_date=excluded.end_date,
+                    actual_start=excluded.actual_start, actual_end=excluded.actual_end,
+                    manager=excluded.manager, description=excluded.description, progress=excluded.progress
+                RETURNING id
+            ''', (
+                project.project_id or None, project.name, project.project_type.value, project.status.value,
+                project.start_date.strftime('%Y-%m-%d'), project.end_date.strftime('%Y-%m-%d'),
+                project.actual_start.strftime('%Y-%m-%d') if project.actual_start else None,
+                project.actual_end.strftime('%Y-%m-%d') if project.actual_end else None,
+                project.manager, project.description, project.progress
+            ))
+            row = c.fetchone()
+            if row is not None:
+                project.project_id = row[0]
+                imported += 1
+        conn.commit()
+        conn.close()
+        return imported
+
+    @timed("ProjectRepository.transition_projects")
+    def transition_projects(self, project_ids: Iterable[int], target: ProjectStatus) -> Dict[int, TransitionOutcome]:
+        conn = self._connect()
+        c = conn.cursor()
+        c.execute('BEGIN IMMEDIATE')
+        results = apply_transition(c, 'projects', project_ids, target)
+        conn.commit()
+        conn.close()
+        return results
+
+    def iter_projects(self, batch_size: int = 1000) -> Iterator[Project]:
+        conn = self._connect()
+        try:
+            c = conn.cursor()
+            c.execute('''
+                SELECT id, name, type, status, start_date, end_date, actual_start, actual_end,
+                       manager, description, progress
+                FROM projects ORDER BY id
+            ''')
+            while True:
+                rows = c.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield self._row_to_project(row)
+        finally:
+            conn.close()
+
+    def _report_filter(self, filters: Optional[Dict]) -> Tuple[str, list]:
+        clauses, params = [], []
+        filters = filters or {}
+        for key in ('status', 'type'):
+            if filters.get(key):
+                clauses.append(f'{key} = ?')
+                params.append(getattr(filters[key], 'value', filters[key]))
+        if filters.get('manager'):
+            clauses.append('instr(lower_text(manager), ?) > 0')
+            params.append(filters['manager'].lower())
+        for key, operator in (('date_from', 'end_date >='), ('date_to', 'start_date <=')):
+            if filters.get(key):
+                clauses.append(f'{operator} ?')
+                params.append(filters[key].strftime('%Y-%m-%d'))
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def count_report_rows(self, filters: Optional[Dict] = None) -> int:
+        where, params = self._report_filter(filters)
+        conn = self._connect()
+        conn.create_function('lower_text', 1, str.lower, deterministic=True)
+        c = conn.cursor()
+        c.execute(f'SELECT COUNT(*) FROM projects{where}', params)
+        count = c.fetchone()[0]
+        conn.close()
+        return count
+
+    def iter_report_rows(self, columns: List[str], filters: Optional[Dict] = None,
+                         batch_size: int = 1000) -> Iterator[List[tuple]]:
+        where, params = self._report_filter(filters)
+        expressions = ", ".join(REPORT_COLUMNS[column][1] for column in columns)
+        conn = self._connect()
+        try:
+            conn.create_function('lower_text', 1, str.lower, deterministic=True)
+            c = conn.cursor()
+            c.execute(f'SELECT {expressions} FROM projects{where} ORDER BY id', params)
+            while True:
+                rows = c.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            conn.close()
+
+    @timed("ProjectRepository.get_project_stages")
+    def get_project_stages(self, project_id: int) -> List[ProjectStage]:
+        conn = self._connect()
+        c = conn.cursor()
+        c.execute('''
+            SELECT id, name, project_id, status, start_date, end_date FROM project_stages
+            WHERE project_id=? ORDER BY start_date, id
+        ''', (project_id,))
+        stages = [ProjectStage(stage_id=row[0], name=row[1], project_id=row[2], status=ProjectStatus(row[3]),
+                               start_date=datetime.strptime(row[4], '%Y-%m-%d') if row[4] else None,
+                               end_date=datetime.strptime(row[5], '%Y-%m-%d') if row[5] else None)
+                  for row in c.fetchall()]
+        conn.close()
+        return stages
+
+    @timed("ProjectRepository.get_stage_tasks")
+    def get_stage_tasks(self, stage_id: int) -> List[Task]:
+        conn = self._connect()
+        c = conn.cursor()
+        c.execute('SELECT id, name, stage_id, duration FROM stage_tasks WHERE stage_id=? ORDER BY id', (stage_id,))
+        tasks = {row[0]: Task(task_id=row[0], name=row[1], stage_id=row[2], duration=row[3]) for row in c.fetchall()}
+        c.execute('''
+            SELECT d.task_id, d.predecessor_id FROM task_dependencies d
+            JOIN stage_tasks t ON t.id = d.task_id
+            WHERE t.stage_id=?
+        ''', (stage_id,))
+        for task_id, predecessor_id in c.fetchall():
+            tasks[task_id].predecessors.append(predecessor_id)
+        conn.close()
+        return list(tasks.values())
+
+    @timed("ProjectRepository.save_stage_tasks")
+    def save_stage_tasks(self, stage_id: int, tasks: List[Task]):
+        conn = self._connect()
+        c = conn.cursor()
+        for task in tasks:
+            task.stage_id = stage_id
+            if task.task_id:
+                c.execute('UPDATE stage_tasks SET name=?, duration=?, stage_id=? WHERE id=?',
+                          (task.name, task.duration, stage_id, task.task_id))
+            else:
+                c.execute('INSERT INTO stage_tasks (stage_id, name, duration) VALUES (?, ?, ?)',
+                          (stage_id, task.name, task.duration))
+                task.task_id = c.lastrowid
+        task_ids = [(task.task_id,) for task in tasks]
+        c.executemany('DELETE FROM task_dependencies WHERE task_id=?', task_ids)
+        c.executemany('INSERT INTO task_dependencies (task_id, predecessor_id) VALUES (?, ?)', [
+            (task.task_id, predecessor_id) for task in tasks for predecessor_id in task.predecessors
+        ])
+        conn.commit()
+        conn.close()
+
+    @timed("ProjectRepository.update_task_duration")
+    def update_task_duration(self, task_id: int, duration: int):
+        conn = self._connect()
+        c = conn.cursor()
+        c.execute('UPDATE stage_tasks SET duration=? WHERE id=?', (duration, task_id))
+        conn.commit()
+        conn.close()
+
+    @timed("ProjectRepository.get_projects_in_range")
+    def get_projects_in_range(self, start: datetime, end: datetime) -> List[Project]:
+        conn = self._connect()
+        c = conn.cursor()
+        c.execute('''
+            SELECT p.id, p.name, p.type, p.status, p.start_date, p.end_date, p.actual_start, p.actual_end,
+                   p.manager, p.description, p.progress
+            FROM project_intervals i JOIN projects p ON p.id = i.id
+            WHERE i.start_day <= CAST(julianday(?) AS INTEGER) AND i.end_day >= CAST(julianday(?) AS INTEGER)
+            ORDER BY i.start_day, p.id
+        ''', (end.strftime('%Y-%m-%d'), start.strftime('%Y-%m-%d')))
+        rows = c.fetchall()
+        conn.close()
+        return [self._row_to_project(row) for row in rows]
+
+    def get_generation(self) -> int:
+        conn = self._connect()
+        c = conn.cursor()
+        c.execute('SELECT generation FROM change_counter WHERE id = 1')
+        generation = c.fetchone()[0]
+        conn.close()
+        return generation
+
+    @timed("ProjectRepository.get_schedule_columns")
+    def get_schedule_columns(self) -> Tuple[int, List[tuple]]:
+        with self.snapshot() as conn:
+            c = conn.cursor()
+            c.execute('SELECT generation FROM change_counter WHERE id = 1')
+            generation = c.fetchone()[0]
+            c.execute('''
+                SELECT manager,
+                       CAST(julianday(end_date) AS INTEGER),
+                       CAST(julianday(actual_end) AS INTEGER),
+                       CAST(strftime('%Y', end_date) AS INTEGER) * 12 + CAST(strftime('%m', end_date) AS INTEGER) - 1
+                FROM projects ORDER BY id
+            ''')
+            return generation, c.fetchall()
\ No newline at end of file
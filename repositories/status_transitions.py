@@ -0,0 +1,23 @@
+import json
+from enum import Enum
+from typing import Dict, Iterable
+from models.transitions import TransitionOutcome, can_transition
+
+def apply_transition(c, table: str, ids: Iterable[int], target: Enum) -> Dict[int, TransitionOutcome]:
+    ids = list(dict.fromkeys(ids))
+    results = dict.fromkeys(ids, TransitionOutcome.NOT_FOUND)
+    c.execute(f'SELECT id, status FROM {table} WHERE id IN (SELECT value FROM json_each(?))', (json.dumps(ids),))
+    allowed = []
+    for row_id, status in c.fetchall():
+        source = type(target)(status)
+        if source == target:
+            results[row_id] = TransitionOutcome.UNCHANGED
+        elif can_transition(source, target):
+            results[row_id] = TransitionOutcome.APPLIED
+            allowed.append(row_id)
+        else:
+            results[row_id] = TransitionOutcome.FORBIDDEN
+    if allowed:
+        c.execute(f'UPDATE {table} SET status=? WHERE id IN (SELECT value FROM json_each(?))',
+                  (target.value, json.dumps(allowed)))
+    return results
@@ -0,0 +1,109 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+from diagnostics.instrumentation import timed
+
+_FLUSH = object()
+_STOP = object()
+
+class WriteQueue:
+    def __init__(self, max_batch: int = 500, max_delay: float = 0.02):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.queue = queue.Queue()
+        self.pending = 0
+        self.closed = False
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self._run, name="write-queue", daemon=True)
+        self.thread.start()
+
+    def submit(self, repository, write: Callable, immediate: bool = False) -> Future:
+        future = Future()
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("Очередь записи закрыта")
+            self.pending += 1
+        self.queue.put((repository, write, future))
+        if immediate:
+            self.queue.put(_FLUSH)
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        self.queue.put(_FLUSH)
+        with self.condition:
+            return self.condition.wait_for(lambda: self.pending == 0, timeout)
+
+    def close(self):
+        with self.condition:
+            if self.closed:
+                return
+            self.closed = True
+        self.queue.put(_STOP)
+        self.thread.join()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                return
+            if item is _FLUSH:
+                continue
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            stop = False
+            while len(batch) < self.max_batch:
+                try:
+                    item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _FLUSH:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._commit(batch)
+            if stop:
+                return
+
+    @timed("WriteQueue.commit")
+    def _commit(self, batch: List[Tuple]):
+        groups: Dict[str, List[Tuple]] = {}
+        for operation in batch:
+            groups.setdefault(operation[0].db_path, []).append(operation)
+        for operations in groups.values():
+            self._commit_group(operations)
+        with self.condition:
+            self.pending -= len(batch)
+            self.condition.notify_all()
+
+    def _commit_group(self, operations: List[Tuple]):
+        results = []
+        conn = None
+        try:
+            conn = operations[0][0]._connect()
+            c = conn.cursor()
+            c.execute('BEGIN')
+            for _, write, _ in operations:
+                c.execute('SAVEPOINT write_op')
+                try:
+                    results.append((True, write(c)))
+                except Exception as e:
+                    c.execute('ROLLBACK TO write_op')
+                    results.append((False, e))
+                c.execute('RELEASE write_op')
+            conn.commit()
+        except Exception as e:
+            if conn is not None:
+                conn.rollback()
+            results = [(False, e)] * len(operations)
+        finally:
+            if conn is not None:
+                conn.close()
+        for (_, _, future), (ok, value) in zip(operations, results):
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
@@ -1,3 +1,4 @@
 from .project_service import ProjectService
 from .document_service import DocumentService
-from .validation_service import ValidationService
\ No newline at end of file
+from .validation_service import ValidationService
+from .schedule_service import ScheduleService, NetworkSchedule
\ No newline at end of file
@@ -0,0 +1,136 @@
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from diagnostics.instrumentation import timed
+from repositories import document_repository, project_repository
+from repositories.migrations import MigrationRunner
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+MIGRATIONS = {'projects': project_repository.MIGRATIONS, 'documents': document_repository.MIGRATIONS}
+
+class BackupCancelled(Exception):
+    pass
+
+class Snapshot:
+    def __init__(self, path: str, manifest: Dict):
+        self.path = path
+        self.manifest = manifest
+        self.snapshot_id = os.path.basename(path)
+        self.created_at = datetime.strptime(manifest['created_at'], TIMESTAMP_FORMAT)
+
+    def database_path(self, name: str) -> str:
+        return os.path.join(self.path, self.manifest['databases'][name]['file'])
+
+    def to_dict(self) -> Dict:
+        return {'id': self.snapshot_id, 'path': self.path, **self.manifest}
+
+class BackupService:
+    def __init__(self, projects_db: str, documents_db: str, backup_dir: str = "backups",
+                 pages: int = 256, pause: float = 0.005):
+        self.databases = {'projects': projects_db, 'documents': documents_db}
+        self.backup_dir = backup_dir
+        self.pages = pages
+        self.pause = pause
+        for path in self.databases.values():
+            conn = sqlite3.connect(path)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.close()
+
+    def _progress(self, name: str, progress: Optional[Callable], cancel: Optional[threading.Event]):
+        def callback(status, remaining, total):
+            if cancel is not None and cancel.is_set():
+                raise BackupCancelled("Резервное копирование отменено")
+            if progress is not None:
+                progress(name, total - remaining, total)
+            time.sleep(self.pause)
+        return callback
+
+    @timed("BackupService.create_snapshot")
+    def create_snapshot(self, progress: Optional[Callable[[str, int, int], None]] = None,
+                        cancel: Optional[threading.Event] = None) -> Snapshot:
+        created_at = datetime.now()
+        snapshot_id = created_at.strftime('%Y%m%d-%H%M%S-%f')
+        partial_path = os.path.join(self.backup_dir, snapshot_id + ".partial")
+        os.makedirs(partial_path)
+        manifest = {'created_at': created_at.strftime(TIMESTAMP_FORMAT), 'databases': {}}
+        source = sqlite3.connect(self.databases['projects'], isolation_level=None)
+        try:
+            source.execute('ATTACH DATABASE ? AS documents', (self.databases['documents'],))
+            source.execute('BEGIN')
+            for schema in ('main', 'documents'):
+                source.execute(f'SELECT COUNT(*) FROM {schema}.sqlite_master').fetchone()
+
+            for name, schema in (('projects', 'main'), ('documents', 'documents')):
+                file_name = f"{name}.db"
+                target = sqlite3.connect(os.path.join(partial_path, file_name))
+                source.backup(target, pages=self.pages, progress=self._progress(name, progress, cancel), name=schema)
+                target.execute('PRAGMA journal_mode=DELETE')
+                manifest['databases'][name] = {
+                    'file': file_name,
+                    'source': os.path.abspath(self.databases[name]),
+                    'user_version': target.execute('PRAGMA user_version').fetchone()[0],
+                    'pages': target.execute('PRAGMA page_count').fetchone()[0],
+                    'check': target.execute('PRAGMA quick_check').fetchone()[0]
+                }
+                target.close()
+            source.execute('COMMIT')
+        except BaseException:
+            shutil.rmtree(partial_path, ignore_errors=True)
+            raise
+        finally:
+            source.close()
+
+        with open(os.path.join(partial_path, "manifest.json"), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        path = os.path.join(self.backup_dir, snapshot_id)
+        os.rename(partial_path, path)
+        return Snapshot(path, manifest)
+
+    def list_snapshots(self) -> List[Snapshot]:
+        if not os.path.isdir(self.backup_dir):
+            return []
+        snapshots = []
+        for entry in os.listdir(self.backup_dir):
+            manifest_path = os.path.join(self.backup_dir, entry, "manifest.json")
+            if os.path.exists(manifest_path):
+                with open(manifest_path, encoding='utf-8') as f:
+                    snapshots.append(Snapshot(os.path.join(self.backup_dir, entry), json.load(f)))
+        snapshots.sort(key=lambda s: s.created_at)
+        return snapshots
+
+    def find_snapshot(self, snapshot_id: Optional[str] = None, at: Optional[datetime] = None) -> Snapshot:
+        snapshots = self.list_snapshots()
+        if snapshot_id is not None:
+            candidates = [s for s in snapshots if s.snapshot_id == snapshot_id]
+        else:
+            candidates = [s for s in snapshots if at is None or s.created_at <= at]
+        if not candidates:
+            raise ValueError("Подходящая резервная копия не найдена")
+        return candidates[-1]
+
+    @timed("BackupService.restore")
+    def restore(self, snapshot: Snapshot, progress: Optional[Callable[[str, int, int], None]] = None,
+                backup_current: bool = True) -> Optional[Snapshot]:
+        runners = {name: MigrationRunner(path, MIGRATIONS[name]) for name, path in self.databases.items()}
+        for name, runner in runners.items():
+            database = snapshot.manifest['databases'][name]
+            if database['check'] != 'ok':
+                raise ValueError(f"Резервная копия {snapshot.snapshot_id} повреждена: {name}")
+            if database['user_version'] > runner.target_version:
+                raise ValueError(f"Резервная копия {snapshot.snapshot_id} создана более новой версией схемы: {name}")
+        safety = self.create_snapshot() if backup_current else None
+        for name, path in self.databases.items():
+            source = sqlite3.connect(snapshot.database_path(name))
+            target = sqlite3.connect(path)
+            try:
+                source.backup(target, pages=self.pages, progress=self._progress(name, progress, None))
+            finally:
+                target.close()
+                source.close()
+            runners[name].run()
+        return safety
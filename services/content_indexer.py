@@ -0,0 +1,127 @@
+import html
+import io
+import os
+import re
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from repositories.document_repository import DocumentRepository
+from repositories.blob_store import BlobStore
+from diagnostics.instrumentation import timed
+
+MAX_TEXT_LENGTH = 2_000_000
+
+def decode_text(data: bytes) -> str:
+    for encoding in ('utf-8-sig', 'cp1251'):
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return data.decode('utf-8', errors='replace')
+
+def extract_plain_text(data: bytes) -> str:
+    return decode_text(data)
+
+def extract_markup(data: bytes) -> str:
+    return html.unescape(re.sub(r"<[^>]+>", " ", decode_text(data)))
+
+def extract_zipped_xml(member: str) -> Callable[[bytes], str]:
+    def extract(data: bytes) -> str:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            return extract_markup(archive.read(member))
+    return extract
+
+EXTRACTORS: Dict[str, Callable[[bytes], str]] = {
+    '.txt': extract_plain_text,
+    '.md': extract_plain_text,
+    '.csv': extract_plain_text,
+    '.xml': extract_markup,
+    '.html': extract_markup,
+    '.htm': extract_markup,
+    '.docx': extract_zipped_xml('word/document.xml'),
+    '.odt': extract_zipped_xml('content.xml'),
+}
+
+def register_extractor(extension: str, extractor: Callable[[bytes], str]):
+    EXTRACTORS[extension.lower()] = extractor
+
+class ContentIndexer:
+    def __init__(self, repository: DocumentRepository, blob_store: Optional[BlobStore] = None,
+                 base_dir: str = "", workers: int = 2, batch_size: int = 50, pause: float = 0.05):
+        self.repository = repository
+        self.blob_store = blob_store
+        self.base_dir = base_dir
+        self.workers = workers
+        self.batch_size = batch_size
+        self.pause = pause
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def _source(self, file_path: Optional[str], content_hash: Optional[str]) -> Optional[Tuple[str, str]]:
+        if content_hash and self.blob_store is not None:
+            return self.blob_store.path(content_hash), f"sha256:{content_hash}"
+        if file_path:
+            path = os.path.join(self.base_dir, file_path)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return None
+            return path, f"mtime:{stat.st_mtime_ns}:{stat.st_size}"
+        return None
+
+    def pending(self) -> Tuple[List[Tuple[int, str, str, str]], List[int]]:
+        pending, stale = [], []
+        for doc_id, file_path, content_hash, indexed in self.repository.get_content_sources():
+            extension = os.path.splitext(file_path or "")[1].lower()
+            source = self._source(file_path, content_hash) if extension in EXTRACTORS else None
+            if source is None:
+                if indexed is not None:
+                    stale.append(doc_id)
+            elif source[1] != indexed:
+                pending.append((doc_id, source[0], extension, source[1]))
+        return pending, stale
+
+    def extract(self, item: Tuple[int, str, str, str]) -> Tuple[int, str, Optional[str], Optional[str]]:
+        doc_id, path, extension, fingerprint = item
+        try:
+            with open(path, 'rb') as f:
+                text = EXTRACTORS[extension](f.read())
+            return doc_id, fingerprint, " ".join(text.split())[:MAX_TEXT_LENGTH], None
+        except Exception as e:
+            return doc_id, fingerprint, None, f"{type(e).__name__}: {e}"
+
+    @timed("ContentIndexer.run_once")
+    def run_once(self) -> int:
+        pending, stale = self.pending()
+        if stale:
+            self.repository.remove_content(stale)
+        indexed = 0
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="content-indexer") as pool:
+            for i in range(0, len(pending), self.batch_size):
+                if self.stop_event.is_set():
+                    break
+                results = list(pool.map(self.extract, pending[i:i + self.batch_size]))
+                self.repository.store_content(results)
+                indexed += len(results)
+                self.stop_event.wait(self.pause)
+        return indexed
+
+    def start(self, interval: float = 60.0):
+        if self.thread is not None:
+            return
+        self.stop_event.clear()
+
+        def loop():
+            while not self.stop_event.is_set():
+                self.run_once()
+                self.stop_event.wait(interval)
+
+        self.thread = threading.Thread(target=loop, name="content-indexer", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
@@ -1,13 +1,53 @@
-from typing import List, Optional, Dict
+import json
+import os
+import threading
+from concurrent.futures import Future
+from typing import Callable, Iterator, List, Optional, Dict
 from datetime import datetime, timedelta
 from models.document import Document, DocumentVersion, ApprovalRoute
 from models.enums import DocumentStatus, DocumentCategory, RouteStatus
-from repositories.document_repository import DocumentRepository
+from models.transitions import TransitionOutcome
+from repositories.document_repository import DocumentRepository, BulkActionCancelled, REPORT_COLUMNS
+from repositories.write_queue import WriteQueue
+from repositories.blob_store import BlobStore
+from repositories.status_transitions import apply_transition
+from services.status_scheduler import StatusScheduler
+from strategies.author_index import AuthorIndex
+from models.serialization import document_to_dict
+from diagnostics.instrumentation import timed
 
 class DocumentService:
-    def __init__(self, repository: DocumentRepository):
+    def __init__(self, repository: DocumentRepository, write_queue: Optional[WriteQueue] = None,
+                 blob_store: Optional[BlobStore] = None, status_scheduler: Optional[StatusScheduler] = None):
         self.repository = repository
+        self.write_queue = write_queue
+        self.blob_store = blob_store
+        self.status_scheduler = status_scheduler
+        self.author_index = AuthorIndex()
 
+    def save_document(self, document: Document, immediate: bool = False) -> Future:
+        if self.write_queue is not None:
+            future = self.write_queue.submit(self.repository, lambda c: self.repository._write_document(c, document), immediate)
+        else:
+            future = Future()
+            self.repository.save_document(document)
+            future.set_result(None)
+        if self.status_scheduler is not None:
+            future.add_done_callback(lambda f: f.exception() is None and self.status_scheduler.schedule_document(document))
+        return future
+
+    def snapshot(self):
+        return self.repository.snapshot()
+
+    @timed("DocumentService.get_all_documents")
+    def get_all_documents(self) -> List[Document]:
+        return self.repository.get_all_documents()
+
+    @timed("DocumentService.get_documents_by_ids")
+    def get_documents_by_ids(self, doc_ids: List[int]) -> List[Document]:
+        return self.repository.get_documents_by_ids(doc_ids)
+
+    @timed("DocumentService.create_document")
     def create_document(self, name: str, category: DocumentCategory, author: str) -> Document:
         document = Document(
             doc_id=0,
@@ -17,31 +57,95 @@ class DocumentService:
             author=author,
             version="1.0"
         )
-        self.repository.save_document(document)
+        self.save_document(document, immediate=True).result()
         return document
 
+    @timed("DocumentService.publish_document")
     def publish_document(self, doc_id: int) -> bool:
-        documents = self.repository.get_all_documents()
-        for doc in documents:
-            if doc.doc_id == doc_id:
-                doc.status = DocumentStatus.PUBLISHED
-                self.repository.save_document(doc)
-                return True
-        return False
+        outcome = self.transition_documents([doc_id], DocumentStatus.PUBLISHED)[doc_id]
+        return outcome in (TransitionOutcome.APPLIED, TransitionOutcome.UNCHANGED)
+
+    @timed("DocumentService.transition_documents")
+    def transition_documents(self, doc_ids: List[int], target: DocumentStatus) -> Dict[int, TransitionOutcome]:
+        if self.write_queue is not None:
+            return self.write_queue.submit(
+                self.repository, lambda c: apply_transition(c, 'documents', doc_ids, target), immediate=True
+            ).result()
+        return self.repository.transition_documents(doc_ids, target)
+
+    @timed("DocumentService.bulk_transition")
+    def bulk_transition(self, doc_ids: List[int], target: DocumentStatus,
+                        progress: Optional[Callable[[int, int], None]] = None,
+                        cancel: Optional[threading.Event] = None) -> Dict[int, TransitionOutcome]:
+        return self.repository.run_chunked(doc_ids, lambda c, chunk: apply_transition(c, 'documents', chunk, target),
+                                           progress=progress, cancel=cancel)
+
+    def refresh_schedule(self, target: DocumentStatus):
+        if self.status_scheduler is not None and target in (DocumentStatus.PUBLISHED, DocumentStatus.PUBLICATION_WAITING):
+            self.status_scheduler.refresh()
+
+    @timed("DocumentService.bulk_recategorize")
+    def bulk_recategorize(self, doc_ids: List[int], category: DocumentCategory,
+                          progress: Optional[Callable[[int, int], None]] = None,
+                          cancel: Optional[threading.Event] = None) -> Dict[int, TransitionOutcome]:
+        return self.repository.run_chunked(doc_ids, lambda c, chunk: self.repository.write_category(c, chunk, category),
+                                           progress=progress, cancel=cancel)
+
+    @timed("DocumentService.export_documents")
+    def export_documents(self, doc_ids: List[int], path: str, progress: Optional[Callable[[int, int], None]] = None,
+                         cancel: Optional[threading.Event] = None, chunk_size: int = 500) -> int:
+        doc_ids = list(doc_ids)
+        partial_path = path + ".partial"
+        exported = 0
+        try:
+            with self.repository.snapshot(), open(partial_path, 'w', encoding='utf-8') as f:
+                for i in range(0, len(doc_ids), chunk_size):
+                    if cancel is not None and cancel.is_set():
+                        raise BulkActionCancelled("Выгрузка отменена")
+                    for document in self.repository.get_documents_by_ids(doc_ids[i:i + chunk_size]):
+                        f.write(json.dumps(document_to_dict(document), ensure_ascii=False) + "\n")
+                        exported += 1
+                    if progress is not None:
+                        progress(min(i + chunk_size, len(doc_ids)), len(doc_ids))
+            os.replace(partial_path, path)
+        finally:
+            if os.path.exists(partial_path):
+                os.unlink(partial_path)
+        return exported
+
+    @timed("DocumentService.export_register")
+    def export_register(self, path: str, columns: Optional[List[str]] = None, filters: Optional[Dict] = None,
+                        progress: Optional[Callable[[int, int], None]] = None,
+                        cancel: Optional[threading.Event] = None, batch_size: int = 1000) -> int:
+        from services.report_export import ReportExporter
+        return ReportExporter(self.repository, REPORT_COLUMNS, batch_size).export(path, columns, filters, progress, cancel)
 
+    @timed("DocumentService.transition_routes")
+    def transition_routes(self, route_ids: List[int], target: RouteStatus) -> Dict[int, TransitionOutcome]:
+        if self.write_queue is not None:
+            return self.write_queue.submit(
+                self.repository, lambda c: apply_transition(c, 'approval_routes', route_ids, target), immediate=True
+            ).result()
+        return self.repository.transition_routes(route_ids, target)
+
+    @timed("DocumentService.create_new_version")
     def create_new_version(self, doc_id: int, author: str, changes: str) -> Optional[Document]:
         documents = self.repository.get_all_documents()
         for doc in documents:
             if doc.doc_id == doc_id:
+                version = DocumentVersion(version=doc.version, doc_id=doc.doc_id, author=doc.author, changes=changes)
+                version.content_hash = doc.content_hash
+                self.repository.save_version(version)
                 current_version = float(doc.version)
                 new_version = str(current_version + 0.1)
                 
                 doc.version = new_version
                 doc.status = DocumentStatus.UPDATING
-                self.repository.save_document(doc)
+                self.save_document(doc, immediate=True).result()
                 return doc
         return None
 
+    @timed("DocumentService.get_document_history")
     def get_document_history(self, doc_id: int) -> List[DocumentVersion]:
         documents = self.repository.get_all_documents()
         history = []
@@ -56,6 +160,12 @@ class DocumentService:
                 history.append(version)
         return history
 
+    @timed("DocumentService.find_authors")
+    def find_authors(self, query: str, limit: int = 10) -> List[str]:
+        self.author_index.update(self.repository.get_authors())
+        return [author for author, _ in self.author_index.search(query, limit)]
+
+    @timed("DocumentService.search_documents_advanced")
     def search_documents_advanced(self, search_params: Dict) -> List[Document]:
         documents = self.repository.get_all_documents()
         results = documents
@@ -65,7 +175,10 @@ class DocumentService:
         if 'category' in search_params:
             results = [d for d in results if d.category.value == search_params['category']]
         if 'author' in search_params:
-            results = [d for d in results if search_params['author'].lower() in d.author.lower()]
+            author = search_params['author'].lower()
+            self.author_index.update({d.author for d in documents})
+            similar = self.author_index.matches(author)
+            results = [d for d in results if d.author in similar or author in d.author.lower()]
         if 'date_from' in search_params:
             results = [d for d in results if d.creation_date >= search_params['date_from']]
         if 'date_to' in search_params:
@@ -73,6 +186,41 @@ class DocumentService:
             
         return results
 
+    @timed("DocumentService.get_documents_by_category")
     def get_documents_by_category(self, category: DocumentCategory) -> List[Document]:
         documents = self.repository.get_all_documents()
-        return [d for d in documents if d.category == category]
\ No newline at end of file
+        return [d for d in documents if d.category == category]
+
+    def iter_documents(self, batch_size: int = 1000) -> Iterator[Document]:
+        return self.repository.iter_documents(batch_size)
+
+    def get_ids_by_status(self, status: DocumentStatus) -> List[int]:
+        return self.repository.get_ids_by_status(status)
+
+    @timed("DocumentService.import_documents")
+    def import_documents(self, documents: List[Document]) -> int:
+        return self.repository.import_documents(documents)
+
+    @timed("DocumentService.set_status")
+    def set_status(self, doc_ids: List[int], status: DocumentStatus) -> int:
+        return self.repository.update_status(doc_ids, status)
+
+    @timed("DocumentService.attach_file")
+    def attach_file(self, document: Document, path: str) -> Document:
+        document.content_hash, _ = self.blob_store.put_file(path)
+        document.file_path = os.path.basename(path)
+        self.save_document(document, immediate=True).result()
+        return document
+
+    def open_content(self, document: Document):
+        return self.blob_store.open(document.content_hash)
+
+    def read_preview(self, document: Document, offset: int = 0, length: int = 4096) -> bytes:
+        return self.blob_store.read_range(document.content_hash, offset, length)
+
+    def search_content_ids(self, query: str, limit: int = 1000) -> List[int]:
+        return self.repository.search_content(query, limit)
+
+    @timed("DocumentService.search_content")
+    def search_content(self, query: str, limit: int = 1000) -> List[Document]:
+        return self.repository.get_documents_by_ids(self.search_content_ids(query, limit))
\ No newline at end of file
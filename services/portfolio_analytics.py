@@ -0,0 +1,155 @@
+import math
+import statistics
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+from repositories.project_repository import ProjectRepository
+from diagnostics.instrumentation import timed
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MISSING = -1
+
+class ScheduleColumns:
+    def __init__(self, generation: int, rows: List[tuple]):
+        self.generation = generation
+        self.managers: List[str] = []
+        index: Dict[str, int] = {}
+        manager_codes, planned_end, actual_end, planned_month = array('q'), array('q'), array('q'), array('q')
+        for manager, end, actual, month in rows:
+            code = index.get(manager)
+            if code is None:
+                code = index[manager] = len(self.managers)
+                self.managers.append(manager)
+            manager_codes.append(code)
+            planned_end.append(end)
+            actual_end.append(MISSING if actual is None else actual)
+            planned_month.append(month)
+        self.size = len(rows)
+        if np is not None:
+            manager_codes, planned_end, actual_end, planned_month = (
+                np.frombuffer(column, dtype=np.int64) if len(column) else np.zeros(0, dtype=np.int64)
+                for column in (manager_codes, planned_end, actual_end, planned_month)
+            )
+        self.manager_codes = manager_codes
+        self.planned_end = planned_end
+        self.actual_end = actual_end
+        self.planned_month = planned_month
+
+def _percentiles(values: Sequence[int], qs: Sequence[float]) -> List[float]:
+    if not len(values):
+        return [math.nan for _ in qs]
+    if np is not None:
+        return [float(v) for v in np.percentile(values, qs)]
+    ordered = sorted(values)
+    results = []
+    for q in qs:
+        position = (len(ordered) - 1) * q / 100
+        lower = math.floor(position)
+        upper = min(lower + 1, len(ordered) - 1)
+        results.append(ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower))
+    return results
+
+def _histogram(values: Sequence[int], bins: int) -> Tuple[List[int], List[float]]:
+    if not len(values):
+        return [0] * bins, [float(i) for i in range(bins + 1)]
+    if np is not None:
+        counts, edges = np.histogram(values, bins)
+        return [int(c) for c in counts], [float(e) for e in edges]
+    low, high = float(min(values)), float(max(values))
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    width = (high - low) / bins
+    counts = [0] * bins
+    for value in values:
+        counts[min(int((value - low) / width), bins - 1)] += 1
+    return counts, [low + width * i for i in range(bins + 1)]
+
+def _month_label(month_index: int) -> str:
+    return f"{month_index // 12:04d}-{month_index % 12 + 1:02d}"
+
+class PortfolioAnalytics:
+    def __init__(self, repository: ProjectRepository):
+        self.repository = repository
+        self._columns: Optional[ScheduleColumns] = None
+
+    @timed("PortfolioAnalytics.columns")
+    def columns(self) -> ScheduleColumns:
+        generation = self.repository.get_generation()
+        if self._columns is None or self._columns.generation != generation:
+            self._columns = ScheduleColumns(*self.repository.get_schedule_columns())
+        return self._columns
+
+    def _completed(self, columns: ScheduleColumns):
+        if np is not None:
+            mask = columns.actual_end != MISSING
+            return (columns.actual_end[mask] - columns.planned_end[mask],
+                    columns.manager_codes[mask], columns.planned_month[mask])
+        deviations, managers, months = array('q'), array('q'), array('q')
+        for actual, planned, manager, month in zip(columns.actual_end, columns.planned_end,
+                                                   columns.manager_codes, columns.planned_month):
+            if actual != MISSING:
+                deviations.append(actual - planned)
+                managers.append(manager)
+                months.append(month)
+        return deviations, managers, months
+
+    def deviations(self):
+        return self._completed(self.columns())[0]
+
+    @timed("PortfolioAnalytics.deviation_distribution")
+    def deviation_distribution(self, bins: int = 20, percentiles: Sequence[float] = (50, 75, 90, 95)) -> Dict:
+        deviations = self.deviations()
+        counts, edges = _histogram(deviations, bins)
+        return {
+            'count': len(deviations),
+            'mean': float((np.mean if np is not None else statistics.fmean)(deviations)) if len(deviations) else math.nan,
+            'percentiles': dict(zip(percentiles, _percentiles(deviations, percentiles))),
+            'histogram': [{'from': edges[i], 'to': edges[i + 1], 'count': counts[i]} for i in range(bins)]
+        }
+
+    @timed("PortfolioAnalytics.slip_trend_by_month")
+    def slip_trend_by_month(self) -> List[Dict]:
+        deviations, _, months = self._completed(self.columns())
+        if not len(deviations):
+            return []
+        if np is not None:
+            first = int(months.min())
+            offsets = months - first
+            counts = np.bincount(offsets)
+            totals = np.bincount(offsets, weights=deviations)
+            late = np.bincount(offsets, weights=(deviations > 0).astype(np.int64))
+            return [{'month': _month_label(first + i), 'count': int(counts[i]),
+                     'mean_deviation': float(totals[i] / counts[i]), 'late_share': float(late[i] / counts[i])}
+                    for i in np.flatnonzero(counts)]
+        groups: Dict[int, List[int]] = {}
+        for deviation, month in zip(deviations, months):
+            group = groups.setdefault(month, [0, 0, 0])
+            group[0] += 1
+            group[1] += deviation
+            group[2] += deviation > 0
+        return [{'month': _month_label(month), 'count': count,
+                 'mean_deviation': total / count, 'late_share': late / count}
+                for month, (count, total, late) in sorted(groups.items())]
+
+    @timed("PortfolioAnalytics.manager_on_time_rates")
+    def manager_on_time_rates(self, tolerance_days: int = 0) -> Dict[str, Dict]:
+        columns = self.columns()
+        deviations, managers, _ = self._completed(columns)
+        if np is not None:
+            completed = np.bincount(managers, minlength=len(columns.managers))
+            on_time = np.bincount(managers, weights=(deviations <= tolerance_days).astype(np.int64),
+                                  minlength=len(columns.managers))
+        else:
+            completed = [0] * len(columns.managers)
+            on_time = [0] * len(columns.managers)
+            for deviation, manager in zip(deviations, managers):
+                completed[manager] += 1
+                on_time[manager] += deviation <= tolerance_days
+        return {
+            name: {'completed': int(completed[code]), 'on_time': int(on_time[code]),
+                   'rate': float(on_time[code] / completed[code])}
+            for code, name in enumerate(columns.managers) if completed[code]
+        }
@@ -1,29 +1,82 @@
+from concurrent.futures import Future
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict
-from models.project import Project
+import threading
+from typing import Callable, Iterator, List, Optional, Dict
+from models.project import Project, ProjectStage
 from models.enums import ProjectStatus
-from repositories.project_repository import ProjectRepository
+from models.transitions import TransitionOutcome
+from repositories.project_repository import ProjectRepository, REPORT_COLUMNS
+from repositories.project_document_repository import ProjectDocumentRepository
+from repositories.write_queue import WriteQueue
+from repositories.status_transitions import apply_transition
+from diagnostics.instrumentation import timed
 
 class ProjectService:
-    def __init__(self, repository: ProjectRepository):
+    def __init__(self, repository: ProjectRepository, document_links: Optional[ProjectDocumentRepository] = None,
+                 write_queue: Optional[WriteQueue] = None):
         self.repository = repository
+        self.document_links = document_links
+        self.write_queue = write_queue
+        self.analytics = None
 
+    def get_portfolio_analytics(self):
+        if self.analytics is None:
+            from services.portfolio_analytics import PortfolioAnalytics
+            self.analytics = PortfolioAnalytics(self.repository)
+        return self.analytics
+
+    def save_project(self, project: Project, immediate: bool = False) -> Future:
+        if self.write_queue is not None:
+            return self.write_queue.submit(self.repository, lambda c: self.repository._write_project(c, project), immediate)
+        future = Future()
+        self.repository.save_project(project)
+        future.set_result(None)
+        return future
+
+    def snapshot(self):
+        return self.repository.snapshot()
+
+    @timed("ProjectService.get_all_projects")
     def get_all_projects(self) -> List[Project]:
         return self.repository.get_all_projects()
 
+    @timed("ProjectService.get_projects_by_status")
     def get_projects_by_status(self, status: ProjectStatus) -> List[Project]:
         projects = self.repository.get_all_projects()
         return [p for p in projects if p.status == status]
 
+    @timed("ProjectService.get_projects_by_type")
     def get_projects_by_type(self, project_type: str) -> List[Project]:
         projects = self.repository.get_all_projects()
         return [p for p in projects if p.project_type.value == project_type]
 
+    @timed("ProjectService.get_projects_in_range")
+    def get_projects_in_range(self, start: datetime, end: datetime) -> List[Project]:
+        if start > end:
+            raise ValueError("Дата начала периода позже даты окончания")
+        return self.repository.get_projects_in_range(start, end)
+
+    @timed("ProjectService.transition_projects")
+    def transition_projects(self, project_ids: List[int], target: ProjectStatus) -> Dict[int, TransitionOutcome]:
+        if self.write_queue is not None:
+            return self.write_queue.submit(
+                self.repository, lambda c: apply_transition(c, 'projects', project_ids, target), immediate=True
+            ).result()
+        return self.repository.transition_projects(project_ids, target)
+
+    @timed("ProjectService.export_report")
+    def export_report(self, path: str, columns: Optional[List[str]] = None, filters: Optional[Dict] = None,
+                      progress: Optional[Callable[[int, int], None]] = None,
+                      cancel: Optional[threading.Event] = None, batch_size: int = 1000) -> int:
+        from services.report_export import ReportExporter
+        return ReportExporter(self.repository, REPORT_COLUMNS, batch_size).export(path, columns, filters, progress, cancel)
+
     def calculate_project_deviation(self, project: Project) -> Optional[timedelta]:
         if project.actual_end and project.end_date:
             return project.actual_end - project.end_date
         return None
 
+    @timed("ProjectService.get_project_progress_stats")
     def get_project_progress_stats(self) -> Dict:
         projects = self.repository.get_all_projects()
         total = len(projects)
@@ -39,6 +92,7 @@ class ProjectService:
             'completion_rate': (completed / total * 100) if total > 0 else 0
         }
 
+    @timed("ProjectService.update_project_progress")
     def update_project_progress(self, project_id: int, progress: int) -> bool:
         projects = self.repository.get_all_projects()
         for project in projects:
@@ -47,6 +101,36 @@ class ProjectService:
                 if progress >= 100:
                     project.status = ProjectStatus.COMPLETED
                     project.actual_end = datetime.now()
-                self.repository.save_project(project)
+                self.save_project(project, immediate=True).result()
                 return True
-        return False
\ No newline at end of file
+        return False
+
+    def get_project_stages(self, project_id: int) -> List[ProjectStage]:
+        return self.repository.get_project_stages(project_id)
+
+    def iter_projects(self, batch_size: int = 1000) -> Iterator[Project]:
+        return self.repository.iter_projects(batch_size)
+
+    def get_ids_by_status(self, status: ProjectStatus) -> List[int]:
+        return self.repository.get_ids_by_status(status)
+
+    @timed("ProjectService.import_projects")
+    def import_projects(self, projects: List[Project]) -> int:
+        return self.repository.import_projects(projects)
+
+    @timed("ProjectService.load_documents")
+    def load_documents(self, projects: List[Project]) -> List[Project]:
+        if self.document_links is None:
+            return projects
+        documents = self.document_links.get_documents_for_projects([p.project_id for p in projects])
+        for project in projects:
+            project.documents = documents.get(project.project_id, [])
+        return projects
+
+    @timed("ProjectService.link_documents")
+    def link_documents(self, project_id: int, doc_ids: List[int]):
+        self.document_links.link_documents(project_id, doc_ids)
+
+    @timed("ProjectService.unlink_documents")
+    def unlink_documents(self, project_id: int, doc_ids: List[int]):
+        self.document_links.unlink_documents(project_id, doc_ids)
\ No newline at end of file
@@ -0,0 +1,150 @@
+import csv
+import io
+import os
+import re
+import threading
+import zipfile
+from typing import Callable, Dict, List, Optional, Sequence
+from xml.sax.saxutils import escape
+from repositories.document_repository import BulkActionCancelled
+
+INVALID_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+class CsvReportWriter:
+    def __init__(self, path: str, delimiter: str = ';'):
+        self.file = open(path, 'w', newline='', encoding='utf-8-sig')
+        self.writer = csv.writer(self.file, delimiter=delimiter)
+
+    def write_rows(self, rows: Sequence[Sequence]):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+class XlsxReportWriter:
+    def __init__(self, path: str, sheet_name: str = "Отчет"):
+        self.sheet_name = sheet_name[:31]
+        self.archive = zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED)
+        self.sheet = io.TextIOWrapper(self.archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True),
+                                      encoding='utf-8')
+        self.sheet.write('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                         '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                         '<sheetData>')
+        self.row_count = 0
+        self.letters: List[str] = []
+
+    def _cell(self, reference: str, value) -> str:
+        if value is None:
+            return ""
+        if isinstance(value, bool):
+            value = int(value)
+        if isinstance(value, (int, float)):
+            return f'<c r="{reference}"><v>{value}</v></c>'
+        text = escape(INVALID_XML_CHARS.sub("", str(value)))
+        return f'<c r="{reference}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+    def write_rows(self, rows: Sequence[Sequence]):
+        chunk = []
+        for row in rows:
+            self.row_count += 1
+            while len(self.letters) < len(row):
+                self.letters.append(_column_letter(len(self.letters)))
+            cells = "".join(self._cell(f"{self.letters[i]}{self.row_count}", value) for i, value in enumerate(row))
+            chunk.append(f'<row r="{self.row_count}">{cells}</row>')
+        self.sheet.write("".join(chunk))
+
+    def close(self):
+        if self.archive.fp is None:
+            return
+        self.sheet.write('</sheetData></worksheet>')
+        self.sheet.close()
+        self.archive.writestr('[Content_Types].xml', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/worksheets/sheet1.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            '</Types>'))
+        self.archive.writestr('_rels/.rels', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="xl/workbook.xml"/>'
+            '</Relationships>'))
+        self.archive.writestr('xl/workbook.xml', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f'<sheets><sheet name="{escape(self.sheet_name)}" sheetId="1" r:id="rId1"/></sheets>'
+            '</workbook>'))
+        self.archive.writestr('xl/_rels/workbook.xml.rels', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+            'Target="worksheets/sheet1.xml"/>'
+            '</Relationships>'))
+        self.archive.close()
+
+WRITERS = {
+    '.csv': CsvReportWriter,
+    '.xlsx': XlsxReportWriter,
+}
+
+def open_writer(path: str):
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in WRITERS:
+        raise ValueError(f"Неподдерживаемый формат отчета: {extension or path}")
+    return WRITERS[extension](path)
+
+class ReportExporter:
+    def __init__(self, repository, columns: Dict[str, tuple], batch_size: int = 1000):
+        self.repository = repository
+        self.columns = columns
+        self.batch_size = batch_size
+
+    def resolve_columns(self, columns: Optional[Sequence[str]]) -> List[str]:
+        columns = list(columns or self.columns)
+        unknown = [column for column in columns if column not in self.columns]
+        if unknown:
+            raise ValueError(f"Неизвестные колонки отчета: {', '.join(unknown)}")
+        return columns
+
+    def export(self, path: str, columns: Optional[Sequence[str]] = None, filters: Optional[Dict] = None,
+               progress: Optional[Callable[[int, int], None]] = None,
+               cancel: Optional[threading.Event] = None) -> int:
+        columns = self.resolve_columns(columns)
+        root, extension = os.path.splitext(path)
+        partial_path = root + ".partial" + extension
+        writer = open_writer(partial_path)
+        exported = 0
+        try:
+            with self.repository.snapshot():
+                total = self.repository.count_report_rows(filters)
+                writer.write_rows([[self.columns[column][0] for column in columns]])
+                for rows in self.repository.iter_report_rows(columns, filters, self.batch_size):
+                    if cancel is not None and cancel.is_set():
+                        raise BulkActionCancelled("Выгрузка отчета отменена")
+                    writer.write_rows(rows)
+                    exported += len(rows)
+                    if progress is not None:
+                        progress(exported, total)
+            writer.close()
+            os.replace(partial_path, path)
+        finally:
+            if os.path.exists(partial_path):
+                writer.close()
+                os.unlink(partial_path)
+        return exported
@@ -0,0 +1,156 @@
+import heapq
+from collections import deque
+from typing import Dict, List, Set
+from models.project import Task
+from repositories.project_repository import ProjectRepository
+from diagnostics.instrumentation import timed
+
+class NetworkSchedule:
+    def __init__(self, tasks: List[Task]):
+        self.tasks: Dict[int, Task] = {task.task_id: task for task in tasks}
+        self.successors: Dict[int, List[int]] = {task_id: [] for task_id in self.tasks}
+        self.order: List[int] = []
+        self.position: Dict[int, int] = {}
+        self.sinks: List[int] = []
+        self.earliest_start: Dict[int, int] = {}
+        self.earliest_finish: Dict[int, int] = {}
+        self.latest_start: Dict[int, int] = {}
+        self.latest_finish: Dict[int, int] = {}
+        self.project_duration = 0
+
+        self._build_graph()
+        self._forward_pass()
+        self._backward_pass()
+
+    def _build_graph(self):
+        in_degree = {task_id: 0 for task_id in self.tasks}
+        for task in self.tasks.values():
+            for predecessor_id in task.predecessors:
+                if predecessor_id not in self.tasks:
+                    raise ValueError(f"Задача {task.task_id} ссылается на неизвестную задачу {predecessor_id}")
+                self.successors[predecessor_id].append(task.task_id)
+                in_degree[task.task_id] += 1
+
+        queue = deque(task_id for task_id, degree in in_degree.items() if degree == 0)
+        while queue:
+            task_id = queue.popleft()
+            self.position[task_id] = len(self.order)
+            self.order.append(task_id)
+            for successor_id in self.successors[task_id]:
+                in_degree[successor_id] -= 1
+                if in_degree[successor_id] == 0:
+                    queue.append(successor_id)
+
+        if len(self.order) != len(self.tasks):
+            raise ValueError("Сетевой график содержит циклические зависимости")
+        self.sinks = [task_id for task_id in self.order if not self.successors[task_id]]
+
+    def _forward_pass(self):
+        for task_id in self.order:
+            task = self.tasks[task_id]
+            start = max((self.earliest_finish[p] for p in task.predecessors), default=0)
+            self.earliest_start[task_id] = start
+            self.earliest_finish[task_id] = start + task.duration
+        self.project_duration = max((self.earliest_finish[t] for t in self.sinks), default=0)
+
+    def _backward_pass(self):
+        for task_id in reversed(self.order):
+            finish = min((self.latest_start[s] for s in self.successors[task_id]), default=self.project_duration)
+            self.latest_finish[task_id] = finish
+            self.latest_start[task_id] = finish - self.tasks[task_id].duration
+
+    def slack(self, task_id: int) -> int:
+        return self.latest_start[task_id] - self.earliest_start[task_id]
+
+    def critical_tasks(self) -> List[int]:
+        return [task_id for task_id in self.order if self.slack(task_id) == 0]
+
+    def critical_path(self) -> List[int]:
+        path = []
+        current = next((t for t in self.order if not self.tasks[t].predecessors and self.slack(t) == 0), None)
+        while current is not None:
+            path.append(current)
+            current = next((s for s in self.successors[current]
+                            if self.slack(s) == 0 and self.earliest_start[s] == self.earliest_finish[current]), None)
+        return path
+
+    def update_duration(self, task_id: int, duration: int) -> Set[int]:
+        task = self.tasks[task_id]
+        if task.duration == duration:
+            return set()
+        task.duration = duration
+        changed = self._propagate_forward(task_id)
+
+        previous_duration = self.project_duration
+        self.project_duration = max((self.earliest_finish[t] for t in self.sinks), default=0)
+        if self.project_duration != previous_duration:
+            previous_latest = dict(self.latest_start)
+            self._backward_pass()
+            changed.update(t for t in self.order if self.latest_start[t] != previous_latest[t])
+        else:
+            changed.update(self._propagate_backward(task_id))
+        return changed
+
+    def _propagate_forward(self, task_id: int) -> Set[int]:
+        changed = set()
+        heap = [self.position[task_id]]
+        queued = {task_id}
+        while heap:
+            current = self.order[heapq.heappop(heap)]
+            task = self.tasks[current]
+            start = max((self.earliest_finish[p] for p in task.predecessors), default=0)
+            finish = start + task.duration
+            if start == self.earliest_start[current] and finish == self.earliest_finish[current]:
+                continue
+            self.earliest_start[current] = start
+            self.earliest_finish[current] = finish
+            changed.add(current)
+            for successor_id in self.successors[current]:
+                if successor_id not in queued:
+                    queued.add(successor_id)
+                    heapq.heappush(heap, self.position[successor_id])
+        return changed
+
+    def _propagate_backward(self, task_id: int) -> Set[int]:
+        changed = set()
+        heap = [-self.position[task_id]]
+        queued = {task_id}
+        while heap:
+            current = self.order[-heapq.heappop(heap)]
+            finish = min((self.latest_start[s] for s in self.successors[current]), default=self.project_duration)
+            start = finish - self.tasks[current].duration
+            if start == self.latest_start[current] and finish == self.latest_finish[current]:
+                continue
+            self.latest_start[current] = start
+            self.latest_finish[current] = finish
+            changed.add(current)
+            for predecessor_id in self.tasks[current].predecessors:
+                if predecessor_id not in queued:
+                    queued.add(predecessor_id)
+                    heapq.heappush(heap, -self.position[predecessor_id])
+        return changed
+
+    def layout(self) -> List[List[int]]:
+        level: Dict[int, int] = {}
+        for task_id in self.order:
+            level[task_id] = max((level[p] + 1 for p in self.tasks[task_id].predecessors), default=0)
+        columns: List[List[int]] = [[] for _ in range(max(level.values(), default=-1) + 1)]
+        for task_id in self.order:
+            columns[level[task_id]].append(task_id)
+        for column in columns:
+            column.sort(key=lambda t: (self.earliest_start[t], self.slack(t)))
+        return columns
+
+class ScheduleService:
+    def __init__(self, repository: ProjectRepository):
+        self.repository = repository
+
+    @timed("ScheduleService.get_stage_schedule")
+    def get_stage_schedule(self, stage_id: int) -> NetworkSchedule:
+        return NetworkSchedule(self.repository.get_stage_tasks(stage_id))
+
+    @timed("ScheduleService.update_task_duration")
+    def update_task_duration(self, schedule: NetworkSchedule, task_id: int, duration: int) -> Set[int]:
+        duration = max(0, duration)
+        self.repository.update_task_duration(task_id, duration)
+        return schedule.update_duration(task_id, duration)
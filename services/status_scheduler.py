@@ -0,0 +1,132 @@
+import heapq
+import threading
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+from models.enums import DocumentStatus
+from repositories.document_repository import DocumentRepository
+from diagnostics.instrumentation import timed
+
+MAX_SLEEP = 3600.0
+
+class StatusScheduler:
+    def __init__(self, repository: DocumentRepository,
+                 on_transition: Optional[Callable[[List[Tuple[int, DocumentStatus]]], None]] = None,
+                 root=None, window: int = 1000, clock: Callable[[], datetime] = datetime.now):
+        self.repository = repository
+        self.on_transition = on_transition
+        self.root = root
+        self.window = window
+        self.clock = clock
+        self.heap: List[Tuple[datetime, int]] = []
+        self.lock = threading.RLock()
+        self.job = None
+        self.pending_arm = False
+        self.tk_thread: Optional[int] = None
+        self.running = False
+
+    def reload(self):
+        with self.lock:
+            self.heap = self.repository.get_status_deadlines(self.window)
+            heapq.heapify(self.heap)
+
+    def refresh(self):
+        with self.lock:
+            self.reload()
+            if self.running:
+                self._request_arm()
+
+    def next_deadline(self) -> Optional[datetime]:
+        with self.lock:
+            return self.heap[0][0] if self.heap else None
+
+    def schedule(self, doc_id: int, deadline: Optional[datetime]):
+        if deadline is None:
+            return
+        with self.lock:
+            earliest = self.next_deadline()
+            heapq.heappush(self.heap, (deadline, doc_id))
+            if self.running and (earliest is None or deadline < earliest):
+                self._request_arm()
+
+    def schedule_document(self, document):
+        if document.status == DocumentStatus.PUBLICATION_WAITING:
+            self.schedule(document.doc_id, document.publish_at)
+        elif document.status == DocumentStatus.PUBLISHED:
+            self.schedule(document.doc_id, document.valid_until)
+
+    @timed("StatusScheduler.run_due")
+    def run_due(self, now: Optional[datetime] = None) -> List[Tuple[int, DocumentStatus]]:
+        now = now or self.clock()
+        applied = self.repository.apply_timed_transitions(now)
+        with self.lock:
+            while self.heap and self.heap[0][0] <= now:
+                heapq.heappop(self.heap)
+            if applied or not self.heap:
+                self.reload()
+        if applied and self.on_transition is not None:
+            self.on_transition(applied)
+        return applied
+
+    def start(self):
+        with self.lock:
+            self.running = True
+            self.reload()
+            if self.root is not None:
+                self.tk_thread = threading.get_ident()
+            self._arm()
+
+    def stop(self):
+        with self.lock:
+            self.running = False
+            self.pending_arm = False
+            self._cancel()
+
+    def _request_arm(self):
+        if self.root is not None and threading.get_ident() != self.tk_thread:
+            if not self.pending_arm:
+                self.pending_arm = True
+                self.root.after(0, self._arm_pending)
+            return
+        self._arm()
+
+    def _arm_pending(self):
+        with self.lock:
+            if not self.pending_arm:
+                return
+            self.pending_arm = False
+            if self.running:
+                self._arm()
+
+    def _cancel(self):
+        if self.job is None:
+            return
+        if self.root is not None:
+            self.root.after_cancel(self.job)
+        else:
+            self.job.cancel()
+        self.job = None
+
+    def _arm(self):
+        self._cancel()
+        deadline = self.next_deadline()
+        if deadline is None:
+            return
+        delay = min(max((deadline - self.clock()).total_seconds(), 0.0), MAX_SLEEP)
+        if self.root is not None:
+            self.job = self.root.after(int(delay * 1000), self._wake)
+        else:
+            self.job = threading.Timer(delay, self._wake)
+            self.job.daemon = True
+            self.job.start()
+
+    def _wake(self):
+        with self.lock:
+            self.job = None
+            if not self.running:
+                return
+            deadline = self.next_deadline()
+        if deadline is not None and deadline <= self.clock():
+            self.run_due()
+        with self.lock:
+            if self.running:
+                self._arm()
@@ -1,2 +1,7 @@
-from .display_strategy import DisplayStrategy, TileDisplayStrategy, KanbanDisplayStrategy
-from .search_strategy import SearchStrategy, SimpleSearchStrategy, AdvancedSearchStrategy
\ No newline at end of file
+from .search_strategy import SearchStrategy, SimpleSearchStrategy, AdvancedSearchStrategy
+
+def __getattr__(name):
+    if name in ('DisplayStrategy', 'TileDisplayStrategy', 'KanbanDisplayStrategy', 'TimelineDisplayStrategy'):
+        from . import display_strategy
+        return getattr(display_strategy, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,136 @@
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from diagnostics.instrumentation import timed
+
+TRANSLIT = str.maketrans({
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'e', 'ж': 'zh', 'з': 'z', 'и': 'i',
+    'й': 'i', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't',
+    'у': 'u', 'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'shch', 'ъ': '', 'ы': 'y', 'ь': '',
+    'э': 'e', 'ю': 'iu', 'я': 'ia',
+})
+LATIN_VARIANTS = (('yu', 'iu'), ('ya', 'ia'), ('yo', 'e'), ('x', 'ks'), ('w', 'v'), ('y', 'i'))
+TOKEN = re.compile(r"[^\W\d_]+")
+
+def _transliterate(token: str) -> str:
+    token = token.translate(TRANSLIT)
+    for latin, replacement in LATIN_VARIANTS:
+        token = token.replace(latin, replacement)
+    return token
+
+def split_author(text: str) -> Tuple[List[str], str]:
+    words, initials = [], []
+    for token in TOKEN.findall(text.casefold()):
+        if len(token) == 1 and words:
+            initials.append(_transliterate(token))
+        else:
+            words.append(_transliterate(token))
+    return words, "".join(initials)
+
+def normalize_author(text: str) -> str:
+    words, initials = split_author(text)
+    return " ".join(words + [initials] if initials else words)
+
+def levenshtein(a: str, b: str, limit: int) -> int:
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        best = i
+        for j, cb in enumerate(b, 1):
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            current.append(value)
+            best = min(best, value)
+        if best > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+class BKTree:
+    def __init__(self):
+        self.root: Optional[list] = None
+        self.size = 0
+
+    def add(self, key: str):
+        if self.root is None:
+            self.root = [key, {}]
+            self.size = 1
+            return
+        node = self.root
+        while True:
+            distance = levenshtein(key, node[0], max(len(key), len(node[0])))
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = [key, {}]
+                self.size += 1
+                return
+            node = child
+
+    def search(self, key: str, max_distance: int) -> List[Tuple[int, str]]:
+        if self.root is None:
+            return []
+        results = []
+        stack = [self.root]
+        while stack:
+            term, children = stack.pop()
+            distance = levenshtein(key, term, max_distance + max(children, default=0))
+            if distance <= max_distance:
+                results.append((distance, term))
+            for edge, child in children.items():
+                if distance - max_distance <= edge <= distance + max_distance:
+                    stack.append(child)
+        return results
+
+class AuthorIndex:
+    def __init__(self, authors: Iterable[str] = ()):
+        self.tree = BKTree()
+        self.variants: Dict[str, Set[str]] = {}
+        self.initials: Dict[str, str] = {}
+        self.update(authors)
+
+    def __len__(self) -> int:
+        return len(self.initials)
+
+    def add(self, author: str):
+        if author in self.initials:
+            return
+        words, self.initials[author] = split_author(author)
+        for word in words:
+            if word not in self.variants:
+                self.variants[word] = set()
+                self.tree.add(word)
+            self.variants[word].add(author)
+
+    @timed("AuthorIndex.update")
+    def update(self, authors: Iterable[str]):
+        for author in authors:
+            self.add(author)
+
+    @staticmethod
+    def tolerance(word: str) -> int:
+        return 0 if len(word) <= 3 else 1 if len(word) <= 6 else 2
+
+    @timed("AuthorIndex.search")
+    def search(self, query: str, limit: int = 10, max_distance: Optional[int] = None) -> List[Tuple[str, int]]:
+        words, initials = split_author(query)
+        scores: Optional[Dict[str, int]] = None
+        for word in words:
+            tolerance = self.tolerance(word) if max_distance is None else max_distance
+            best: Dict[str, int] = {}
+            for distance, term in self.tree.search(word, tolerance):
+                for author in self.variants[term]:
+                    if distance < best.get(author, tolerance + 1):
+                        best[author] = distance
+            scores = best if scores is None else {a: d + best[a] for a, d in scores.items() if a in best}
+        if not scores:
+            return []
+        matched = [(author, distance) for author, distance in scores.items()
+                   if self.initials[author].startswith(initials)]
+        return sorted(matched, key=lambda item: (item[1], item[0]))[:limit]
+
+    def matches(self, query: str, max_distance: Optional[int] = None) -> Set[str]:
+        return {author for author, _ in self.search(query, len(self.initials), max_distance)}
@@ -1,9 +1,11 @@
 from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
 from typing import List
 import tkinter as tk
 from tkinter import ttk
 from models.project import Project
 from models.enums import ProjectStatus, ProjectType
+from diagnostics.instrumentation import timed
 
 class DisplayStrategy(ABC):
     @abstractmethod
@@ -11,6 +13,7 @@ class DisplayStrategy(ABC):
         pass
 
 class TileDisplayStrategy(DisplayStrategy):
+    @timed("TileDisplayStrategy.display")
     def display(self, projects: List[Project], container):
         canvas = tk.Canvas(container, bg="white")
         scrollbar_y = ttk.Scrollbar(container, orient=tk.VERTICAL, command=canvas.yview)
@@ -69,6 +72,7 @@ class TileDisplayStrategy(DisplayStrategy):
         return canvas
 
 class KanbanDisplayStrategy(DisplayStrategy):
+    @timed("KanbanDisplayStrategy.display")
     def display(self, projects: List[Project], container):
         for widget in container.winfo_children():
             widget.destroy()
@@ -95,4 +99,55 @@ class KanbanDisplayStrategy(DisplayStrategy):
                 progress = ttk.Progressbar(project_frame, value=project.progress, maximum=100)
                 progress.pack(fill=tk.X, padx=5, pady=2)
         
-        return container
\ No newline at end of file
+        return container
+
+class TimelineDisplayStrategy(DisplayStrategy):
+    def __init__(self, start: datetime, end: datetime, width: int = 900, row_height: int = 24, label_width: int = 220):
+        self.start = start
+        self.end = end
+        self.width = width
+        self.row_height = row_height
+        self.label_width = label_width
+
+    def _x(self, date: datetime) -> float:
+        days = max(1, (self.end - self.start).days + 1)
+        offset = min(max((date - self.start).days, 0), days)
+        return self.label_width + offset * self.width / days
+
+    @timed("TimelineDisplayStrategy.display")
+    def display(self, projects: List[Project], container):
+        canvas = tk.Canvas(container, bg="white")
+        scrollbar_y = ttk.Scrollbar(container, orient=tk.VERTICAL, command=canvas.yview)
+        canvas.configure(yscrollcommand=scrollbar_y.set)
+        scrollbar_y.pack(side=tk.RIGHT, fill=tk.Y)
+        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        top = 30
+        bottom = top + max(1, len(projects)) * self.row_height
+        month = datetime(self.start.year, self.start.month, 1)
+        while month <= self.end:
+            x = self._x(month)
+            canvas.create_line(x, top - 10, x, bottom, fill="lightgray")
+            canvas.create_text(x + 2, top - 20, text=month.strftime('%m.%Y'), anchor="w", font=("Arial", 8))
+            month = (month + timedelta(days=32)).replace(day=1)
+
+        today = datetime.now()
+        if self.start <= today <= self.end:
+            canvas.create_line(self._x(today), top - 10, self._x(today), bottom, fill="red", dash=(4, 2))
+
+        for row, project in enumerate(projects):
+            y = top + row * self.row_height
+            tags = ('project', str(project.project_id))
+            canvas.create_text(5, y + self.row_height / 2, text=project.name, anchor="w",
+                               font=("Arial", 9), tags=tags)
+            x1, x2 = self._x(project.start_date), self._x(project.end_date + timedelta(days=1))
+            canvas.create_rectangle(x1, y + 4, x2, y + self.row_height - 4, fill="lightblue", outline="black", tags=tags)
+            if project.progress:
+                canvas.create_rectangle(x1, y + 4, x1 + (x2 - x1) * project.progress / 100, y + self.row_height - 4,
+                                        fill="steelblue", outline="", tags=tags)
+            if project.actual_end:
+                x = self._x(project.actual_end + timedelta(days=1))
+                canvas.create_line(x, y + 2, x, y + self.row_height - 2, fill="red", width=2, tags=tags)
+
+        canvas.configure(scrollregion=canvas.bbox("all"))
+        return canvas
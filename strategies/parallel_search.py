@@ -0,0 +1,138 @@
+import os
+import re
+import sqlite3
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from models.document import Document
+from repositories.document_repository import DocumentRepository
+from strategies.search_strategy import AdvancedSearchStrategy
+from strategies.author_index import AuthorIndex
+from strategies.stemmer import document_terms, document_text, normalize_text, stem_text
+from diagnostics.instrumentation import timed
+
+_shard: List[Tuple[int, str, str, str, str, str, str, str]] = []
+
+def _load_shard(db_path: str, low: Optional[int], high: Optional[int]) -> int:
+    global _shard
+    _shard = []
+    if low is None:
+        return 0
+    conn = sqlite3.connect(db_path)
+    c = conn.cursor()
+    c.execute('''
+        SELECT id, name, author, description, status, category, search_terms, search_text FROM documents
+        WHERE id BETWEEN ? AND ? ORDER BY id
+    ''', (low, high))
+    _shard = [(row[0], row[1].lower(), row[2].lower(), (row[3] or "").lower(), row[4].upper(), row[5].lower(),
+               row[6] if row[6] is not None else document_terms(row[1], row[2], row[3]),
+               row[7] if row[7] is not None else document_text(row[1], row[2], row[3]))
+              for row in c.fetchall()]
+    conn.close()
+    return len(_shard)
+
+def _matches_text(row: tuple, stemmed: str, text: str) -> bool:
+    return text in row[7] or stemmed in row[6]
+
+def _match_text(query: Tuple[str, str]) -> List[int]:
+    return [row[0] for row in _shard if _matches_text(row, *query)]
+
+def _match_regex(pattern: str) -> List[int]:
+    search = re.compile(pattern, re.IGNORECASE).search
+    return [row[0] for row in _shard if search(row[1]) or search(row[2]) or search(row[3])]
+
+def _match_operators(operators: Dict[str, str]) -> List[int]:
+    status = operators.get('status:', '').upper()
+    author = operators.get('author:', '').lower()
+    similar = operators.get('similar_authors', ())
+    category = operators.get('category:', '').lower()
+    simple = operators.get('simple', '')
+    text = normalize_text(simple)
+    stemmed = stem_text(simple) or text
+    results = []
+    for row in _shard:
+        if 'status:' in operators and row[4] != status:
+            continue
+        if author and author not in row[2] and row[2] not in similar:
+            continue
+        if category and category not in row[5]:
+            continue
+        if simple and not _matches_text(row, stemmed, text):
+            continue
+        results.append(row[0])
+    return results
+
+class ParallelSearch:
+    def __init__(self, repository: DocumentRepository, shards: Optional[int] = None):
+        self.repository = repository
+        self.shards = max(1, shards or os.cpu_count() or 1)
+        context = multiprocessing.get_context('spawn')
+        self.executors = [ProcessPoolExecutor(max_workers=1, mp_context=context) for _ in range(self.shards)]
+        self.ranges: List[Tuple[Optional[int], Optional[int]]] = []
+        self.author_index = AuthorIndex()
+        self.reload()
+
+    def _shard_ranges(self) -> List[Tuple[Optional[int], Optional[int]]]:
+        conn = sqlite3.connect(self.repository.db_path)
+        c = conn.cursor()
+        c.execute('SELECT COUNT(*), MAX(id) FROM documents')
+        count, max_id = c.fetchone()
+        ranges = []
+        size = -(-count // self.shards) if count else 0
+        for i in range(self.shards):
+            if i * size >= count:
+                ranges.append((None, None))
+                continue
+            c.execute('SELECT id FROM documents ORDER BY id LIMIT 1 OFFSET ?', (i * size,))
+            low = c.fetchone()[0]
+            if (i + 1) * size < count:
+                c.execute('SELECT id FROM documents ORDER BY id LIMIT 1 OFFSET ?', ((i + 1) * size,))
+                high = c.fetchone()[0] - 1
+            else:
+                high = max_id
+            ranges.append((low, high))
+        conn.close()
+        return ranges
+
+    @timed("ParallelSearch.reload")
+    def reload(self) -> int:
+        self.ranges = self._shard_ranges()
+        self.author_index.update(self.repository.get_authors())
+        futures = [executor.submit(_load_shard, self.repository.db_path, low, high)
+                   for executor, (low, high) in zip(self.executors, self.ranges)]
+        return sum(future.result() for future in futures)
+
+    def _run(self, func, argument) -> List[int]:
+        futures = [executor.submit(func, argument) for executor in self.executors]
+        doc_ids = []
+        for future in futures:
+            doc_ids.extend(future.result())
+        return doc_ids
+
+    @timed("ParallelSearch.search_ids")
+    def search_ids(self, query: str, advanced: bool = False, regex: bool = False) -> List[int]:
+        if regex:
+            try:
+                re.compile(query)
+            except re.error as e:
+                raise ValueError(f"Некорректное регулярное выражение: {e}")
+            return self._run(_match_regex, query)
+        if advanced:
+            operators = AdvancedSearchStrategy()._parse_operators(query)
+            if operators.get('author:'):
+                operators['similar_authors'] = {a.lower() for a in self.author_index.matches(operators['author:'])}
+            return self._run(_match_operators, operators)
+        return self._run(_match_text, (stem_text(query) or normalize_text(query), normalize_text(query)))
+
+    def search(self, query: str, advanced: bool = False, regex: bool = False) -> List[Document]:
+        return self.repository.get_documents_by_ids(self.search_ids(query, advanced, regex))
+
+    def close(self):
+        for executor in self.executors:
+            executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
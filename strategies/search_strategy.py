@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import List, Dict, Optional
 from models.document import Document
 from models.enums import DocumentStatus
+from strategies.author_index import AuthorIndex
+from strategies.stemmer import document_terms, document_text, normalize_text, stem_text
+from diagnostics.instrumentation import timed
 
 class SearchStrategy(ABC):
     @abstractmethod
@@ -9,17 +12,19 @@ class SearchStrategy(ABC):
         pass
 
 class SimpleSearchStrategy(SearchStrategy):
+    @timed("SimpleSearchStrategy.search")
     def search(self, documents: List[Document], query: str) -> List[Document]:
-        query = query.lower()
-        results = []
-        for doc in documents:
-            if (query in doc.name.lower() or 
-                query in doc.author.lower() or 
-                query in doc.description.lower()):
-                results.append(doc)
-        return results
+        text = normalize_text(query)
+        stemmed = stem_text(query) or text
+        return [doc for doc in documents
+                if text in (doc.search_text or document_text(doc.name, doc.author, doc.description)) or
+                stemmed in (doc.search_terms or document_terms(doc.name, doc.author, doc.description))]
 
 class AdvancedSearchStrategy(SearchStrategy):
+    def __init__(self, author_index: Optional[AuthorIndex] = None):
+        self.author_index = author_index if author_index is not None else AuthorIndex()
+
+    @timed("AdvancedSearchStrategy.search")
     def search(self, documents: List[Document], query: str) -> List[Document]:
         if not query:
             return documents
@@ -33,7 +38,9 @@ class AdvancedSearchStrategy(SearchStrategy):
             
         if 'author:' in operators:
             author_value = operators['author:'].lower()
-            results = [d for d in results if author_value in d.author.lower()]
+            self.author_index.update({d.author for d in results})
+            similar = self.author_index.matches(author_value)
+            results = [d for d in results if d.author in similar or author_value in d.author.lower()]
             
         if 'category:' in operators:
             category_value = operators['category:'].lower()
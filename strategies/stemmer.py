@@ -0,0 +1,100 @@
+import re
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+VOWELS = set("аеиоуыэюя")
+WORD = re.compile(r"\w+")
+
+PERFECTIVE_GERUND = (("ившись", "ывшись", "ивши", "ывши", "ив", "ыв"), ("вшись", "вши", "в"))
+REFLEXIVE = ("ся", "сь")
+ADJECTIVE = ("ими", "ыми", "его", "ого", "ему", "ому", "ее", "ие", "ые", "ое", "ей", "ий", "ый", "ой", "ем", "им",
+             "ым", "ом", "их", "ых", "ую", "юю", "ая", "яя", "ою", "ею")
+PARTICIPLE = (("ивш", "ывш", "ующ"), ("ем", "нн", "вш", "ющ", "щ"))
+VERB = (("ейте", "уйте", "ила", "ыла", "ена", "ите", "или", "ыли", "ило", "ыло", "ено", "ует", "уют", "ены", "ить",
+         "ыть", "ишь", "ей", "уй", "ил", "ыл", "им", "ым", "ен", "ят", "ит", "ыт", "ую", "ю"),
+        ("ете", "йте", "ешь", "нно", "ла", "на", "ли", "ем", "ло", "но", "ет", "ют", "ны", "ть", "й", "л", "н"))
+NOUN = ("иями", "ями", "ами", "ией", "иям", "ием", "иях", "ев", "ов", "ие", "ье", "еи", "ии", "ей", "ой", "ий", "ям",
+        "ем", "ам", "ом", "ах", "ях", "ию", "ью", "ия", "ья", "а", "е", "и", "й", "о", "у", "ы", "ь", "ю", "я")
+SUPERLATIVE = ("ейше", "ейш")
+DERIVATIONAL = ("ость", "ост")
+
+def normalize_text(text: str) -> str:
+    return text.casefold().replace("ё", "е")
+
+def _regions(word: str) -> Tuple[int, int]:
+    rv = r2 = len(word)
+    for i, letter in enumerate(word):
+        if letter in VOWELS:
+            rv = i + 1
+            break
+    r1 = len(word)
+    for i in range(1, len(word)):
+        if word[i - 1] in VOWELS and word[i] not in VOWELS:
+            r1 = i + 1
+            break
+    for i in range(r1 + 1, len(word)):
+        if word[i - 1] in VOWELS and word[i] not in VOWELS:
+            r2 = i + 1
+            break
+    return rv, r2
+
+def _strip(word: str, rv: int, endings: Iterable[str]) -> Optional[str]:
+    for ending in endings:
+        if word.endswith(ending) and len(word) - len(ending) >= rv:
+            return word[:-len(ending)]
+    return None
+
+def _strip_grouped(word: str, rv: int, groups: Tuple[Tuple[str, ...], Tuple[str, ...]]) -> Optional[str]:
+    plain, after_a = groups
+    candidates = []
+    for ending in plain:
+        if word.endswith(ending) and len(word) - len(ending) >= rv:
+            candidates.append(ending)
+    for ending in after_a:
+        start = len(word) - len(ending)
+        if word.endswith(ending) and start - 1 >= rv and word[start - 1] in "ая":
+            candidates.append(ending)
+    if not candidates:
+        return None
+    return word[:-len(max(candidates, key=len))]
+
+def _strip_adjectival(word: str, rv: int) -> Optional[str]:
+    stripped = _strip(word, rv, ADJECTIVE)
+    if stripped is None:
+        return None
+    return _strip_grouped(stripped, rv, PARTICIPLE) or stripped
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    word = normalize_text(word)
+    if not any(letter in VOWELS for letter in word):
+        return word
+    rv, r2 = _regions(word)
+    stripped = _strip_grouped(word, rv, PERFECTIVE_GERUND)
+    if stripped is None:
+        word = _strip(word, rv, REFLEXIVE) or word
+        stripped = _strip_adjectival(word, rv) or _strip_grouped(word, rv, VERB) or _strip(word, rv, NOUN)
+    word = stripped if stripped is not None else word
+    if word.endswith("и") and len(word) - 1 >= rv:
+        word = word[:-1]
+    word = _strip(word, r2, DERIVATIONAL) or word
+    if word.endswith("нн") and len(word) - 2 >= rv:
+        return word[:-1]
+    stripped = _strip(word, rv, SUPERLATIVE)
+    if stripped is not None:
+        return stripped[:-1] if stripped.endswith("нн") else stripped
+    if word.endswith("ь") and len(word) - 1 >= rv:
+        return word[:-1]
+    return word
+
+def stem_words(text: str) -> List[str]:
+    return [stem(word) for word in WORD.findall(normalize_text(text))]
+
+def stem_text(text: str) -> str:
+    return " ".join(stem_words(text))
+
+def document_text(name: str, author: str, description: Optional[str]) -> str:
+    return "\n".join(normalize_text(field or "") for field in (name, author, description))
+
+def document_terms(name: str, author: str, description: Optional[str]) -> str:
+    return "\n".join(stem_text(field or "") for field in (name, author, description))
@@ -0,0 +1,103 @@
+import unittest
+import asyncio
+import http.client
+import json
+import os
+import tempfile
+import threading
+from api.server import ApiServer
+
+class TestApiServer(unittest.TestCase):
+    def setUp(self):
+        self.projects_db = tempfile.mktemp()
+        self.documents_db = tempfile.mktemp()
+        self.server = ApiServer(self.projects_db, self.documents_db, port=0, read_pool_size=2, stream_chunk=2)
+        self.loop = asyncio.new_event_loop()
+        self.loop.run_until_complete(self.server.start())
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        asyncio.run_coroutine_threadsafe(self.server.stop(), self.loop).result(10)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(10)
+        self.loop.close()
+        for path in (self.projects_db, self.documents_db):
+            if os.path.exists(path):
+                os.unlink(path)
+
+    def request(self, method: str, path: str, body=None):
+        conn = http.client.HTTPConnection("127.0.0.1", self.server.port, timeout=10)
+        payload = json.dumps(body).encode('utf-8') if body is not None else None
+        conn.request(method, path, body=payload, headers={'Content-Type': "application/json"})
+        response = conn.getresponse()
+        data = response.read().decode('utf-8')
+        conn.close()
+        if response.getheader('Content-Type', '').startswith("application/x-ndjson"):
+            return response.status, [json.loads(line) for line in data.splitlines()]
+        return response.status, json.loads(data)
+
+    def create(self, name: str):
+        return self.request('POST', "/documents", {'name': name, 'category': "ORDERS", 'author': "Иванов И.И."})
+
+    def test_create_and_stream_documents(self):
+        for i in range(5):
+            status, document = self.create(f"Приказ №{i}")
+            self.assertEqual(status, 200)
+
+        status, documents = self.request('GET', "/documents")
+        self.assertEqual(status, 200)
+        self.assertEqual([d['name'] for d in documents], [f"Приказ №{i}" for i in range(5)])
+
+        status, found = self.request('GET', "/documents/search?q=%E2%84%963")
+        self.assertEqual([d['name'] for d in found], ["Приказ №3"])
+
+    def test_batch_requests(self):
+        status, results = self.request('POST', "/batch", [
+            {'method': 'POST', 'path': "/documents", 'body': {'name': "А", 'category': "ORDERS", 'author': "Петров"}},
+            {'method': 'POST', 'path': "/documents", 'body': {'name': "Б", 'category': "MEMOS", 'author': "Петров"}},
+            {'method': 'GET', 'path': "/projects/stats"},
+            {'method': 'GET', 'path': "/unknown"}
+        ])
+        self.assertEqual(status, 200)
+        self.assertEqual([r['status'] for r in results], [200, 200, 200, 404])
+
+        status, documents = self.request('POST', "/documents/search", {'author': "петров"})
+        self.assertEqual(len(documents), 2)
+
+    def test_status_update_and_errors(self):
+        _, document = self.create("Положение")
+        status, result = self.request('POST', f"/documents/{document['id']}/publish")
+        self.assertEqual((status, result), (200, {'published': True}))
+
+        status, _ = self.request('POST', "/documents/status", {'ids': [document['id']], 'status': "nope"})
+        self.assertEqual(status, 400)
+        status, _ = self.request('DELETE', "/documents")
+        self.assertEqual(status, 405)
+
+    def test_malformed_request_line(self):
+        async def send(data: bytes) -> bytes:
+            reader, writer = await asyncio.open_connection("127.0.0.1", self.server.port)
+            writer.write(data)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response
+
+        for data in (b"GARBAGE\r\n\r\n", b"GET /documents HTTP/1.1\r\nContent-Length: abc\r\n\r\n"):
+            response = asyncio.run_coroutine_threadsafe(send(data), self.loop).result(10)
+            self.assertTrue(response.startswith(b"HTTP/1.1 400 Bad Request"), response)
+        status, _ = self.request('GET', "/projects/stats")
+        self.assertEqual(status, 200)
+
+    def test_concurrent_writes_are_serialized(self):
+        async def burst():
+            loop = asyncio.get_running_loop()
+            return await asyncio.gather(*(loop.run_in_executor(None, self.create, f"Док {i}") for i in range(20)))
+
+        results = asyncio.run(burst())
+        self.assertTrue(all(status == 200 for status, _ in results))
+        self.assertEqual(len({document['id'] for _, document in results}), 20)
+
+if __name__ == '__main__':
+    unittest.main()
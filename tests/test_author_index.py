@@ -0,0 +1,71 @@
+import unittest
+import os
+import tempfile
+from models.document import Document
+from models.enums import DocumentStatus, DocumentCategory
+from repositories.document_repository import DocumentRepository
+from services.document_service import DocumentService
+from strategies.author_index import AuthorIndex, BKTree, levenshtein, normalize_author
+from strategies.search_strategy import AdvancedSearchStrategy
+
+AUTHORS = ["Иванов И.И.", "Иванов И. И.", "Ivanov", "Иваненко А.А.", "Петров П.П.", "Пётр Ёлкин",
+           "Сидоров С.С.", "Kuznetsova M."]
+
+class TestAuthorIndex(unittest.TestCase):
+    def test_normalization(self):
+        self.assertEqual(normalize_author("Иванов И.И."), "ivanov ii")
+        self.assertEqual(normalize_author("Иванов И. И."), "ivanov ii")
+        self.assertEqual(normalize_author("  IVANOV  i.i."), "ivanov ii")
+        self.assertEqual(normalize_author("Пётр Ёлкин"), normalize_author("петр елкин"))
+        self.assertEqual(normalize_author("Кузнецова М."), normalize_author("Kuznetsova M."))
+
+    def test_bk_tree_matches_brute_force(self):
+        words = [normalize_author(a) for a in AUTHORS] + ["ivanova", "ivanovskii", "petrova", "sidorenko"]
+        tree = BKTree()
+        for word in words:
+            tree.add(word)
+        self.assertEqual(tree.size, len(set(words)))
+        for query in ("ivanof", "petrov", "sidorov ss", "zzz"):
+            for distance in (0, 1, 2, 3):
+                expected = {(levenshtein(query, w, 100), w) for w in words if levenshtein(query, w, 100) <= distance}
+                self.assertEqual(set(tree.search(query, distance)), expected)
+
+    def test_top_k_with_typos_and_transliteration(self):
+        index = AuthorIndex(AUTHORS)
+        self.assertEqual({a for a, _ in index.search("Иванов")}, {"Иванов И.И.", "Иванов И. И.", "Ivanov"})
+        self.assertEqual({a for a, _ in index.search("Ivanof")}, {"Иванов И.И.", "Иванов И. И.", "Ivanov"})
+        self.assertEqual([a for a, _ in index.search("Иванов И.И.")], ["Иванов И. И.", "Иванов И.И."])
+        self.assertEqual(index.search("Сидров"), [("Сидоров С.С.", 1)])
+        self.assertEqual(index.search("Кузнецова"), [("Kuznetsova M.", 0)])
+        self.assertEqual(index.search("елкин"), [("Пётр Ёлкин", 0)])
+        self.assertEqual(len(index.search("Иванов", limit=2)), 2)
+        self.assertEqual(index.search("Смирнов"), [])
+
+    def test_advanced_search_author_operator(self):
+        documents = [Document(i, f"Приказ №{i}", DocumentCategory.ORDERS, DocumentStatus.PUBLISHED, author)
+                     for i, author in enumerate(AUTHORS)]
+        strategy = AdvancedSearchStrategy()
+        found = strategy.search(documents, "author:Ivanof")
+        self.assertEqual([d.author for d in found], ["Иванов И.И.", "Иванов И. И.", "Ivanov"])
+        found = strategy.search(documents, "author:иван")
+        self.assertEqual([d.author for d in found], ["Иванов И.И.", "Иванов И. И.", "Иваненко А.А."])
+
+class TestFindAuthors(unittest.TestCase):
+    def setUp(self):
+        self.test_db = tempfile.mktemp()
+        repository = DocumentRepository(self.test_db)
+        repository.save_documents([Document(0, "Документ", DocumentCategory.ORDERS, DocumentStatus.DRAFT, author)
+                                   for author in AUTHORS])
+        self.service = DocumentService(repository)
+
+    def tearDown(self):
+        if os.path.exists(self.test_db):
+            os.unlink(self.test_db)
+
+    def test_find_authors_and_advanced_filter(self):
+        self.assertEqual(self.service.find_authors("Петроф"), ["Петров П.П."])
+        found = self.service.search_documents_advanced({'author': "Ivanov"})
+        self.assertEqual({d.author for d in found}, {"Иванов И.И.", "Иванов И. И.", "Ivanov"})
+
+if __name__ == '__main__':
+    unittest.main()
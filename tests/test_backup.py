@@ -0,0 +1,111 @@
+import unittest
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from datetime import datetime
+from benchmarks.data_generator import SyntheticDataGenerator
+from repositories import document_repository, project_repository
+from repositories.document_repository import DocumentRepository
+from repositories.project_repository import ProjectRepository
+from services.backup_service import BackupService, BackupCancelled
+
+class TestBackupService(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.projects_db = os.path.join(self.workdir, "projects.db")
+        self.documents_db = os.path.join(self.workdir, "documents.db")
+        ProjectRepository(self.projects_db)
+        DocumentRepository(self.documents_db)
+        generator = SyntheticDataGenerator(seed=3)
+        generator.populate_documents(self.documents_db, 2000)
+        generator.populate_projects(self.projects_db, 200)
+        self.service = BackupService(self.projects_db, self.documents_db,
+                                     os.path.join(self.workdir, "backups"), pages=16, pause=0)
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def count(self, path: str, table: str) -> int:
+        conn = sqlite3.connect(path)
+        count = conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+        conn.close()
+        return count
+
+    def test_snapshot_is_consistent_while_writing(self):
+        steps = []
+
+        def progress(name, copied, total):
+            steps.append(name)
+            if len(steps) == 2:
+                conn = sqlite3.connect(self.documents_db)
+                conn.execute("DELETE FROM documents WHERE id <= 100")
+                conn.commit()
+                conn.close()
+
+        snapshot = self.service.create_snapshot(progress)
+        self.assertGreater(len(steps), 2)
+        self.assertEqual(self.count(snapshot.database_path('documents'), 'documents'), 2000)
+        self.assertEqual(self.count(snapshot.database_path('projects'), 'projects'), 200)
+        self.assertEqual(snapshot.manifest['databases']['documents']['check'], 'ok')
+        self.assertEqual(self.count(self.documents_db, 'documents'), 1900)
+
+    def test_point_in_time_restore(self):
+        first = self.service.create_snapshot()
+        conn = sqlite3.connect(self.documents_db)
+        conn.execute("DELETE FROM documents")
+        conn.commit()
+        conn.close()
+        second = self.service.create_snapshot()
+
+        self.assertEqual(self.service.find_snapshot(at=second.created_at).snapshot_id, second.snapshot_id)
+        self.assertEqual(self.service.find_snapshot(at=first.created_at).snapshot_id, first.snapshot_id)
+        with self.assertRaises(ValueError):
+            self.service.find_snapshot(at=datetime(2000, 1, 1))
+
+        safety = self.service.restore(self.service.find_snapshot(at=first.created_at))
+        self.assertEqual(self.count(self.documents_db, 'documents'), 2000)
+        self.assertEqual([s.snapshot_id for s in self.service.list_snapshots()],
+                         [first.snapshot_id, second.snapshot_id, safety.snapshot_id])
+
+    def test_restore_migrates_older_snapshot(self):
+        snapshot = self.service.create_snapshot()
+        conn = sqlite3.connect(snapshot.database_path('documents'))
+        for trigger in ('insert', 'update', 'delete'):
+            conn.execute(f'DROP TRIGGER documents_terms_{trigger}')
+        conn.execute('DROP TABLE document_terms')
+        conn.execute('ALTER TABLE documents DROP COLUMN search_terms')
+        conn.execute('PRAGMA user_version = 5')
+        conn.commit()
+        conn.close()
+        snapshot.manifest['databases']['documents']['user_version'] = 5
+
+        steps = []
+        self.service.restore(snapshot, lambda name, copied, total: steps.append(name), backup_current=False)
+        self.assertGreater(steps.count('documents'), 1)
+        conn = sqlite3.connect(self.documents_db)
+        self.assertEqual(conn.execute('PRAGMA user_version').fetchone()[0], document_repository.SCHEMA_VERSION)
+        self.assertEqual(conn.execute('SELECT COUNT(*) FROM document_terms').fetchone()[0], 2000)
+        conn.close()
+
+    def test_restore_refuses_newer_snapshot(self):
+        snapshot = self.service.create_snapshot()
+        snapshot.manifest['databases']['projects']['user_version'] = project_repository.SCHEMA_VERSION + 1
+        conn = sqlite3.connect(self.documents_db)
+        conn.execute("DELETE FROM documents")
+        conn.commit()
+        conn.close()
+        with self.assertRaises(ValueError):
+            self.service.restore(snapshot, backup_current=False)
+        self.assertEqual(self.count(self.documents_db, 'documents'), 0)
+
+    def test_cancel_leaves_no_partial_snapshot(self):
+        cancel = threading.Event()
+        cancel.set()
+        with self.assertRaises(BackupCancelled):
+            self.service.create_snapshot(cancel=cancel)
+        self.assertEqual(os.listdir(self.service.backup_dir), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import io
+import os
+import shutil
+import tempfile
+from models.enums import DocumentCategory
+from repositories.blob_store import BlobStore
+from repositories.document_repository import DocumentRepository
+from services.document_service import DocumentService
+
+class TestBlobStore(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.repository = DocumentRepository(os.path.join(self.workdir, "documents.db"))
+        self.store = BlobStore(os.path.join(self.workdir, "blobs"), self.repository.db_path)
+        self.service = DocumentService(self.repository, blob_store=self.store)
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def write_file(self, name: str, content: bytes) -> str:
+        path = os.path.join(self.workdir, name)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def test_deduplication_and_range_reads(self):
+        content = os.urandom(3 * 1024 * 1024 + 17)
+        first = self.service.create_document("Регламент", DocumentCategory.REGULATORY, "Орлов")
+        second = self.service.create_document("Копия регламента", DocumentCategory.ARCHIVE, "Орлов")
+        self.service.attach_file(first, self.write_file("a.pdf", content))
+        self.service.attach_file(second, self.write_file("b.pdf", content))
+
+        self.assertEqual(first.content_hash, second.content_hash)
+        self.assertEqual(self.store.refcount(first.content_hash), 2)
+        self.assertEqual(sum(len(files) for _, _, files in os.walk(self.store.root)), 1)
+        self.assertEqual(self.service.read_preview(first, 1024 * 1024, 100), content[1024 * 1024:1024 * 1024 + 100])
+        with self.service.open_content(second) as view:
+            self.assertEqual(len(view), len(content))
+            self.assertEqual(view[-17:], content[-17:])
+        self.assertTrue(self.store.verify(first.content_hash))
+        self.assertEqual(self.repository.get_documents_by_ids([first.doc_id])[0].file_path, "a.pdf")
+
+    def test_versions_keep_blobs_alive_until_collected(self):
+        document = self.service.create_document("Шаблон", DocumentCategory.TEMPLATES, "Гусев")
+        old_hash = self.service.attach_file(document, self.write_file("v1.docx", b"v1")).content_hash
+        self.service.create_new_version(document.doc_id, "Гусев", "Правки")
+        document = self.repository.get_documents_by_ids([document.doc_id])[0]
+        self.service.attach_file(document, self.write_file("v2.docx", b"v2"))
+
+        self.assertEqual(self.store.refcount(old_hash), 1)
+        self.assertEqual(self.store.collect_garbage(grace_seconds=0), (0, 0))
+
+        orphan, size = self.store.put_stream(io.BytesIO(b"orphan"))
+        self.assertEqual(self.store.collect_garbage(grace_seconds=3600), (0, 0))
+        self.assertEqual(self.store.collect_garbage(grace_seconds=0), (1, size))
+        self.assertFalse(self.store.exists(orphan))
+        self.assertTrue(self.store.exists(old_hash))
+
+if __name__ == '__main__':
+    unittest.main()
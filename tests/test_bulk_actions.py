@@ -0,0 +1,68 @@
+import unittest
+import json
+import os
+import tempfile
+import threading
+from models.document import Document
+from models.enums import DocumentStatus, DocumentCategory
+from models.transitions import TransitionOutcome
+from repositories.document_repository import DocumentRepository, BulkActionCancelled
+from services.document_service import DocumentService
+
+class TestBulkActions(unittest.TestCase):
+    def setUp(self):
+        self.test_db = tempfile.mktemp()
+        self.export_path = tempfile.mktemp(suffix=".jsonl")
+        self.repository = DocumentRepository(self.test_db)
+        self.service = DocumentService(self.repository)
+        documents = [Document(0, f"Приказ №{i}", DocumentCategory.ORDERS,
+                              DocumentStatus.EXPIRED if i % 2 else DocumentStatus.DELETED, "Иванов И.И.")
+                     for i in range(2000)]
+        self.repository.save_documents(documents)
+        self.doc_ids = [d.doc_id for d in documents]
+
+    def tearDown(self):
+        for path in (self.test_db, self.export_path):
+            if os.path.exists(path):
+                os.unlink(path)
+
+    def test_bulk_archive_reports_progress(self):
+        progress = []
+        results = self.service.bulk_transition(self.doc_ids, DocumentStatus.ARCHIVED,
+                                               lambda done, total: progress.append((done, total)))
+        self.assertEqual(progress, [(500, 2000), (1000, 2000), (1500, 2000), (2000, 2000)])
+        self.assertEqual(sum(o == TransitionOutcome.APPLIED for o in results.values()), 1000)
+        self.assertEqual(sum(o == TransitionOutcome.FORBIDDEN for o in results.values()), 1000)
+        statuses = [d.status for d in self.repository.get_all_documents()]
+        self.assertEqual(statuses.count(DocumentStatus.ARCHIVED), 1000)
+
+    def test_cancel_rolls_back_whole_batch(self):
+        cancel = threading.Event()
+
+        def progress(done, total):
+            if done >= 1000:
+                cancel.set()
+
+        with self.assertRaises(BulkActionCancelled):
+            self.service.bulk_recategorize(self.doc_ids, DocumentCategory.ARCHIVE, progress, cancel)
+        self.assertEqual({d.category for d in self.repository.get_all_documents()}, {DocumentCategory.ORDERS})
+
+        results = self.service.bulk_recategorize(self.doc_ids[:3] + [10 ** 6], DocumentCategory.ARCHIVE)
+        self.assertEqual(list(results.values()), [TransitionOutcome.APPLIED] * 3 + [TransitionOutcome.NOT_FOUND])
+
+    def test_export_selected_documents(self):
+        self.assertEqual(self.service.export_documents(self.doc_ids[:700], self.export_path), 700)
+        with open(self.export_path, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([r['id'] for r in records], self.doc_ids[:700])
+
+        cancel = threading.Event()
+        cancel.set()
+        os.unlink(self.export_path)
+        with self.assertRaises(BulkActionCancelled):
+            self.service.export_documents(self.doc_ids, self.export_path, cancel=cancel)
+        self.assertFalse(os.path.exists(self.export_path))
+        self.assertFalse(os.path.exists(self.export_path + ".partial"))
+
+if __name__ == '__main__':
+    unittest.main()
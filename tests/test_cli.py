@@ -0,0 +1,99 @@
+import unittest
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from cli.main import main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.projects_db = tempfile.mktemp()
+        self.documents_db = tempfile.mktemp()
+        self.records = tempfile.mktemp(suffix=".jsonl")
+        with open(self.records, 'w', encoding='utf-8') as f:
+            for i, status in enumerate(["Черновик", "Черновик", "Опубликован"]):
+                f.write(json.dumps({'name': f"Приказ №{i}", 'category': "Приказы и распоряжения",
+                                    'status': status, 'author': "Иванов И.И.",
+                                    'creation_date': "2024-03-01"}, ensure_ascii=False) + "\n")
+
+    def tearDown(self):
+        for path in (self.projects_db, self.documents_db, self.records):
+            if os.path.exists(path):
+                os.unlink(path)
+
+    def run_cli(self, *args) -> list:
+        out = io.StringIO()
+        with redirect_stdout(out):
+            code = main(['--projects-db', self.projects_db, '--documents-db', self.documents_db, *args])
+        self.assertEqual(code, 0)
+        return [json.loads(line) for line in out.getvalue().splitlines()]
+
+    def test_import_and_export_documents(self):
+        self.assertEqual(self.run_cli('import', 'documents', '--file', self.records), [{'imported': 3}])
+
+        exported = self.run_cli('export', 'documents')
+        self.assertEqual([d['name'] for d in exported], ["Приказ №0", "Приказ №1", "Приказ №2"])
+        self.assertEqual(exported[0]['creation_date'], "2024-03-01")
+
+    def test_export_import_round_trip_into_empty_database(self):
+        self.run_cli('import', 'documents', '--file', self.records)
+        with open(self.records, 'w', encoding='utf-8') as f:
+            for record in self.run_cli('export', 'documents'):
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        os.unlink(self.documents_db)
+        self.assertEqual(self.run_cli('import', 'documents', '--file', self.records), [{'imported': 3}])
+        self.assertEqual(self.run_cli('import', 'documents', '--file', self.records), [{'imported': 3}])
+        exported = self.run_cli('export', 'documents')
+        self.assertEqual([(d['id'], d['name']) for d in exported],
+                         [(1, "Приказ №0"), (2, "Приказ №1"), (3, "Приказ №2")])
+
+        with open(self.records, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'id': 7, 'name': "Развитие сети", 'type': "Инвестиционный", 'status': "Создан",
+                                'start_date': "2024-01-01", 'end_date': "2024-06-01", 'manager': "Смирнов"},
+                               ensure_ascii=False) + "\n")
+        self.assertEqual(self.run_cli('import', 'projects', '--file', self.records), [{'imported': 1}])
+        self.assertEqual([(p['id'], p['name']) for p in self.run_cli('export', 'projects')], [(7, "Развитие сети")])
+
+    def test_search_streams_matches(self):
+        self.run_cli('import', 'documents', '--file', self.records)
+
+        self.assertEqual(len(self.run_cli('search', 'приказ')), 3)
+        self.assertEqual(len(self.run_cli('search', '--parallel', '2', 'приказ')), 3)
+        self.assertEqual(len(self.run_cli('search', '--regex', r'№[12]$')), 2)
+        self.assertEqual(len(self.run_cli('search', '--advanced', 'status:опубликован')), 1)
+        self.assertEqual(len(self.run_cli('advanced-search', '--status', 'DRAFT')), 2)
+
+    def test_bulk_status_transition(self):
+        self.run_cli('import', 'documents', '--file', self.records)
+
+        result = self.run_cli('transition', '--from', 'DRAFT', '--to', 'APPROVAL')
+        self.assertEqual(result[0]['updated'], 2)
+        self.assertEqual(len(self.run_cli('advanced-search', '--status', 'На согласовании')), 2)
+
+        with open(self.records, 'w', encoding='utf-8') as f:
+            for i, status in enumerate(["Создан", "Запланирован", "Создан"]):
+                f.write(json.dumps({'name': f"Проект {i}", 'type': "Инвестиционный", 'status': status,
+                                    'start_date': "2024-01-01", 'end_date': "2024-06-01", 'manager': "Смирнов"},
+                                   ensure_ascii=False) + "\n")
+        self.run_cli('import', 'projects', '--file', self.records)
+        result = self.run_cli('transition', 'projects', '--from', 'CREATED', '--to', 'PLANNED')
+        self.assertEqual(result[0]['updated'], 2)
+        self.assertEqual(result[0]['unchanged'], [])
+
+    def test_stats_on_empty_database(self):
+        self.assertEqual(self.run_cli('stats')[0]['total'], 0)
+
+    def test_cli_does_not_import_tk(self):
+        output = subprocess.run(
+            [sys.executable, '-c', "import sys, cli.main; print('tkinter' in sys.modules)"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        self.assertEqual(output.strip(), "False")
+
+if __name__ == '__main__':
+    unittest.main()
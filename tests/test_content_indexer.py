@@ -0,0 +1,83 @@
+import unittest
+import io
+import os
+import shutil
+import tempfile
+import zipfile
+from models.enums import DocumentCategory
+from repositories.blob_store import BlobStore
+from repositories.document_repository import DocumentRepository
+from services.document_service import DocumentService
+from services.content_indexer import ContentIndexer, register_extractor, EXTRACTORS
+
+class TestContentIndexer(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.repository = DocumentRepository(os.path.join(self.workdir, "documents.db"))
+        self.store = BlobStore(os.path.join(self.workdir, "blobs"), self.repository.db_path)
+        self.service = DocumentService(self.repository, blob_store=self.store)
+        self.indexer = ContentIndexer(self.repository, self.store, base_dir=self.workdir, batch_size=2, pause=0)
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def write_file(self, name: str, content: bytes) -> str:
+        path = os.path.join(self.workdir, name)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def docx(self, text: str) -> bytes:
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            archive.writestr('word/document.xml', f"<w:document><w:body><w:p><w:t>{text}</w:t></w:p></w:body></w:document>")
+        return buffer.getvalue()
+
+    def ids(self, query: str):
+        return sorted(self.service.search_content_ids(query))
+
+    def test_indexes_blobs_and_plain_files_incrementally(self):
+        order = self.service.create_document("Приказ", DocumentCategory.ORDERS, "Петров")
+        self.service.attach_file(order, self.write_file("order.docx", self.docx("Об утверждении регламента закупок")))
+        memo = self.service.create_document("Записка", DocumentCategory.MEMOS, "Волков")
+        memo.file_path = "memo.txt"
+        self.write_file("memo.txt", "Командировка в Казань".encode('cp1251'))
+        self.service.save_document(memo).result()
+        self.service.create_document("Без файла", DocumentCategory.MEMOS, "Волков")
+
+        self.assertEqual(self.indexer.run_once(), 2)
+        self.assertEqual(self.ids("закуп"), [order.doc_id])
+        self.assertEqual(self.ids("казань"), [memo.doc_id])
+        self.assertEqual(self.indexer.run_once(), 0)
+
+        self.write_file("memo.txt", "Командировка в Самару".encode('utf-8') + b" " * 10)
+        self.assertEqual(self.indexer.run_once(), 1)
+        self.assertEqual(self.ids("казань"), [])
+        self.assertEqual(self.ids("самару"), [memo.doc_id])
+
+        os.unlink(os.path.join(self.workdir, "memo.txt"))
+        self.indexer.run_once()
+        self.assertEqual(self.ids("самару"), [])
+
+    def test_resume_and_pluggable_extractors(self):
+        def extract_log(data: bytes) -> str:
+            if data == "запись1".encode():
+                self.indexer.stop_event.set()
+            return data.decode('utf-8')
+
+        register_extractor('.log', extract_log)
+        self.addCleanup(EXTRACTORS.pop, '.log')
+        documents = []
+        for i in range(5):
+            document = self.service.create_document(f"Журнал {i}", DocumentCategory.ARCHIVE, "Орлов")
+            documents.append(self.service.attach_file(document, self.write_file(f"{i}.log", f"запись{i}".encode())))
+
+        self.assertEqual(self.indexer.run_once(), 2)
+
+        resumed = ContentIndexer(self.repository, self.store, pause=0)
+        self.assertEqual(len(resumed.pending()[0]), 3)
+        self.assertEqual(resumed.run_once(), 3)
+        self.assertEqual(self.ids("запись4"), [documents[4].doc_id])
+
+if __name__ == '__main__':
+    unittest.main()
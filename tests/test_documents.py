@@ -1,10 +1,11 @@
 import unittest
 import os
+import sqlite3
 import tempfile
 from datetime import datetime
 from models.document import Document
 from models.enums import DocumentStatus, DocumentCategory
-from repositories.document_repository import DocumentRepository
+from repositories.document_repository import DocumentRepository, SCHEMA_VERSION
 from services.document_service import DocumentService
 from services.validation_service import ValidationService
 from strategies.search_strategy import SimpleSearchStrategy, AdvancedSearchStrategy
@@ -136,6 +137,20 @@ class TestDocuments(unittest.TestCase):
         self.assertEqual(len(history), 1)
         self.assertEqual(history[0].version, "1.0")
 
+    def test_schema_version_is_recorded(self):
+        conn = sqlite3.connect(self.test_db)
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        conn.execute('DROP TABLE approval_stages')
+        conn.commit()
+        conn.close()
+        self.assertEqual(version, SCHEMA_VERSION)
+        
+        DocumentRepository(self.test_db)
+        conn = sqlite3.connect(self.test_db)
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+        conn.close()
+        self.assertNotIn('approval_stages', tables)
+
     def test_phone_validation(self):
         self.assertTrue(ValidationService.validate_phone("+7 (123) 456-7890"))
         self.assertTrue(ValidationService.validate_phone("1234567890"))
@@ -0,0 +1,54 @@
+import unittest
+import json
+import os
+import tempfile
+from diagnostics.instrumentation import Instrumentation, OperationStats
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.instrumentation = Instrumentation(enabled=True)
+
+    def test_percentiles(self):
+        stats = OperationStats()
+        for value in range(1, 101):
+            stats.add(value / 1000)
+
+        summary = stats.summary()
+        self.assertEqual(summary['count'], 100)
+        self.assertAlmostEqual(summary['p50_ms'], 50)
+        self.assertAlmostEqual(summary['p95_ms'], 95)
+        self.assertAlmostEqual(summary['max_ms'], 100)
+
+    def test_timed_decorator_records_calls(self):
+        @self.instrumentation.timed("test.operation")
+        def operation(value):
+            return value * 2
+
+        self.assertEqual(operation(2), 4)
+        self.assertEqual(operation(3), 6)
+        self.assertEqual(self.instrumentation.summary()['test.operation']['count'], 2)
+
+    def test_disabled_instrumentation_records_nothing(self):
+        self.instrumentation.enabled = False
+        with self.instrumentation.timer("test.block"):
+            pass
+
+        self.assertEqual(self.instrumentation.summary(), {})
+
+    def test_export_json(self):
+        with self.instrumentation.timer("test.block"):
+            pass
+        path = tempfile.mktemp(suffix=".json")
+        try:
+            self.instrumentation.export_json(path)
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
+
+        self.assertIn("test.block", data['operations'])
+        self.assertIn("test.block", self.instrumentation.status_line())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,23 @@
+import unittest
+import tempfile
+from benchmarks.memory import BUDGET_PATH, check, load_budget, run
+
+class TestMemoryBudget(unittest.TestCase):
+    def test_footprint_within_budget(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            results = run(workdir, documents=2000, projects=500, seed=7)
+        self.assertEqual(results['Document'].count, 2000)
+        self.assertEqual(results['Project'].count, 500)
+        self.assertGreater(results['Document'].per_item, 0)
+        self.assertTrue(any(site.startswith("document") for site in results['Document'].top))
+        self.assertEqual(check(results, load_budget(BUDGET_PATH)), [])
+
+    def test_violations_reported(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            results = run(workdir, documents=200, projects=50, seed=7)
+        violations = check(results, {'per_item': {'Document': 10}, 'peak_per_item': {'Project': 10}})
+        self.assertEqual(len(violations), 2)
+        self.assertTrue(violations[0].startswith("Document"))
+
+if __name__ == '__main__':
+    unittest.main()
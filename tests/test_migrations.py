@@ -0,0 +1,62 @@
+import unittest
+import os
+import sqlite3
+import tempfile
+from repositories import document_repository
+from repositories.document_repository import DocumentRepository
+from repositories.migrations import Migration, MigrationRunner, Execute, AddColumn, CreateIndex, Backfill
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        self.test_db = tempfile.mktemp()
+        self.migrations = [
+            Migration(1, "Таблица", [Execute('CREATE TABLE IF NOT EXISTS items (id INTEGER PRIMARY KEY, name TEXT)')]),
+            Migration(2, "Нормализованное имя", [
+                AddColumn("items", "name_lower", "TEXT"),
+                Backfill("items", ["name"], ["name_lower"], transform=lambda row: (row[0].lower(),), chunk_size=7),
+                CreateIndex("idx_items_name_lower", "items", "name_lower")
+            ]),
+            Migration(3, "Длина имени", [
+                AddColumn("items", "name_length", "INTEGER"),
+                Backfill("items", [], ["name_length"], expressions=["length(name)"], chunk_size=10)
+            ])
+        ]
+
+    def tearDown(self):
+        if os.path.exists(self.test_db):
+            os.unlink(self.test_db)
+
+    def test_dry_run_changes_nothing(self):
+        runner = MigrationRunner(self.test_db, self.migrations)
+        self.assertEqual(runner.run(dry_run=True), [1, 2, 3])
+        plan = runner.plan()
+        self.assertEqual(plan[0], "1: Таблица")
+        self.assertIn("    CREATE INDEX IF NOT EXISTS idx_items_name_lower ON items(name_lower)", plan)
+        self.assertEqual(runner.current_version(), 0)
+
+    def test_stepwise_upgrade_with_chunked_backfill(self):
+        MigrationRunner(self.test_db, self.migrations[:1]).run()
+        conn = sqlite3.connect(self.test_db)
+        conn.executemany('INSERT INTO items (name) VALUES (?)', [(f"Имя {i}",) for i in range(50)])
+        conn.commit()
+        conn.close()
+
+        runner = MigrationRunner(self.test_db, self.migrations)
+        self.assertEqual(runner.run(), [2, 3])
+        self.assertEqual(runner.run(), [])
+        self.assertEqual(runner.current_version(), 3)
+
+        conn = sqlite3.connect(self.test_db)
+        rows = conn.execute('SELECT name, name_lower, name_length FROM items').fetchall()
+        self.assertTrue(all(lower == name.lower() and length == len(name) for name, lower, length in rows))
+        self.assertEqual(len(rows), 50)
+        conn.close()
+
+    def test_repository_schema_is_current(self):
+        DocumentRepository(self.test_db)
+        runner = MigrationRunner(self.test_db, document_repository.MIGRATIONS)
+        self.assertEqual(runner.current_version(), document_repository.SCHEMA_VERSION)
+        self.assertEqual(runner.plan(), [])
+
+if __name__ == '__main__':
+    unittest.main()
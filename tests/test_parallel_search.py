@@ -0,0 +1,51 @@
+import unittest
+import os
+import re
+import tempfile
+from benchmarks.data_generator import SyntheticDataGenerator
+from repositories.document_repository import DocumentRepository
+from strategies.search_strategy import SimpleSearchStrategy, AdvancedSearchStrategy
+from strategies.parallel_search import ParallelSearch
+
+class TestParallelSearch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.db_path = tempfile.mktemp()
+        cls.repository = DocumentRepository(cls.db_path)
+        SyntheticDataGenerator(seed=7).populate_documents(cls.db_path, 500)
+        cls.documents = cls.repository.get_all_documents()
+        cls.search = ParallelSearch(cls.repository, shards=3)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.search.close()
+        os.unlink(cls.db_path)
+
+    def ids(self, documents):
+        return [d.doc_id for d in documents]
+
+    def test_shards_cover_all_documents(self):
+        self.assertEqual(len(self.search.ranges), 3)
+        self.assertEqual(self.search.reload(), len(self.documents))
+
+    def test_matches_single_process_strategies(self):
+        for query in ("закупках", "ИВАНОВ", "Документ 4", "ров"):
+            expected = self.ids(SimpleSearchStrategy().search(self.documents, query))
+            self.assertEqual(self.search.search_ids(query), sorted(expected))
+
+        query = 'status:опубликован category:приказы охране'
+        expected = self.ids(AdvancedSearchStrategy().search(self.documents, query))
+        self.assertEqual(self.search.search_ids(query, advanced=True), sorted(expected))
+
+    def test_regex_and_hydration(self):
+        pattern = r"^(приказ|распоряжение) №\d{3} о (закупках|логистике)"
+        expected = [d.doc_id for d in self.documents
+                    if any(re.search(pattern, text, re.IGNORECASE) for text in (d.name, d.author, d.description))]
+        found = self.search.search(pattern, regex=True)
+        self.assertTrue(expected)
+        self.assertEqual(self.ids(found), expected)
+        with self.assertRaises(ValueError):
+            self.search.search_ids("(", regex=True)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import os
+import tempfile
+from datetime import datetime
+from benchmarks.data_generator import SyntheticDataGenerator
+from repositories.project_repository import ProjectRepository
+from services.project_service import ProjectService
+
+class TestPortfolioAnalytics(unittest.TestCase):
+    def setUp(self):
+        self.test_db = tempfile.mktemp()
+        self.repository = ProjectRepository(self.test_db)
+        SyntheticDataGenerator(seed=11).populate_projects(self.test_db, 600)
+        self.service = ProjectService(self.repository)
+        self.analytics = self.service.get_portfolio_analytics()
+        self.projects = self.repository.get_all_projects()
+        self.expected = [self.service.calculate_project_deviation(p).days
+                         for p in self.projects if p.actual_end]
+
+    def tearDown(self):
+        if os.path.exists(self.test_db):
+            os.unlink(self.test_db)
+
+    def test_deviations_match_per_project_calculation(self):
+        self.assertEqual(sorted(self.analytics.deviations()), sorted(self.expected))
+        distribution = self.analytics.deviation_distribution(bins=10, percentiles=(0, 50, 100))
+        self.assertEqual(distribution['count'], len(self.expected))
+        self.assertEqual(distribution['percentiles'][0], min(self.expected))
+        self.assertEqual(distribution['percentiles'][100], max(self.expected))
+        self.assertEqual(sum(b['count'] for b in distribution['histogram']), len(self.expected))
+
+    def test_trend_and_manager_rates(self):
+        trend = self.analytics.slip_trend_by_month()
+        self.assertEqual(sum(m['count'] for m in trend), len(self.expected))
+        self.assertEqual([m['month'] for m in trend], sorted(m['month'] for m in trend))
+        first = trend[0]
+        in_month = [self.service.calculate_project_deviation(p).days for p in self.projects
+                    if p.actual_end and p.end_date.strftime('%Y-%m') == first['month']]
+        self.assertAlmostEqual(first['mean_deviation'], sum(in_month) / len(in_month))
+
+        rates = self.analytics.manager_on_time_rates()
+        manager = self.projects[0].manager if self.projects[0].actual_end else next(p.manager for p in self.projects if p.actual_end)
+        own = [self.service.calculate_project_deviation(p).days for p in self.projects
+               if p.actual_end and p.manager == manager]
+        self.assertEqual(rates[manager]['completed'], len(own))
+        self.assertEqual(rates[manager]['on_time'], sum(d <= 0 for d in own))
+
+    def test_columns_cached_until_generation_changes(self):
+        columns = self.analytics.columns()
+        self.assertIs(self.analytics.columns(), columns)
+
+        project = self.projects[0]
+        project.actual_end = datetime(2030, 1, 1)
+        self.repository.save_project(project)
+        self.assertIsNot(self.analytics.columns(), columns)
+        self.assertEqual(self.analytics.columns().size, 600)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import os
+import tempfile
+import threading
+from datetime import datetime
+from models.document import Document
+from models.project import Project
+from models.enums import ProjectStatus, ProjectType, DocumentStatus, DocumentCategory
+from repositories.connection import ConnectionPool
+from repositories.project_repository import ProjectRepository
+from repositories.document_repository import DocumentRepository
+from repositories.project_document_repository import ProjectDocumentRepository
+from services.project_service import ProjectService
+
+class TestProjectDocuments(unittest.TestCase):
+    def setUp(self):
+        self.projects_db = tempfile.mktemp()
+        self.documents_db = tempfile.mktemp()
+        self.project_repository = ProjectRepository(self.projects_db)
+        self.document_repository = DocumentRepository(self.documents_db)
+        self.links = ProjectDocumentRepository(self.project_repository, self.document_repository)
+        self.service = ProjectService(self.project_repository, self.links)
+
+        self.projects = [
+            Project(0, f"Проект {i}", ProjectType.CORPORATE, ProjectStatus.IN_PROGRESS,
+                    datetime(2024, 1, 1), datetime(2024, 12, 31), "Менеджер")
+            for i in range(3)
+        ]
+        self.project_repository.save_projects(self.projects)
+        self.documents = [
+            Document(0, f"Документ {i}", DocumentCategory.ORDERS, DocumentStatus.DRAFT, "Автор", "1.0")
+            for i in range(4)
+        ]
+        self.document_repository.save_documents(self.documents)
+
+    def tearDown(self):
+        for path in (self.projects_db, self.documents_db):
+            if os.path.exists(path):
+                os.unlink(path)
+
+    def test_batch_load_documents_for_projects(self):
+        first, second, third = self.projects
+        self.service.link_documents(first.project_id, [self.documents[2].doc_id, self.documents[0].doc_id])
+        self.service.link_documents(second.project_id, [self.documents[0].doc_id, self.documents[0].doc_id])
+
+        self.service.load_documents(self.projects)
+        self.assertEqual([d.name for d in first.documents], ["Документ 0", "Документ 2"])
+        self.assertEqual([d.name for d in second.documents], ["Документ 0"])
+        self.assertEqual(third.documents, [])
+        self.assertEqual(self.links.get_document_counts(), {first.project_id: 2, second.project_id: 1})
+
+        self.service.unlink_documents(first.project_id, [self.documents[2].doc_id])
+        self.assertEqual([p.name for p in self.links.get_projects_for_document(self.documents[0].doc_id)],
+                         ["Проект 0", "Проект 1"])
+        self.assertEqual(self.links.get_projects_for_document(self.documents[2].doc_id), [])
+
+    def test_pooled_connections_attach_once(self):
+        pool = ConnectionPool(self.projects_db, size=1)
+        links = ProjectDocumentRepository(ProjectRepository(self.projects_db, pool=pool), self.document_repository)
+        links.link_documents(self.projects[0].project_id, [self.documents[1].doc_id])
+        for _ in range(2):
+            documents = links.get_documents_for_projects([self.projects[0].project_id])
+            self.assertEqual([d.doc_id for d in documents[self.projects[0].project_id]], [self.documents[1].doc_id])
+        pool.close()
+
+    def test_documents_loaded_inside_snapshot(self):
+        project_id = self.projects[0].project_id
+        self.service.link_documents(project_id, [self.documents[3].doc_id])
+        renamed = self.documents[3]
+        renamed.name = "Документ 3 (ред.)"
+        with self.project_repository.snapshot():
+            writer = threading.Thread(target=lambda: (self.document_repository.save_document(renamed),
+                                                      self.service.link_documents(project_id, [self.documents[1].doc_id])))
+            writer.start()
+            writer.join()
+            self.assertEqual([d.name for d in self.links.get_documents_for_projects([project_id])[project_id]],
+                             ["Документ 3"])
+        self.assertEqual([d.name for d in self.links.get_documents_for_projects([project_id])[project_id]],
+                         ["Документ 1", "Документ 3 (ред.)"])
+
+    def test_join_uses_link_indexes(self):
+        conn = self.links._connect()
+        plans = {
+            'project': "SELECT doc_id FROM project_documents WHERE project_id=1",
+            'document': "SELECT project_id FROM project_documents WHERE doc_id=1"
+        }
+        for direction, sql in plans.items():
+            detail = " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+            self.assertIn("USING", detail, direction)
+        conn.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import os
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+from benchmarks.data_generator import SyntheticDataGenerator
+from models.project import Project
+from models.enums import ProjectStatus, ProjectType
+from repositories.migrations import MigrationRunner
+from repositories.project_repository import ProjectRepository, MIGRATIONS
+from services.project_service import ProjectService
+
+class TestProjectIntervals(unittest.TestCase):
+    def setUp(self):
+        self.test_db = tempfile.mktemp()
+        self.repository = ProjectRepository(self.test_db)
+        SyntheticDataGenerator(seed=5).populate_projects(self.test_db, 400)
+        self.service = ProjectService(self.repository)
+
+    def tearDown(self):
+        if os.path.exists(self.test_db):
+            os.unlink(self.test_db)
+
+    def expected(self, start: datetime, end: datetime):
+        return sorted(
+            p.project_id for p in self.repository.get_all_projects()
+            if min(p.start_date, p.actual_start or p.start_date) <= end
+            and max(p.end_date, p.actual_end or p.end_date) >= start
+        )
+
+    def test_range_query_matches_full_scan(self):
+        for start, days in ((datetime(2023, 1, 1), 30), (datetime(2024, 6, 15), 1), (datetime(2020, 1, 1), 3650)):
+            end = start + timedelta(days=days)
+            found = self.service.get_projects_in_range(start, end)
+            self.assertEqual(sorted(p.project_id for p in found), self.expected(start, end))
+        with self.assertRaises(ValueError):
+            self.service.get_projects_in_range(datetime(2024, 2, 1), datetime(2024, 1, 1))
+
+    def test_index_follows_project_changes(self):
+        project = Project(0, "Новый объект", ProjectType.INVESTMENT, ProjectStatus.PLANNED,
+                          datetime(2031, 3, 1), datetime(2031, 4, 30), "Иванов И.И.", "")
+        self.repository.save_project(project)
+        window = (datetime(2031, 4, 30), datetime(2031, 5, 10))
+        self.assertEqual([p.project_id for p in self.repository.get_projects_in_range(*window)], [project.project_id])
+
+        project.end_date = datetime(2031, 4, 20)
+        self.repository.save_project(project)
+        self.assertEqual(self.repository.get_projects_in_range(*window), [])
+
+        project.actual_end = datetime(2031, 5, 5)
+        self.repository.save_project(project)
+        self.assertEqual(len(self.repository.get_projects_in_range(*window)), 1)
+
+        conn = sqlite3.connect(self.test_db)
+        conn.execute('DELETE FROM projects WHERE id=?', (project.project_id,))
+        conn.commit()
+        count = conn.execute('SELECT COUNT(*) FROM project_intervals WHERE id=?', (project.project_id,)).fetchone()[0]
+        conn.close()
+        self.assertEqual(count, 0)
+
+    def test_migration_backfills_existing_projects(self):
+        legacy_db = tempfile.mktemp()
+        try:
+            MigrationRunner(legacy_db, MIGRATIONS[:4]).run()
+            SyntheticDataGenerator(seed=6).populate_projects(legacy_db, 50)
+            repository = ProjectRepository(legacy_db)
+            self.assertEqual(len(repository.get_projects_in_range(datetime(1900, 1, 1), datetime(2100, 1, 1))), 50)
+        finally:
+            os.unlink(legacy_db)
+
+    def test_inverted_dates_are_indexed(self):
+        project = Project(0, "Перепутанные сроки", ProjectType.INVESTMENT, ProjectStatus.CREATED,
+                          datetime(2031, 5, 1), datetime(2031, 1, 1), "Смирнов")
+        self.repository.save_project(project)
+        found = self.service.get_projects_in_range(datetime(2031, 2, 1), datetime(2031, 2, 2))
+        self.assertEqual([p.project_id for p in found], [project.project_id])
+
+        project.actual_end = datetime(2030, 12, 1)
+        self.repository.save_project(project)
+        found = self.service.get_projects_in_range(datetime(2030, 12, 5), datetime(2030, 12, 6))
+        self.assertEqual([p.project_id for p in found], [project.project_id])
+
+    def test_migration_indexes_existing_inverted_projects(self):
+        legacy_db = tempfile.mktemp()
+        try:
+            MigrationRunner(legacy_db, MIGRATIONS[:4]).run()
+            conn = sqlite3.connect(legacy_db)
+            conn.execute('''
+                INSERT INTO projects (name, type, status, start_date, end_date, manager)
+                VALUES ('Перепутанные сроки', 'Инвестиционный', 'Создан', '2031-05-01', '2031-01-01', 'Смирнов')
+            ''')
+            conn.commit()
+            conn.close()
+            repository = ProjectRepository(legacy_db)
+            project = repository.get_all_projects()[0]
+            project.progress = 10
+            project.start_date = datetime(2031, 6, 1)
+            repository.save_project(project)
+            found = repository.get_projects_in_range(datetime(2031, 5, 10), datetime(2031, 5, 11))
+            self.assertEqual([p.project_id for p in found], [project.project_id])
+        finally:
+            os.unlink(legacy_db)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+from ui.refresh_scheduler import RefreshScheduler
+
+class FakeWidget:
+    def __init__(self):
+        self.callbacks = {}
+        self.delays = []
+
+    def after_idle(self, callback):
+        return self.after(0, callback)
+
+    def after(self, delay, callback):
+        after_id = f"after#{len(self.delays)}"
+        self.delays.append(delay)
+        self.callbacks[after_id] = callback
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.callbacks.pop(after_id, None)
+
+    def run_pending(self):
+        callbacks, self.callbacks = self.callbacks, {}
+        for callback in callbacks.values():
+            callback()
+
+class RecordingView:
+    def __init__(self):
+        self.refreshes = []
+
+    def apply_refresh(self, dirty):
+        self.refreshes.append(dirty)
+
+class TestRefreshScheduler(unittest.TestCase):
+    def setUp(self):
+        self.widget = FakeWidget()
+        self.scheduler = RefreshScheduler(self.widget, frame_budget_ms=16)
+        self.view = RecordingView()
+
+    def test_invalidations_are_merged_into_one_pass(self):
+        self.scheduler.invalidate(self.view, rows=[5])
+        self.scheduler.invalidate(self.view, rows=[9])
+        self.scheduler.invalidate(self.view, regions=['columns'])
+        self.widget.run_pending()
+
+        self.assertEqual(len(self.view.refreshes), 1)
+        dirty = self.view.refreshes[0]
+        self.assertEqual(dirty.rows, {5, 9})
+        self.assertEqual(dirty.regions, {'columns'})
+        self.assertFalse(dirty.full)
+
+    def test_empty_invalidation_means_full_refresh(self):
+        self.scheduler.invalidate(self.view, rows=[1])
+        self.scheduler.invalidate(self.view)
+        self.scheduler.flush()
+
+        self.assertTrue(self.view.refreshes[0].full)
+        self.assertEqual(self.widget.callbacks, {})
+
+    def test_redraws_are_rate_limited_to_frame_budget(self):
+        self.scheduler.invalidate(self.view, rows=[1])
+        self.widget.run_pending()
+        self.scheduler.invalidate(self.view, rows=[2])
+
+        self.assertEqual(self.widget.delays[0], 0)
+        self.assertGreater(self.widget.delays[1], 0)
+        self.assertLessEqual(self.widget.delays[1], 17)
+
+    def test_views_are_refreshed_independently(self):
+        other = RecordingView()
+        for row in range(100):
+            self.scheduler.invalidate(self.view, rows=[row])
+        self.scheduler.invalidate(other, regions=['columns'])
+        self.widget.run_pending()
+
+        self.assertEqual(len(self.view.refreshes), 1)
+        self.assertEqual(len(self.view.refreshes[0].rows), 100)
+        self.assertEqual(other.refreshes[0].regions, {'columns'})
+
+if __name__ == '__main__':
+    unittest.main()
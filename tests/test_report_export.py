@@ -0,0 +1,127 @@
+import unittest
+import csv
+import os
+import tempfile
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+from models.document import Document
+from models.project import Project
+from models.enums import DocumentStatus, DocumentCategory, ProjectStatus, ProjectType
+from repositories.document_repository import DocumentRepository, BulkActionCancelled
+from repositories.project_repository import ProjectRepository
+from services.document_service import DocumentService
+from services.project_service import ProjectService
+from cli.main import main
+
+NS = {'s': "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+def read_xlsx(path):
+    with zipfile.ZipFile(path) as archive:
+        names = set(archive.namelist())
+        root = ET.fromstring(archive.read('xl/worksheets/sheet1.xml'))
+    rows = []
+    for row in root.iterfind('.//s:row', NS):
+        values = []
+        for cell in row.iterfind('s:c', NS):
+            text = cell.find('s:is/s:t', NS)
+            values.append(text.text if text is not None else cell.find('s:v', NS).text)
+        rows.append(values)
+    return names, rows
+
+class TestReportExport(unittest.TestCase):
+    def setUp(self):
+        self.documents_db = tempfile.mktemp()
+        self.projects_db = tempfile.mktemp()
+        self.workdir = tempfile.mkdtemp()
+        self.document_repository = DocumentRepository(self.documents_db)
+        self.documents = DocumentService(self.document_repository)
+        self.projects = ProjectService(ProjectRepository(self.projects_db))
+        documents = []
+        for i in range(2500):
+            document = Document(0, f"Приказ №{i} <срочно> & \x01", DocumentCategory.ORDERS if i % 2 else DocumentCategory.TEMPLATES,
+                                DocumentStatus.PUBLISHED if i % 5 == 0 else DocumentStatus.DRAFT,
+                                "Иванов И.И." if i % 3 else "Петров П.П.")
+            document.creation_date = datetime(2024, 1 + i % 12, 1)
+            documents.append(document)
+        self.document_repository.save_documents(documents)
+        projects = []
+        for i in range(30):
+            start = datetime(2024, 1, 1) + timedelta(days=i)
+            project = Project(0, f"Проект {i}", ProjectType.INVESTMENT, ProjectStatus.IN_PROGRESS,
+                              start, start + timedelta(days=31), "Смирнов" if i % 2 else "Кузнецов")
+            project.actual_end = project.end_date + timedelta(days=2)
+            projects.append(project)
+        self.projects.repository.save_projects(projects)
+
+    def tearDown(self):
+        for path in (self.documents_db, self.projects_db):
+            if os.path.exists(path):
+                os.unlink(path)
+        for name in os.listdir(self.workdir):
+            os.unlink(os.path.join(self.workdir, name))
+        os.rmdir(self.workdir)
+
+    def path(self, name):
+        return os.path.join(self.workdir, name)
+
+    def test_csv_register_with_filters_and_columns(self):
+        progress = []
+        count = self.documents.export_register(self.path("register.csv"), ['id', 'name', 'author'],
+                                               {'status': DocumentStatus.PUBLISHED, 'author': "петров"},
+                                               lambda done, total: progress.append((done, total)), batch_size=50)
+        expected = [i for i in range(2500) if i % 5 == 0 and i % 3 == 0]
+        self.assertEqual(count, len(expected))
+        self.assertEqual(progress[-1], (count, count))
+        with open(self.path("register.csv"), encoding='utf-8-sig', newline='') as f:
+            rows = list(csv.reader(f, delimiter=';'))
+        self.assertEqual(rows[0], ["ID", "Название", "Автор"])
+        self.assertEqual([row[1] for row in rows[1:]], [f"Приказ №{i} <срочно> & \x01" for i in expected])
+        self.assertEqual({row[2] for row in rows[1:]}, {"Петров П.П."})
+
+    def test_xlsx_register_streams_all_rows(self):
+        count = self.documents.export_register(self.path("register.xlsx"), filters={'date_from': datetime(2024, 12, 1)})
+        self.assertEqual(count, 2500 // 12)
+        names, rows = read_xlsx(self.path("register.xlsx"))
+        self.assertTrue({'[Content_Types].xml', '_rels/.rels', 'xl/workbook.xml', 'xl/_rels/workbook.xml.rels'} <= names)
+        self.assertEqual(len(rows), count + 1)
+        self.assertEqual(rows[0][:3], ["ID", "Название", "Категория"])
+        self.assertEqual(rows[1][1], "Приказ №11 <срочно> & ")
+        self.assertEqual(rows[1][6], "2024-12-01")
+
+    def test_cancel_removes_partial_file(self):
+        cancel = threading.Event()
+
+        def progress(done, total):
+            cancel.set()
+
+        with self.assertRaises(BulkActionCancelled):
+            self.documents.export_register(self.path("register.xlsx"), progress=progress, cancel=cancel, batch_size=100)
+        self.assertEqual(os.listdir(self.workdir), [])
+
+        with self.assertRaises(ValueError):
+            self.documents.export_register(self.path("register.csv"), ['id', 'secret'])
+        with self.assertRaises(ValueError):
+            self.documents.export_register(self.path("register.pdf"))
+        self.assertEqual(os.listdir(self.workdir), [])
+
+    def test_project_report_deviation(self):
+        count = self.projects.export_report(self.path("projects.csv"), ['name', 'manager', 'deviation_days'],
+                                            {'manager': "смирнов", 'date_to': datetime(2024, 1, 10)})
+        self.assertEqual(count, 5)
+        with open(self.path("projects.csv"), encoding='utf-8-sig', newline='') as f:
+            rows = list(csv.reader(f, delimiter=';'))
+        self.assertEqual(rows[0], ["Название", "Руководитель", "Отклонение, дн."])
+        self.assertEqual({row[2] for row in rows[1:]}, {"2"})
+
+    def test_cli_report(self):
+        code = main(['--projects-db', self.projects_db, '--documents-db', self.documents_db, 'report', 'documents',
+                     '--output', self.path("cli.xlsx"), '--columns', 'id', 'status', '--category', 'ORDERS', '--quiet'])
+        self.assertEqual(code, 0)
+        _, rows = read_xlsx(self.path("cli.xlsx"))
+        self.assertEqual(len(rows), 1251)
+        self.assertEqual(rows[0], ["ID", "Статус"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import os
+import random
+import sqlite3
+import tempfile
+from models.project import Task
+from repositories.project_repository import ProjectRepository
+from services.schedule_service import NetworkSchedule, ScheduleService
+
+class TestScheduling(unittest.TestCase):
+    def setUp(self):
+        self.test_db = tempfile.mktemp()
+        self.repository = ProjectRepository(self.test_db)
+        self.service = ScheduleService(self.repository)
+
+        self.tasks = [
+            Task(1, "Анализ", 0, 3),
+            Task(2, "Проектирование", 0, 4, [1]),
+            Task(3, "Закупка", 0, 2, [1]),
+            Task(4, "Разработка", 0, 6, [2]),
+            Task(5, "Монтаж", 0, 1, [3]),
+            Task(6, "Приемка", 0, 2, [4, 5])
+        ]
+
+    def tearDown(self):
+        if os.path.exists(self.test_db):
+            os.unlink(self.test_db)
+
+    def test_critical_path_calculation(self):
+        schedule = NetworkSchedule(self.tasks)
+
+        self.assertEqual(schedule.project_duration, 15)
+        self.assertEqual(schedule.critical_path(), [1, 2, 4, 6])
+        self.assertEqual(schedule.earliest_start[5], 5)
+        self.assertEqual(schedule.latest_start[5], 12)
+        self.assertEqual(schedule.slack(3), 7)
+
+    def test_cycle_detection(self):
+        self.tasks[0].predecessors = [6]
+        with self.assertRaises(ValueError):
+            NetworkSchedule(self.tasks)
+
+    def test_unknown_predecessor(self):
+        self.tasks.append(Task(7, "Сдача", 0, 1, [99]))
+        with self.assertRaises(ValueError):
+            NetworkSchedule(self.tasks)
+
+    def test_incremental_update_matches_full_recalculation(self):
+        rng = random.Random(7)
+        tasks = [
+            Task(i, f"Задача {i}", 0, rng.randint(1, 10),
+                 rng.sample(range(1, i), min(i - 1, rng.randint(0, 3))))
+            for i in range(1, 300)
+        ]
+        schedule = NetworkSchedule(tasks)
+
+        for _ in range(50):
+            task_id = rng.randint(1, 299)
+            schedule.update_duration(task_id, rng.randint(0, 20))
+            expected = NetworkSchedule([Task(t.task_id, t.name, 0, t.duration, t.predecessors) for t in tasks])
+
+            self.assertEqual(schedule.project_duration, expected.project_duration)
+            self.assertEqual(schedule.earliest_start, expected.earliest_start)
+            self.assertEqual(schedule.latest_start, expected.latest_start)
+
+    def test_layout_levels(self):
+        columns = NetworkSchedule(self.tasks).layout()
+
+        self.assertEqual(columns[0], [1])
+        self.assertEqual(sorted(columns[1]), [2, 3])
+        self.assertEqual(columns[-1], [6])
+
+    def test_stage_tasks_save_and_retrieve(self):
+        tasks = [Task(0, "Анализ", 0, 3), Task(0, "Разработка", 0, 5)]
+        self.repository.save_stage_tasks(1, tasks)
+        tasks[1].predecessors = [tasks[0].task_id]
+        self.repository.save_stage_tasks(1, tasks)
+
+        schedule = self.service.get_stage_schedule(1)
+        self.assertEqual(schedule.project_duration, 8)
+
+        changed = self.service.update_task_duration(schedule, tasks[0].task_id, 10)
+        self.assertIn(tasks[1].task_id, changed)
+        self.assertEqual(self.service.get_stage_schedule(1).project_duration, 15)
+
+    def test_project_stages_listed_with_ids(self):
+        conn = sqlite3.connect(self.test_db)
+        conn.executemany('''
+            INSERT INTO project_stages (project_id, name, status, start_date, end_date) VALUES (?, ?, ?, ?, ?)
+        ''', [(1, "Монтаж", "В процессе", "2024-03-01", None),
+              (1, "Проектирование", "Завершен", "2024-01-10", "2024-02-20"),
+              (2, "Чужой этап", "Создан", None, None)])
+        conn.commit()
+        conn.close()
+        stages = self.repository.get_project_stages(1)
+        self.assertEqual([(s.name, s.stage_id) for s in stages], [("Проектирование", 2), ("Монтаж", 1)])
+        self.assertIsNone(stages[1].end_date)
+
+if __name__ == '__main__':
+    unittest.main()
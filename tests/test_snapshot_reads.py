@@ -0,0 +1,64 @@
+import unittest
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+from benchmarks.data_generator import SyntheticDataGenerator
+from models.project import Project
+from models.enums import ProjectStatus, ProjectType
+from repositories.connection import ReadOnlyPool, connect
+from repositories.project_repository import ProjectRepository
+from services.project_service import ProjectService
+
+class TestSnapshotReads(unittest.TestCase):
+    def setUp(self):
+        self.test_db = tempfile.mktemp()
+        self.writer = ProjectRepository(self.test_db)
+        SyntheticDataGenerator(seed=3).populate_projects(self.test_db, 200)
+        self.pool = ReadOnlyPool(self.test_db, size=2)
+        self.reader = ProjectRepository(self.test_db, pool=self.pool, read_pool=self.pool)
+
+    def tearDown(self):
+        self.pool.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.test_db + suffix):
+                os.unlink(self.test_db + suffix)
+
+    def project(self, name: str) -> Project:
+        return Project(0, name, ProjectType.CORPORATE, ProjectStatus.PLANNED,
+                       datetime(2025, 1, 1), datetime(2025, 3, 1), "Сидоров С.С.", "")
+
+    def test_read_only_pool_rejects_writes(self):
+        conn = self.pool.acquire()
+        try:
+            self.assertEqual(conn.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+            with self.assertRaises(sqlite3.OperationalError):
+                conn.execute('DELETE FROM projects')
+        finally:
+            conn.close()
+
+    def test_snapshot_is_stable_and_does_not_block_writers(self):
+        service = ProjectService(self.reader)
+        with service.snapshot():
+            before = service.get_project_progress_stats()['total']
+            started = time.perf_counter()
+            self.writer.save_project(self.project("Во время отчета"))
+            self.assertLess(time.perf_counter() - started, 1.0)
+            self.assertEqual(len(self.reader.get_all_projects()), before)
+            self.assertEqual(service.get_portfolio_analytics().columns().size, before)
+        self.assertEqual(len(self.reader.get_all_projects()), before + 1)
+
+    def test_snapshot_opens_while_writer_holds_lock(self):
+        conn = connect(self.test_db)
+        conn.execute('BEGIN IMMEDIATE')
+        conn.execute("UPDATE projects SET progress = -1")
+        try:
+            with self.writer.snapshot():
+                self.assertNotIn(-1, {p.progress for p in self.writer.get_all_projects()})
+        finally:
+            conn.rollback()
+            conn.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import os
+import tempfile
+from diagnostics.sql_trace import SqlTracer, parameters_shape
+from models.document import Document
+from models.enums import DocumentStatus, DocumentCategory
+from repositories import connection
+from repositories.document_repository import DocumentRepository
+from services.document_service import DocumentService
+
+class TestSqlTrace(unittest.TestCase):
+    def setUp(self):
+        self.test_db = tempfile.mktemp()
+        self.slow_log = tempfile.mktemp()
+        self.tracer = SqlTracer(capacity=5, slow_threshold_ms=0, slow_log_path=self.slow_log)
+        self.tracer.enable()
+        self.original_tracer = connection.sql_tracer
+        connection.sql_tracer = self.tracer
+
+        self.repository = DocumentRepository(self.test_db)
+        self.service = DocumentService(self.repository)
+        for i in range(3):
+            self.repository.save_document(Document(0, f"Документ {i}", DocumentCategory.ORDERS,
+                                                   DocumentStatus.DRAFT, "Иванов И.И."))
+        self.tracer.reset()
+
+    def tearDown(self):
+        connection.sql_tracer = self.original_tracer
+        self.tracer.disable()
+        for path in (self.test_db, self.slow_log):
+            if os.path.exists(path):
+                os.unlink(path)
+
+    def test_queries_are_counted_per_action(self):
+        with self.tracer.action("publish"):
+            self.service.publish_document(2)
+
+        stats = self.tracer.report()["publish"]
+        self.assertEqual(stats['queries'], 3)
+        self.assertGreaterEqual(stats['statements'], stats['queries'])
+        self.assertEqual(stats['rows'], 2)
+
+    def test_ring_buffer_keeps_latest_records(self):
+        for _ in range(4):
+            self.repository.get_all_documents()
+
+        recent = self.tracer.recent()
+        self.assertEqual(len(recent), 4)
+        self.assertEqual(recent[-1]['sql'], "SELECT * FROM documents")
+        self.assertEqual(recent[-1]['rows'], 3)
+
+    def test_slow_queries_are_logged(self):
+        self.repository.get_documents_by_ids([1, 2, 3, 4, 5])
+
+        with open(self.slow_log, encoding='utf-8') as f:
+            log = f.read()
+        self.assertIn("SELECT * FROM documents WHERE id IN", log)
+        self.assertIn("(5×int)", log)
+
+    def test_parameters_shape(self):
+        self.assertEqual(parameters_shape(("a", 1)), "(str, int)")
+        self.assertEqual(parameters_shape({'b': 1, 'a': 2}), "{a, b}")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from models.document import Document
+from models.enums import DocumentStatus, DocumentCategory
+from repositories.document_repository import DocumentRepository
+from services.document_service import DocumentService
+from repositories.write_queue import WriteQueue
+from services.status_scheduler import StatusScheduler
+
+class RecordingRoot:
+    def __init__(self):
+        self.calls = []
+        self.jobs = {}
+
+    def after(self, ms, callback):
+        job = f"after#{len(self.calls)}"
+        self.calls.append((threading.get_ident(), ms, callback.__name__))
+        self.jobs[job] = (ms, callback)
+        return job
+
+    def after_cancel(self, job):
+        self.calls.append((threading.get_ident(), None, 'after_cancel'))
+        self.jobs.pop(job, None)
+
+    def run_idle(self):
+        for job, (ms, callback) in list(self.jobs.items()):
+            if ms == 0:
+                del self.jobs[job]
+                callback()
+
+class TestStatusScheduler(unittest.TestCase):
+    def setUp(self):
+        self.test_db = tempfile.mktemp()
+        self.repository = DocumentRepository(self.test_db)
+        self.now = datetime(2024, 5, 1, 12, 0, 0)
+
+    def tearDown(self):
+        if os.path.exists(self.test_db):
+            os.unlink(self.test_db)
+
+    def document(self, status: DocumentStatus, publish_at=None, valid_until=None) -> Document:
+        document = Document(0, "Положение", DocumentCategory.REGULATORY, status, "Иванов И.И.")
+        document.publish_at = publish_at
+        document.valid_until = valid_until
+        self.repository.save_document(document)
+        return document
+
+    def test_due_transitions_applied_in_one_batch(self):
+        waiting = self.document(DocumentStatus.PUBLICATION_WAITING, publish_at=self.now - timedelta(minutes=5))
+        short_lived = self.document(DocumentStatus.PUBLICATION_WAITING, publish_at=self.now - timedelta(hours=2),
+                                    valid_until=self.now - timedelta(hours=1))
+        expired = self.document(DocumentStatus.PUBLISHED, valid_until=self.now - timedelta(days=1))
+        future = self.document(DocumentStatus.PUBLISHED, valid_until=self.now + timedelta(days=1))
+        draft = self.document(DocumentStatus.DRAFT, publish_at=self.now - timedelta(days=1))
+
+        scheduler = StatusScheduler(self.repository, clock=lambda: self.now)
+        scheduler.reload()
+        self.assertEqual(len(scheduler.heap), 4)
+        applied = scheduler.run_due()
+        self.assertEqual(sorted(doc_id for doc_id, _ in applied),
+                         sorted([waiting.doc_id, short_lived.doc_id, short_lived.doc_id, expired.doc_id]))
+
+        statuses = {doc.doc_id: doc.status for doc in self.repository.get_all_documents()}
+        self.assertEqual(statuses[waiting.doc_id], DocumentStatus.PUBLISHED)
+        self.assertEqual(statuses[short_lived.doc_id], DocumentStatus.EXPIRED)
+        self.assertEqual(statuses[expired.doc_id], DocumentStatus.EXPIRED)
+        self.assertEqual(statuses[future.doc_id], DocumentStatus.PUBLISHED)
+        self.assertEqual(statuses[draft.doc_id], DocumentStatus.DRAFT)
+        self.assertEqual(scheduler.next_deadline(), future.valid_until)
+        self.assertEqual(scheduler.run_due(), [])
+
+    def test_timer_wakes_at_next_deadline(self):
+        fired = threading.Event()
+        received = []
+
+        def on_transition(applied):
+            received.extend(applied)
+            fired.set()
+
+        scheduler = StatusScheduler(self.repository, on_transition)
+        service = DocumentService(self.repository, status_scheduler=scheduler)
+        scheduler.start()
+        try:
+            self.assertIsNone(scheduler.next_deadline())
+            document = Document(0, "Приказ", DocumentCategory.ORDERS, DocumentStatus.PUBLICATION_WAITING, "Петров П.П.")
+            document.publish_at = datetime.now().replace(microsecond=0) + timedelta(seconds=1)
+            service.save_document(document).result()
+            self.assertEqual(scheduler.next_deadline(), document.publish_at)
+            self.assertTrue(fired.wait(5))
+        finally:
+            scheduler.stop()
+        self.assertEqual(received, [(document.doc_id, DocumentStatus.PUBLISHED)])
+        self.assertEqual(self.repository.get_documents_by_ids([document.doc_id])[0].status, DocumentStatus.PUBLISHED)
+
+    def test_tk_timers_armed_only_on_tk_thread(self):
+        root = RecordingRoot()
+        scheduler = StatusScheduler(self.repository, root=root)
+        write_queue = WriteQueue()
+        service = DocumentService(self.repository, write_queue, status_scheduler=scheduler)
+        scheduler.start()
+        try:
+            self.assertEqual(root.jobs, {})
+            document = Document(0, "Приказ", DocumentCategory.ORDERS, DocumentStatus.PUBLICATION_WAITING, "Петров П.П.")
+            document.publish_at = datetime.now() + timedelta(hours=1)
+            service.save_document(document, immediate=True).result()
+            self.assertEqual(scheduler.next_deadline(), document.publish_at)
+
+            root.run_idle()
+            self.assertFalse(scheduler.pending_arm)
+            tk_thread = threading.get_ident()
+            self.assertIn([name for thread, _, name in root.calls if thread != tk_thread], ([], ['_arm_pending']))
+            self.assertEqual([callback for _, callback in root.jobs.values()], [scheduler._wake])
+        finally:
+            scheduler.stop()
+            write_queue.close()
+
+if __name__ == '__main__':
+    unittest.main()
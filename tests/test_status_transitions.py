@@ -0,0 +1,97 @@
+import unittest
+import os
+import tempfile
+from datetime import datetime
+from models.document import Document
+from models.enums import DocumentStatus, DocumentCategory, ProjectStatus, ProjectType, RouteStatus
+from models.project import Project
+from models.transitions import TRANSITIONS, TransitionOutcome, allowed_sources, can_transition
+from repositories.connection import connect
+from repositories.document_repository import DocumentRepository
+from repositories.project_repository import ProjectRepository
+from repositories.write_queue import WriteQueue
+from services.document_service import DocumentService
+from services.project_service import ProjectService
+
+class TestStatusTransitions(unittest.TestCase):
+    def setUp(self):
+        self.documents_db = tempfile.mktemp()
+        self.projects_db = tempfile.mktemp()
+        self.document_repository = DocumentRepository(self.documents_db)
+        self.project_repository = ProjectRepository(self.projects_db)
+        self.documents = DocumentService(self.document_repository)
+
+    def tearDown(self):
+        for path in (self.documents_db, self.projects_db):
+            if os.path.exists(path):
+                os.unlink(path)
+
+    def add_documents(self, statuses):
+        documents = [Document(0, f"Документ {i}", DocumentCategory.ORDERS, status, "Иванов И.И.")
+                     for i, status in enumerate(statuses)]
+        self.document_repository.save_documents(documents)
+        return [d.doc_id for d in documents]
+
+    def test_tables_cover_every_status(self):
+        for enum_cls, table in TRANSITIONS.items():
+            self.assertEqual(set(table), set(enum_cls))
+            for source, targets in table.items():
+                self.assertNotIn(source, targets)
+                for target in targets:
+                    self.assertIn(source, allowed_sources(target))
+        self.assertTrue(can_transition(DocumentStatus.PUBLISHED, DocumentStatus.ARCHIVED))
+        self.assertFalse(can_transition(DocumentStatus.DELETED, DocumentStatus.PUBLISHED))
+
+    def test_bulk_document_transition_reports_each_id(self):
+        published, draft, deleted = self.add_documents(
+            [DocumentStatus.PUBLISHED, DocumentStatus.DRAFT, DocumentStatus.DELETED])
+        already = self.add_documents([DocumentStatus.ARCHIVED])[0]
+
+        results = self.documents.transition_documents([published, draft, deleted, already, 999], DocumentStatus.ARCHIVED)
+        self.assertEqual(results, {
+            published: TransitionOutcome.APPLIED,
+            draft: TransitionOutcome.FORBIDDEN,
+            deleted: TransitionOutcome.FORBIDDEN,
+            already: TransitionOutcome.UNCHANGED,
+            999: TransitionOutcome.NOT_FOUND
+        })
+        statuses = {d.doc_id: d.status for d in self.document_repository.get_all_documents()}
+        self.assertEqual(statuses, {published: DocumentStatus.ARCHIVED, draft: DocumentStatus.DRAFT,
+                                    deleted: DocumentStatus.DELETED, already: DocumentStatus.ARCHIVED})
+        self.assertFalse(self.documents.publish_document(deleted))
+        self.assertTrue(self.documents.publish_document(draft))
+
+    def test_large_batch_through_write_queue(self):
+        doc_ids = self.add_documents([DocumentStatus.PUBLISHED] * 3000)
+        queue = WriteQueue()
+        try:
+            service = DocumentService(self.document_repository, queue)
+            results = service.transition_documents(doc_ids, DocumentStatus.ARCHIVED)
+        finally:
+            queue.close()
+        self.assertEqual(set(results.values()), {TransitionOutcome.APPLIED})
+        self.assertEqual({d.status for d in self.document_repository.get_all_documents()}, {DocumentStatus.ARCHIVED})
+
+    def test_project_and_route_transitions(self):
+        project = Project(0, "Склад", ProjectType.INVESTMENT, ProjectStatus.PLANNED,
+                          datetime(2024, 1, 1), datetime(2024, 6, 30), "Петров П.П.", "")
+        self.project_repository.save_project(project)
+        projects = ProjectService(self.project_repository)
+        self.assertEqual(projects.transition_projects([project.project_id], ProjectStatus.CLOSED),
+                         {project.project_id: TransitionOutcome.FORBIDDEN})
+        self.assertEqual(projects.transition_projects([project.project_id], ProjectStatus.IN_PROGRESS),
+                         {project.project_id: TransitionOutcome.APPLIED})
+        self.assertEqual(self.project_repository.get_all_projects()[0].status, ProjectStatus.IN_PROGRESS)
+
+        conn = connect(self.documents_db)
+        route_id = conn.execute('INSERT INTO approval_routes (name, status) VALUES (?, ?)',
+                                ("Маршрут", RouteStatus.DRAFT.value)).lastrowid
+        conn.commit()
+        conn.close()
+        self.assertEqual(self.documents.transition_routes([route_id], RouteStatus.ACTIVE),
+                         {route_id: TransitionOutcome.FORBIDDEN})
+        self.assertEqual(self.documents.transition_routes([route_id], RouteStatus.APPROVAL),
+                         {route_id: TransitionOutcome.APPLIED})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import os
+import sqlite3
+import tempfile
+from models.document import Document
+from models.enums import DocumentStatus, DocumentCategory
+from repositories.document_repository import DocumentRepository, MIGRATIONS
+from repositories.migrations import MigrationRunner
+from strategies.search_strategy import SimpleSearchStrategy, AdvancedSearchStrategy
+from strategies.stemmer import stem, stem_text, document_terms
+
+class TestStemmer(unittest.TestCase):
+    def test_inflections_share_stem(self):
+        for forms in (("приказ", "приказа", "приказы", "приказов"),
+                      ("положение", "положения", "положении"),
+                      ("закупка", "закупки", "закупках"),
+                      ("деятельность", "деятельности")):
+            self.assertEqual({stem(form) for form in forms}, {stem(forms[0])}, forms)
+
+    def test_normalization(self):
+        self.assertEqual(stem_text("Ёлки, ЕЛКИ №5"), "елк елк 5")
+        self.assertEqual(document_terms("Приказ №123", "Иванов И.И.", None), "приказ 123\nиван и и\n")
+
+class TestStemmedSearch(unittest.TestCase):
+    def setUp(self):
+        self.test_db = tempfile.mktemp()
+        self.repository = DocumentRepository(self.test_db)
+        self.documents = [
+            Document(0, "Приказ №123", DocumentCategory.ORDERS, DocumentStatus.PUBLISHED, "Сидоров С.С."),
+            Document(0, "Положение о закупках", DocumentCategory.REGULATORY, DocumentStatus.DRAFT, "Пётр Ёлкин"),
+            Document(0, "Шаблон служебной записки", DocumentCategory.TEMPLATES, DocumentStatus.PUBLISHED, "Петров П.П."),
+        ]
+        self.documents[2].description = "Для приказов и распоряжений"
+        self.repository.save_documents(self.documents)
+
+    def tearDown(self):
+        if os.path.exists(self.test_db):
+            os.unlink(self.test_db)
+
+    def names(self, documents):
+        return [d.name for d in documents]
+
+    def test_terms_computed_on_save(self):
+        self.assertEqual(self.documents[0].search_terms, "приказ 123\nсидор с с\n")
+        self.assertEqual(self.documents[1].search_text, "положение о закупках\nпетр елкин\n")
+        stored = self.repository.get_documents_by_ids([self.documents[1].doc_id])[0]
+        self.assertEqual(stored.search_terms, "положен о закупк\nпетр елкин\n")
+
+        stored.name = "Положение о поставках"
+        self.repository.save_document(stored)
+        self.assertEqual(self.names(self.repository.search_documents("поставки")), ["Положение о поставках"])
+        self.assertEqual(self.repository.search_documents("закупках"), [])
+
+    def test_strategies_match_inflected_queries(self):
+        documents = self.repository.get_all_documents()
+        strategy = SimpleSearchStrategy()
+        self.assertEqual(self.names(strategy.search(documents, "приказа")), ["Приказ №123", "Шаблон служебной записки"])
+        self.assertEqual(self.names(strategy.search(documents, "ПРИКАЗ №12")), ["Приказ №123"])
+        self.assertEqual(self.names(strategy.search(documents, "положения о закупке")), ["Положение о закупках"])
+        self.assertEqual(self.names(strategy.search(documents, "ёлкин")), ["Положение о закупках"])
+        self.assertEqual(self.names(AdvancedSearchStrategy().search(documents, "status:опубликован приказы")),
+                         ["Приказ №123", "Шаблон служебной записки"])
+
+        self.assertEqual(self.names(strategy.search(documents, "ров")), ["Приказ №123", "Шаблон служебной записки"])
+        self.assertEqual(self.names(strategy.search(documents, "служебн")), ["Шаблон служебной записки"])
+        self.assertEqual(self.names(AdvancedSearchStrategy().search(documents, "category:шаблоны ров")),
+                         ["Шаблон служебной записки"])
+
+        unsaved = Document(0, "Приказы по кадрам", DocumentCategory.ORDERS, DocumentStatus.DRAFT, "Иванов И.И.")
+        self.assertEqual(strategy.search([unsaved], "приказ"), [unsaved])
+
+    def test_repository_search_uses_terms_index(self):
+        self.assertEqual(self.names(self.repository.search_documents("приказа")),
+                         ["Приказ №123", "Шаблон служебной записки"])
+        self.assertEqual(self.names(self.repository.search_documents("прик")),
+                         ["Приказ №123", "Шаблон служебной записки"])
+        self.assertEqual(self.names(self.repository.search_documents("№")), ["Приказ №123"])
+        self.assertEqual(self.names(self.repository.search_documents("сидор")), ["Приказ №123"])
+        self.assertEqual(self.names(self.repository.search_documents("ров")), ["Приказ №123", "Шаблон служебной записки"])
+        self.assertEqual(self.names(self.repository.search_documents("каз")), ["Приказ №123", "Шаблон служебной записки"])
+        self.assertEqual(self.names(self.repository.search_documents("ЁЛКИН")), ["Положение о закупках"])
+        self.assertEqual(self.repository.search_documents("отсутствует"), [])
+
+        conn = sqlite3.connect(self.test_db)
+        conn.execute('DELETE FROM documents WHERE id=?', (self.documents[0].doc_id,))
+        conn.commit()
+        count = conn.execute('SELECT COUNT(*) FROM document_terms WHERE rowid=?', (self.documents[0].doc_id,)).fetchone()[0]
+        conn.close()
+        self.assertEqual(count, 0)
+
+    def test_migration_backfills_existing_documents(self):
+        legacy_db = tempfile.mktemp()
+        try:
+            MigrationRunner(legacy_db, MIGRATIONS[:5]).run()
+            conn = sqlite3.connect(legacy_db)
+            conn.executemany('''
+                INSERT INTO documents (name, category, status, author, version, creation_date, description)
+                VALUES (?, ?, ?, ?, '1.0', '2024-01-01', ?)
+            ''', [(f"Распоряжение №{i}", DocumentCategory.ORDERS.value, DocumentStatus.DRAFT.value, "Иванов И.И.",
+                   "О закупках" if i % 2 else None) for i in range(12)])
+            conn.commit()
+            conn.close()
+            repository = DocumentRepository(legacy_db)
+            self.assertEqual(len(repository.search_documents("распоряжения")), 12)
+            self.assertEqual(len(repository.search_documents("закупки")), 6)
+            self.assertTrue(all(d.search_terms and d.search_text for d in repository.get_all_documents()))
+            self.assertEqual(len(repository.search_documents("анов")), 12)
+        finally:
+            os.unlink(legacy_db)
+
+if __name__ == '__main__':
+    unittest.main()
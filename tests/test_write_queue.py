@@ -0,0 +1,69 @@
+import unittest
+import os
+import tempfile
+from datetime import datetime
+from models.document import Document
+from models.project import Project
+from models.enums import DocumentStatus, DocumentCategory, ProjectStatus, ProjectType
+from repositories.document_repository import DocumentRepository
+from repositories.project_repository import ProjectRepository
+from repositories.write_queue import WriteQueue
+from services.document_service import DocumentService
+from services.project_service import ProjectService
+
+class TestWriteQueue(unittest.TestCase):
+    def setUp(self):
+        self.documents_db = tempfile.mktemp()
+        self.projects_db = tempfile.mktemp()
+        self.queue = WriteQueue(max_batch=50, max_delay=0.5)
+        self.document_repository = DocumentRepository(self.documents_db)
+        self.documents = DocumentService(self.document_repository, self.queue)
+        self.projects = ProjectService(ProjectRepository(self.projects_db), write_queue=self.queue)
+
+    def tearDown(self):
+        self.queue.close()
+        for path in (self.documents_db, self.projects_db):
+            if os.path.exists(path):
+                os.unlink(path)
+
+    def document(self, name: str) -> Document:
+        return Document(0, name, DocumentCategory.MEMOS, DocumentStatus.DRAFT, "Сидоров", "1.0")
+
+    def test_group_commit_resolves_futures(self):
+        documents = [self.document(f"Записка {i}") for i in range(120)]
+        futures = [self.documents.save_document(d) for d in documents]
+        project = Project(0, "Проект", ProjectType.CORPORATE, ProjectStatus.CREATED,
+                          datetime(2024, 1, 1), datetime(2024, 6, 1), "Менеджер")
+        project_future = self.projects.save_project(project)
+
+        self.assertTrue(self.queue.flush(timeout=5))
+        self.assertTrue(all(f.done() and f.exception() is None for f in futures + [project_future]))
+        self.assertEqual([d.doc_id for d in documents], list(range(1, 121)))
+        self.assertEqual(len(self.document_repository.get_all_documents()), 120)
+        self.assertEqual(self.projects.get_all_projects()[0].name, "Проект")
+
+    def test_failed_operation_does_not_abort_batch(self):
+        first = self.documents.save_document(self.document("Первый"))
+        broken = self.document("Сломанный")
+        broken.name = None
+        failed = self.documents.save_document(broken)
+        last = self.documents.save_document(self.document("Последний"))
+        self.queue.flush(timeout=5)
+
+        self.assertIsNone(first.exception())
+        self.assertIsNotNone(failed.exception())
+        self.assertIsNone(last.exception())
+        self.assertEqual([d.name for d in self.document_repository.get_all_documents()], ["Первый", "Последний"])
+
+    def test_synchronous_service_calls_wait_for_commit(self):
+        document = self.documents.create_document("Приказ", DocumentCategory.ORDERS, "Иванов")
+        self.assertEqual(document.doc_id, 1)
+        self.assertTrue(self.documents.publish_document(1))
+        self.assertEqual(self.document_repository.get_all_documents()[0].status, DocumentStatus.PUBLISHED)
+
+        self.queue.close()
+        with self.assertRaises(RuntimeError):
+            self.documents.save_document(self.document("После закрытия"))
+
+if __name__ == '__main__':
+    unittest.main()
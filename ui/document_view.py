@@ -1,23 +1,31 @@
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox
-from typing import List
+from tkinter import ttk, messagebox, filedialog
+from typing import Callable, Dict, List
 from models.document import Document
 from models.enums import DocumentCategory, DocumentStatus
+from models.transitions import TransitionOutcome
 from services.document_service import DocumentService
 from strategies.search_strategy import SimpleSearchStrategy, AdvancedSearchStrategy
+from diagnostics.instrumentation import timed
+from diagnostics.sql_trace import ui_action
+from ui.refresh_scheduler import RefreshScheduler, DirtyRegion
 
 class DocumentView:
-    def __init__(self, root, document_service: DocumentService):
+    def __init__(self, root, document_service: DocumentService, refresh_scheduler: RefreshScheduler = None):
         self.root = root
         self.document_service = document_service
+        self.refresh_scheduler = refresh_scheduler or RefreshScheduler(root)
         self.current_search_strategy = SimpleSearchStrategy()
+        self.bulk_cancel = None
         
         self.setup_ui()
         self.load_documents()
 
     def setup_ui(self):
-        self.root.title("Управление документами")
-        self.root.geometry("1000x600")
+        if isinstance(self.root, tk.Wm):
+            self.root.title("Управление документами")
+            self.root.geometry("1000x600")
         
         main_frame = ttk.Frame(self.root)
         main_frame.pack(fill=tk.BOTH, expand=True)
@@ -39,11 +47,19 @@ class DocumentView:
         ttk.Button(search_frame, text="Новый документ", 
                   command=self.create_new_document).pack(side=tk.RIGHT, padx=5)
         
+        ttk.Button(search_frame, text="Реестр...", 
+                  command=self.export_register).pack(side=tk.RIGHT, padx=5)
+        
         self.advanced_frame = ttk.Frame(main_frame)
         
         self.setup_advanced_search()
         
-        self.tree = ttk.Treeview(main_frame, columns=('name', 'category', 'status', 'author', 'version'), show='headings')
+        self.bulk_frame = ttk.Frame(main_frame)
+        self.bulk_frame.pack(fill=tk.X, padx=10, pady=(0, 5))
+        self.setup_bulk_actions()
+        
+        self.tree = ttk.Treeview(main_frame, columns=('name', 'category', 'status', 'author', 'version'),
+                                 show='headings', selectmode='extended')
         self.tree.heading('name', text='Название')
         self.tree.heading('category', text='Категория')
         self.tree.heading('status', text='Статус')
@@ -63,6 +79,155 @@ class DocumentView:
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
         self.tree.bind('<Double-1>', self.on_document_double_click)
+        self.tree.bind('<<TreeviewSelect>>', self.on_selection_change)
+        self.tree.bind('<Control-a>', lambda e: self.tree.selection_set(self.tree.get_children()))
+        self.on_selection_change()
+
+    def setup_bulk_actions(self):
+        self.selection_label = ttk.Label(self.bulk_frame, text="Выбрано: 0")
+        self.selection_label.pack(side=tk.LEFT)
+        
+        self.bulk_buttons = [
+            ttk.Button(self.bulk_frame, text="Опубликовать",
+                       command=lambda: self.run_bulk_transition(DocumentStatus.PUBLISHED)),
+            ttk.Button(self.bulk_frame, text="В архив",
+                       command=lambda: self.run_bulk_transition(DocumentStatus.ARCHIVED)),
+        ]
+        self.bulk_category_combo = ttk.Combobox(self.bulk_frame, values=[c.value for c in DocumentCategory],
+                                                state="readonly", width=28)
+        self.bulk_buttons.extend([
+            ttk.Button(self.bulk_frame, text="Сменить категорию", command=self.run_bulk_recategorize),
+            ttk.Button(self.bulk_frame, text="Экспорт...", command=self.run_bulk_export),
+        ])
+        for button in self.bulk_buttons[:2]:
+            button.pack(side=tk.LEFT, padx=5)
+        self.bulk_category_combo.pack(side=tk.LEFT, padx=(10, 0))
+        for button in self.bulk_buttons[2:]:
+            button.pack(side=tk.LEFT, padx=5)
+        
+        self.bulk_progress = ttk.Progressbar(self.bulk_frame, maximum=100, length=160)
+        self.bulk_cancel_button = ttk.Button(self.bulk_frame, text="Отмена", command=self.cancel_bulk_action)
+
+    def selected_ids(self) -> List[int]:
+        return [int(iid) for iid in self.tree.selection()]
+
+    def on_selection_change(self, event=None):
+        selected = len(self.tree.selection())
+        self.selection_label.config(text=f"Выбрано: {selected}")
+        busy = self.bulk_cancel is not None
+        for button in self.bulk_buttons:
+            button.state(['!disabled' if selected and not busy else 'disabled'])
+
+    def run_bulk_action(self, title: str, task: Callable, on_done: Callable):
+        cancel = threading.Event()
+        state = {'done': 0, 'total': 0, 'result': None, 'error': None, 'finished': False}
+
+        def progress(done, total):
+            state['done'], state['total'] = done, total
+
+        def worker():
+            try:
+                state['result'] = task(progress, cancel)
+            except Exception as e:
+                state['error'] = e
+            state['finished'] = True
+
+        def poll():
+            if state['total']:
+                self.bulk_progress.config(value=state['done'] * 100 / state['total'])
+            if not state['finished']:
+                self.root.after(100, poll)
+                return
+            self.bulk_cancel = None
+            self.bulk_progress.pack_forget()
+            self.bulk_cancel_button.pack_forget()
+            self.on_selection_change()
+            if state['error'] is not None:
+                messagebox.showerror("Ошибка", f"{title}: {state['error']}")
+            else:
+                on_done(state['result'])
+
+        self.bulk_cancel = cancel
+        self.on_selection_change()
+        self.bulk_progress.config(value=0)
+        self.bulk_progress.pack(side=tk.RIGHT, padx=5)
+        self.bulk_cancel_button.pack(side=tk.RIGHT, before=self.bulk_progress)
+        threading.Thread(target=worker, name="document-bulk-action", daemon=True).start()
+        poll()
+
+    def cancel_bulk_action(self):
+        if self.bulk_cancel is not None:
+            self.bulk_cancel.set()
+
+    def report_bulk_results(self, title: str, results: Dict[int, TransitionOutcome]):
+        changed = [doc_id for doc_id, outcome in results.items() if outcome == TransitionOutcome.APPLIED]
+        if changed:
+            self.refresh_documents(changed)
+        counts = {outcome: 0 for outcome in TransitionOutcome}
+        for outcome in results.values():
+            counts[outcome] += 1
+        messagebox.showinfo(title, "\n".join(f"{outcome.value}: {count}" for outcome, count in counts.items() if count))
+
+    @ui_action("DocumentView.run_bulk_transition")
+    def run_bulk_transition(self, target: DocumentStatus):
+        doc_ids = self.selected_ids()
+        if not doc_ids or not messagebox.askyesno("Массовая операция",
+                                                  f"Перевести {len(doc_ids)} документов в статус «{target.value}»?"):
+            return
+        def on_done(results):
+            self.document_service.refresh_schedule(target)
+            self.report_bulk_results(target.value, results)
+
+        self.run_bulk_action(target.value,
+                             lambda progress, cancel: self.document_service.bulk_transition(doc_ids, target, progress, cancel),
+                             on_done)
+
+    @ui_action("DocumentView.run_bulk_recategorize")
+    def run_bulk_recategorize(self):
+        doc_ids = self.selected_ids()
+        category = next((c for c in DocumentCategory if c.value == self.bulk_category_combo.get()), None)
+        if category is None:
+            messagebox.showerror("Ошибка", "Выберите новую категорию")
+            return
+        self.run_bulk_action("Смена категории",
+                             lambda progress, cancel: self.document_service.bulk_recategorize(doc_ids, category, progress, cancel),
+                             lambda results: self.report_bulk_results("Смена категории", results))
+
+    @ui_action("DocumentView.run_bulk_export")
+    def run_bulk_export(self):
+        doc_ids = self.selected_ids()
+        path = filedialog.asksaveasfilename(defaultextension=".jsonl", filetypes=[("JSON lines", "*.jsonl")])
+        if not path:
+            return
+        self.run_bulk_action("Экспорт",
+                             lambda progress, cancel: self.document_service.export_documents(doc_ids, path, progress, cancel),
+                             lambda count: messagebox.showinfo("Экспорт", f"Выгружено документов: {count}"))
+
+    def advanced_filters(self) -> Dict:
+        filters = {}
+        if not self.advanced_frame.winfo_ismapped():
+            return filters
+        if self.status_combo.get():
+            filters['status'] = self.status_combo.get()
+        if self.category_combo.get():
+            filters['category'] = self.category_combo.get()
+        if self.author_entry.get():
+            filters['author'] = self.author_entry.get()
+        return filters
+
+    @ui_action("DocumentView.export_register")
+    def export_register(self):
+        if self.bulk_cancel is not None:
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".xlsx",
+                                            filetypes=[("Excel", "*.xlsx"), ("CSV", "*.csv")])
+        if not path:
+            return
+        filters = self.advanced_filters()
+        self.run_bulk_action("Реестр документов",
+                             lambda progress, cancel: self.document_service.export_register(path, filters=filters,
+                                                                                            progress=progress, cancel=cancel),
+                             lambda count: messagebox.showinfo("Реестр документов", f"Выгружено документов: {count}"))
 
     def setup_advanced_search(self):
         ttk.Label(self.advanced_frame, text="Статус:").grid(row=0, column=0, padx=5, pady=2)
@@ -80,6 +245,8 @@ class DocumentView:
         ttk.Button(self.advanced_frame, text="Применить фильтры", 
                   command=self.apply_advanced_filters).grid(row=1, column=4, padx=5, pady=2)
 
+    @ui_action("DocumentView.load_documents")
+    @timed("DocumentView.load_documents")
     def load_documents(self):
         self.documents = self.document_service.get_all_documents()
         if not self.documents:
@@ -103,14 +270,16 @@ class DocumentView:
         
         self.documents = sample_docs
 
+    @timed("DocumentView.display_documents")
     def display_documents(self, documents: List[Document]):
         self.tree.delete(*self.tree.get_children())
         for doc in documents:
-            self.tree.insert('', 'end', values=(
-                doc.name, doc.category.value, doc.status.value, 
-                doc.author, doc.version
-            ))
+            self.tree.insert('', 'end', iid=str(doc.doc_id), values=self.document_row(doc))
+
+    def document_row(self, doc: Document) -> tuple:
+        return (doc.name, doc.category.value, doc.status.value, doc.author, doc.version)
 
+    @ui_action("DocumentView.search_documents")
     def search_documents(self):
         query = self.search_entry.get().strip()
         if not query:
@@ -118,6 +287,10 @@ class DocumentView:
             return
             
         results = self.current_search_strategy.search(self.documents, query)
+        if isinstance(self.current_search_strategy, SimpleSearchStrategy):
+            found = {doc.doc_id for doc in results}
+            found.update(self.document_service.search_content_ids(query))
+            results = [doc for doc in self.documents if doc.doc_id in found]
         self.display_documents(results)
 
     def toggle_advanced_search(self):
@@ -127,6 +300,7 @@ class DocumentView:
             self.advanced_frame.pack(fill=tk.X, padx=10, pady=5)
             self.current_search_strategy = AdvancedSearchStrategy()
 
+    @ui_action("DocumentView.apply_advanced_filters")
     def apply_advanced_filters(self):
         search_params = {}
         
@@ -147,12 +321,35 @@ class DocumentView:
     def on_document_double_click(self, event):
         selection = self.tree.selection()
         if selection:
-            item = self.tree.item(selection[0])
-            doc_name = item['values'][0]
-            document = next((d for d in self.documents if d.name == doc_name), None)
+            doc_id = int(selection[0])
+            document = next((d for d in self.documents if d.doc_id == doc_id), None)
             if document:
                 from ui.modals import DocumentModal
                 DocumentModal(self.root, self.document_service, self, document)
 
-    def refresh_documents(self):
-        self.load_documents()
\ No newline at end of file
+    def refresh_documents(self, doc_ids: List[int] = None):
+        self.refresh_scheduler.invalidate(self, rows=doc_ids or (), full=doc_ids is None)
+
+    @ui_action("DocumentView.apply_refresh")
+    @timed("DocumentView.apply_refresh")
+    def apply_refresh(self, dirty: DirtyRegion):
+        if dirty.full:
+            self.load_documents()
+            return
+        
+        changed = {doc.doc_id: doc for doc in self.document_service.get_documents_by_ids(dirty.rows)}
+        known = {doc.doc_id for doc in self.documents}
+        self.documents = [changed.get(doc.doc_id, doc) for doc in self.documents
+                          if doc.doc_id not in dirty.rows or doc.doc_id in changed]
+        self.documents.extend(doc for doc_id, doc in changed.items() if doc_id not in known)
+        
+        for doc_id in dirty.rows:
+            iid = str(doc_id)
+            doc = changed.get(doc_id)
+            if doc is None:
+                if self.tree.exists(iid):
+                    self.tree.delete(iid)
+            elif self.tree.exists(iid):
+                self.tree.item(iid, values=self.document_row(doc))
+            elif doc_id not in known:
+                self.tree.insert('', 'end', iid=iid, values=self.document_row(doc))
\ No newline at end of file
@@ -1,19 +1,24 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from datetime import datetime, timedelta
-from typing import Optional
-from models.project import Project
+from typing import Callable, Optional
+from models.project import Project, Task
 from models.document import Document
 from models.enums import ProjectStatus, DocumentStatus, DocumentCategory
+from models.transitions import allowed_targets, can_transition
 from services.project_service import ProjectService
 from services.document_service import DocumentService
 from services.validation_service import ValidationService
+from services.schedule_service import NetworkSchedule
+from diagnostics.sql_trace import ui_action
 
 class ProjectCardModal:
-    def __init__(self, parent, project: Project, project_service: ProjectService):
+    def __init__(self, parent, project: Project, project_service: ProjectService,
+                 on_stage_open: Optional[Callable[[str, int], None]] = None):
         self.modal = tk.Toplevel(parent)
         self.project = project
         self.project_service = project_service
+        self.on_stage_open = on_stage_open
         
         self.setup_modal()
 
@@ -63,6 +68,24 @@ class ProjectCardModal:
         for doc in self.project.documents:
             documents_list.insert('', 'end', text=doc.name)
 
+        stages_frame = ttk.LabelFrame(main_frame, text="Этапы проекта (двойной щелчок - сетевой график)")
+        stages_frame.pack(fill=tk.X, pady=5)
+
+        self.stages_list = ttk.Treeview(stages_frame, show='tree', height=4)
+        self.stages_list.pack(fill=tk.X, padx=5, pady=5)
+        self.stages = {}
+        for stage in self.project_service.get_project_stages(self.project.project_id):
+            self.stages[str(stage.stage_id)] = stage
+            self.stages_list.insert('', 'end', iid=str(stage.stage_id), text=f"{stage.name} ({stage.status.value})")
+        self.stages_list.bind('<Double-1>', self.open_stage)
+
+    def open_stage(self, event):
+        selection = self.stages_list.selection()
+        if not selection or self.on_stage_open is None:
+            return
+        stage = self.stages[selection[0]]
+        self.on_stage_open(stage.name, stage.stage_id)
+
     def create_info_rows(self, parent):
         rows = [
             ("Код проекта:", f"PRJ-{self.project.project_id:03d}"),
@@ -83,11 +106,33 @@ class ProjectCardModal:
             ttk.Label(parent, text=value).grid(row=i, column=1, sticky="w", padx=5, pady=2)
 
 class ProjectStageModal:
-    def __init__(self, parent, stage_name: str):
+    NODE_WIDTH = 140
+    NODE_HEIGHT = 50
+    H_GAP = 60
+    V_GAP = 30
+    DETAIL_ZOOM = 0.75
+    OUTLINE_ZOOM = 0.35
+
+    def __init__(self, parent, stage_name: str, schedule: Optional[NetworkSchedule] = None):
         self.modal = tk.Toplevel(parent)
         self.stage_name = stage_name
+        self.schedule = schedule or self.create_sample_schedule()
+        self.zoom = 1.0
         self.setup_modal()
 
+    def create_sample_schedule(self) -> NetworkSchedule:
+        tasks = [
+            ("Анализ требований", 5),
+            ("Проектирование", 7),
+            ("Разработка", 14),
+            ("Тестирование", 5),
+            ("Внедрение", 3)
+        ]
+        return NetworkSchedule([
+            Task(i + 1, name, 0, duration, [i] if i else [])
+            for i, (name, duration) in enumerate(tasks)
+        ])
+
     def setup_modal(self):
         self.modal.title(f"Сетевой график - {self.stage_name}")
         self.modal.geometry("800x600")
@@ -97,30 +142,80 @@ class ProjectStageModal:
         
         ttk.Label(main_frame, text=f"Сетевой график этапа: {self.stage_name}", 
                  font=("Arial", 12, "bold")).pack(pady=10)
-        
-        canvas = tk.Canvas(main_frame, bg="white")
-        canvas.pack(fill=tk.BOTH, expand=True)
-        
+        ttk.Label(main_frame, text=f"Длительность: {self.schedule.project_duration} дн., "
+                                   f"критических задач: {len(self.schedule.critical_tasks())}").pack()
+        
+        canvas_frame = ttk.Frame(main_frame)
+        canvas_frame.pack(fill=tk.BOTH, expand=True)
+        canvas = tk.Canvas(canvas_frame, bg="white")
+        scrollbar_y = ttk.Scrollbar(canvas_frame, orient=tk.VERTICAL,
+                                    command=lambda *args: self.scroll(canvas, canvas.yview, *args))
+        scrollbar_x = ttk.Scrollbar(canvas_frame, orient=tk.HORIZONTAL,
+                                    command=lambda *args: self.scroll(canvas, canvas.xview, *args))
+        canvas.configure(yscrollcommand=scrollbar_y.set, xscrollcommand=scrollbar_x.set)
+        scrollbar_y.pack(side=tk.RIGHT, fill=tk.Y)
+        scrollbar_x.pack(side=tk.BOTTOM, fill=tk.X)
+        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        self.columns = self.schedule.layout()
+        self.cells = {task_id: (col, row) for col, column in enumerate(self.columns) for row, task_id in enumerate(column)}
+        self.critical = set(self.schedule.critical_tasks())
+        
+        canvas.bind('<Configure>', lambda e: self.draw_network_graph(canvas))
+        canvas.bind('<MouseWheel>', lambda e: self.scroll(canvas, canvas.yview, 'scroll', -1 if e.delta > 0 else 1, 'units'))
+        canvas.bind('<Control-MouseWheel>', lambda e: self.set_zoom(canvas, self.zoom * (1.25 if e.delta > 0 else 0.8)))
+        self.draw_network_graph(canvas)
+
+    def scroll(self, canvas, view, *args):
+        view(*args)
+        self.draw_network_graph(canvas)
+
+    def set_zoom(self, canvas, zoom: float):
+        self.zoom = max(0.05, min(2.0, zoom))
         self.draw_network_graph(canvas)
 
+    def node_box(self, task_id: int) -> tuple:
+        col, row = self.cells[task_id]
+        x = 20 + col * (self.NODE_WIDTH + self.H_GAP) * self.zoom
+        y = 20 + row * (self.NODE_HEIGHT + self.V_GAP) * self.zoom
+        return x, y, x + self.NODE_WIDTH * self.zoom, y + self.NODE_HEIGHT * self.zoom
+
     def draw_network_graph(self, canvas):
-        tasks = [
-            ("Анализ требований", 5),
-            ("Проектирование", 7),
-            ("Разработка", 14),
-            ("Тестирование", 5),
-            ("Внедрение", 3)
-        ]
-        
-        x, y = 50, 50
-        for i, (task, duration) in enumerate(tasks):
-            canvas.create_rectangle(x, y, x + 120, y + 40, fill="lightblue", outline="black")
-            canvas.create_text(x + 60, y + 20, text=f"{task}\n{duration} дн.")
-            
-            if i < len(tasks) - 1:
-                canvas.create_line(x + 120, y + 20, x + 150, y + 20, arrow=tk.LAST)
-            
-            y += 80
+        canvas.delete('all')
+        cell_width = (self.NODE_WIDTH + self.H_GAP) * self.zoom
+        cell_height = (self.NODE_HEIGHT + self.V_GAP) * self.zoom
+        rows = max((len(column) for column in self.columns), default=0)
+        canvas.configure(scrollregion=(0, 0, 40 + len(self.columns) * cell_width, 40 + rows * cell_height))
+        
+        left, top = canvas.canvasx(0), canvas.canvasy(0)
+        right, bottom = left + canvas.winfo_width(), top + canvas.winfo_height()
+        first_col, last_col = max(0, int((left - 20) // cell_width)), int((right - 20) // cell_width)
+        first_row, last_row = max(0, int((top - 20) // cell_height)), int((bottom - 20) // cell_height)
+        
+        detailed = self.zoom >= self.DETAIL_ZOOM
+        outlined = self.zoom >= self.OUTLINE_ZOOM
+        for column in self.columns[first_col:last_col + 1]:
+            for task_id in column[first_row:last_row + 1]:
+                x1, y1, x2, y2 = self.node_box(task_id)
+                is_critical = task_id in self.critical
+                for predecessor_id in self.schedule.tasks[task_id].predecessors:
+                    if not outlined and not (is_critical and predecessor_id in self.critical):
+                        continue
+                    px1, py1, px2, py2 = self.node_box(predecessor_id)
+                    canvas.create_line(px2, (py1 + py2) / 2, x1, (y1 + y2) / 2, arrow=tk.LAST,
+                                       fill="red" if is_critical and predecessor_id in self.critical else "gray")
+                
+                fill = "tomato" if is_critical else "lightblue"
+                if not outlined:
+                    canvas.create_rectangle(x1, y1, x2, y2, fill=fill, outline="")
+                    continue
+                canvas.create_rectangle(x1, y1, x2, y2, fill=fill, outline="black")
+                if detailed:
+                    task = self.schedule.tasks[task_id]
+                    canvas.create_text((x1 + x2) / 2, (y1 + y2) / 2, width=self.NODE_WIDTH * self.zoom - 4,
+                                       text=f"{task.name}\n{task.duration} дн. "
+                                            f"({self.schedule.earliest_start[task_id]}–{self.schedule.latest_finish[task_id]}), "
+                                            f"резерв {self.schedule.slack(task_id)}")
 
 class DocumentModal:
     def __init__(self, parent, document_service: DocumentService, document_view, document: Document = None):
@@ -135,7 +230,7 @@ class DocumentModal:
     def setup_modal(self):
         title = "Новый документ" if self.is_edit else f"Документ - {self.document.name}"
         self.modal.title(title)
-        self.modal.geometry("500x400")
+        self.modal.geometry("500x440")
         self.modal.transient(self.modal.master)
         self.modal.grab_set()
         
@@ -160,11 +255,29 @@ class DocumentModal:
         
         if not self.is_edit:
             ttk.Label(main_frame, text="Статус:").pack(anchor="w", pady=2)
-            self.status_combo = ttk.Combobox(main_frame, values=[s.value for s in DocumentStatus])
+            statuses = [self.document.status] + [s for s in DocumentStatus if s in allowed_targets(self.document.status)]
+            self.status_combo = ttk.Combobox(main_frame, values=[s.value for s in statuses], state="readonly")
             self.status_combo.pack(fill=tk.X, pady=2)
             self.status_combo.set(self.document.status.value)
             
             ttk.Label(main_frame, text=f"Версия: {self.document.version}").pack(anchor="w", pady=2)
+            
+            dates_frame = ttk.Frame(main_frame)
+            dates_frame.pack(fill=tk.X, pady=2)
+            ttk.Label(dates_frame, text="Публикация с:").pack(side=tk.LEFT)
+            self.publish_at_entry = ttk.Entry(dates_frame, width=17)
+            self.publish_at_entry.pack(side=tk.LEFT, padx=5)
+            ttk.Label(dates_frame, text="Действует до:").pack(side=tk.LEFT, padx=(10, 0))
+            self.valid_until_entry = ttk.Entry(dates_frame, width=17)
+            self.valid_until_entry.pack(side=tk.LEFT, padx=5)
+            if self.document.publish_at:
+                self.publish_at_entry.insert(0, self.document.publish_at.strftime('%Y-%m-%d %H:%M'))
+            if self.document.valid_until:
+                self.valid_until_entry.insert(0, self.document.valid_until.strftime('%Y-%m-%d %H:%M'))
+            
+            if self.document_service.blob_store is not None:
+                self.file_label = ttk.Label(main_frame, text=f"Файл: {self.document.file_path or 'не прикреплен'}")
+                self.file_label.pack(anchor="w", pady=2)
         
         if self.document:
             self.name_entry.insert(0, self.document.name)
@@ -181,9 +294,12 @@ class DocumentModal:
             ttk.Button(button_frame, text="Сохранить", command=self.update_document).pack(side=tk.RIGHT, padx=5)
             if self.document.status == DocumentStatus.DRAFT:
                 ttk.Button(button_frame, text="Опубликовать", command=self.publish_document).pack(side=tk.RIGHT, padx=5)
+            if self.document_service.blob_store is not None:
+                ttk.Button(button_frame, text="Прикрепить файл...", command=self.attach_file).pack(side=tk.LEFT, padx=5)
         
         ttk.Button(button_frame, text="Отмена", command=self.modal.destroy).pack(side=tk.RIGHT, padx=5)
 
+    @ui_action("DocumentModal.create_document")
     def create_document(self):
         name = self.name_entry.get().strip()
         category_name = self.category_combo.get()
@@ -199,14 +315,15 @@ class DocumentModal:
             category = next(c for c in DocumentCategory if c.value == category_name)
             document = self.document_service.create_document(name, category, author)
             document.description = description
-            self.document_service.repository.save_document(document)
+            self.document_service.save_document(document, immediate=True).result()
             
             messagebox.showinfo("Успех", "Документ создан успешно")
             self.modal.destroy()
-            self.document_view.refresh_documents()
+            self.document_view.refresh_documents([document.doc_id])
         except Exception as e:
             messagebox.showerror("Ошибка", f"Ошибка при создании документа: {str(e)}")
 
+    @ui_action("DocumentModal.update_document")
     def update_document(self):
         if not self.document:
             return
@@ -216,19 +333,51 @@ class DocumentModal:
         self.document.description = self.desc_text.get('1.0', 'end-1c').strip()
         
         try:
-            self.document.status = next(s for s in DocumentStatus if s.value == self.status_combo.get())
-            self.document_service.repository.save_document(self.document)
+            self.document.publish_at = self._parse_moment(self.publish_at_entry.get())
+            self.document.valid_until = self._parse_moment(self.valid_until_entry.get())
+        except ValueError:
+            messagebox.showerror("Ошибка", "Даты указываются в формате ГГГГ-ММ-ДД ЧЧ:ММ")
+            return
+        
+        status = next(s for s in DocumentStatus if s.value == self.status_combo.get())
+        if status != self.document.status and not can_transition(self.document.status, status):
+            messagebox.showerror("Ошибка", f"Переход «{self.document.status.value}» → «{status.value}» не допускается")
+            return
+        
+        try:
+            self.document.status = status
+            self.document_service.save_document(self.document, immediate=True).result()
             
             messagebox.showinfo("Успех", "Документ обновлен успешно")
             self.modal.destroy()
-            self.document_view.refresh_documents()
+            self.document_view.refresh_documents([self.document.doc_id])
         except Exception as e:
             messagebox.showerror("Ошибка", f"Ошибка при обновлении документа: {str(e)}")
 
+    @staticmethod
+    def _parse_moment(text: str):
+        text = text.strip()
+        if not text:
+            return None
+        return datetime.strptime(text, '%Y-%m-%d %H:%M' if ' ' in text else '%Y-%m-%d')
+
+    @ui_action("DocumentModal.publish_document")
     def publish_document(self):
         if self.document and self.document_service.publish_document(self.document.doc_id):
             messagebox.showinfo("Успех", "Документ опубликован")
             self.modal.destroy()
-            self.document_view.refresh_documents()
+            self.document_view.refresh_documents([self.document.doc_id])
         else:
-            messagebox.showerror("Ошибка", "Не удалось опубликовать документ")
\ No newline at end of file
+            messagebox.showerror("Ошибка", "Не удалось опубликовать документ")
+
+    @ui_action("DocumentModal.attach_file")
+    def attach_file(self):
+        path = filedialog.askopenfilename(parent=self.modal)
+        if not path:
+            return
+        try:
+            self.document_service.attach_file(self.document, path)
+            self.file_label.config(text=f"Файл: {self.document.file_path}")
+            self.document_view.refresh_documents([self.document.doc_id])
+        except OSError as e:
+            messagebox.showerror("Ошибка", f"Не удалось сохранить файл: {e}")
\ No newline at end of file
@@ -1,16 +1,19 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-from typing import List
+from tkinter import ttk, messagebox, filedialog
+from typing import List, Optional
 from models.project import Project
 from models.enums import ProjectStatus, ProjectType
 from services.project_service import ProjectService
-from strategies.display_strategy import TileDisplayStrategy, KanbanDisplayStrategy
-from ui.modals import ProjectCardModal, ProjectStageModal
+from diagnostics.instrumentation import timed
+from diagnostics.sql_trace import ui_action
+from ui.refresh_scheduler import RefreshScheduler, DirtyRegion
+from ui.widgets import DateRangeWidget, ProgressDialog
 
 class ProjectView:
-    def __init__(self, root, project_service: ProjectService):
+    def __init__(self, root, project_service: ProjectService, refresh_scheduler: RefreshScheduler = None):
         self.root = root
         self.project_service = project_service
+        self.refresh_scheduler = refresh_scheduler or RefreshScheduler(root)
         self.current_display_strategy = None
         self.current_canvas = None
         
@@ -18,8 +21,9 @@ class ProjectView:
         self.load_projects()
 
     def setup_ui(self):
-        self.root.title("Управление проектами")
-        self.root.geometry("1200x700")
+        if isinstance(self.root, tk.Wm):
+            self.root.title("Управление проектами")
+            self.root.geometry("1200x700")
         
         main_frame = ttk.Frame(self.root)
         main_frame.pack(fill=tk.BOTH, expand=True)
@@ -31,13 +35,21 @@ class ProjectView:
                   command=self.show_tile_view).pack(side=tk.LEFT, padx=5)
         ttk.Button(control_frame, text="Kanban доска", 
                   command=self.show_kanban_view).pack(side=tk.LEFT, padx=5)
+        ttk.Button(control_frame, text="Временная шкала", 
+                  command=self.show_timeline_view).pack(side=tk.LEFT, padx=5)
+        self.date_range = DateRangeWidget(control_frame, on_date_change=self.on_date_range_change)
+        self.date_range.pack(side=tk.LEFT, padx=10)
         
         ttk.Button(control_frame, text="Статистика", 
                   command=self.show_statistics).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(control_frame, text="Отчет...", 
+                  command=self.export_report).pack(side=tk.RIGHT, padx=5)
         
         self.display_frame = ttk.Frame(main_frame)
         self.display_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
 
+    @ui_action("ProjectView.load_projects")
+    @timed("ProjectView.load_projects")
     def load_projects(self):
         self.projects = self.project_service.get_all_projects()
         if not self.projects:
@@ -68,10 +80,30 @@ class ProjectView:
         
         self.projects = sample_projects
 
+    def refresh_projects(self, project_ids: List[int] = None, regions: List[str] = None):
+        self.refresh_scheduler.invalidate(self, rows=project_ids or (), regions=regions or (),
+                                          full=project_ids is None and regions is None)
+
+    @ui_action("ProjectView.apply_refresh")
+    @timed("ProjectView.apply_refresh")
+    def apply_refresh(self, dirty: DirtyRegion):
+        if dirty.full or dirty.rows:
+            self.load_projects()
+        if self.current_display_strategy is None:
+            return
+        from strategies.display_strategy import KanbanDisplayStrategy, TimelineDisplayStrategy
+        if isinstance(self.current_display_strategy, KanbanDisplayStrategy):
+            self.show_kanban_view()
+        elif isinstance(self.current_display_strategy, TimelineDisplayStrategy):
+            self.show_timeline_view()
+        else:
+            self.show_tile_view()
+
     def show_tile_view(self):
         for widget in self.display_frame.winfo_children():
             widget.destroy()
         
+        from strategies.display_strategy import TileDisplayStrategy
         strategy = TileDisplayStrategy()
         self.current_canvas = strategy.display(self.projects, self.display_frame)
         self.current_display_strategy = strategy
@@ -82,10 +114,33 @@ class ProjectView:
         for widget in self.display_frame.winfo_children():
             widget.destroy()
         
+        from strategies.display_strategy import KanbanDisplayStrategy
         strategy = KanbanDisplayStrategy()
         strategy.display(self.projects, self.display_frame)
         self.current_display_strategy = strategy
 
+    @ui_action("ProjectView.show_timeline_view")
+    def show_timeline_view(self):
+        start, end = self.date_range.get_dates()
+        if start is None or start > end:
+            messagebox.showerror("Ошибка", "Укажите корректный период в формате ГГГГ-ММ-ДД")
+            return
+        for widget in self.display_frame.winfo_children():
+            widget.destroy()
+        
+        from strategies.display_strategy import TimelineDisplayStrategy
+        strategy = TimelineDisplayStrategy(start, end)
+        projects = self.project_service.get_projects_in_range(start, end)
+        self.current_canvas = strategy.display(projects, self.display_frame)
+        self.current_display_strategy = strategy
+        
+        self.current_canvas.bind('<Button-1>', self.on_tile_click)
+
+    def on_date_range_change(self):
+        from strategies.display_strategy import TimelineDisplayStrategy
+        if isinstance(self.current_display_strategy, TimelineDisplayStrategy):
+            self.show_timeline_view()
+
     def on_tile_click(self, event):
         if not self.current_canvas:
             return
@@ -102,12 +157,17 @@ class ProjectView:
     def show_project_card(self, project_id: int):
         project = next((p for p in self.projects if p.project_id == project_id), None)
         if project:
-            ProjectCardModal(self.root, project, self.project_service)
+            from ui.modals import ProjectCardModal
+            self.project_service.load_documents([project])
+            ProjectCardModal(self.root, project, self.project_service, self.show_stage_network_diagram)
         else:
             messagebox.showerror("Ошибка", "Проект не найден")
 
+    @ui_action("ProjectView.show_statistics")
     def show_statistics(self):
-        stats = self.project_service.get_project_progress_stats()
+        with self.project_service.snapshot():
+            stats = self.project_service.get_project_progress_stats()
+            distribution = self.project_service.get_portfolio_analytics().deviation_distribution()
         
         stats_text = f"""
 Статистика проектов:
@@ -118,8 +178,34 @@ class ProjectView:
 С отставанием: {stats['delayed']}
 Процент завершения: {stats['completion_rate']:.1f}%
         """
+        if distribution['count']:
+            percentiles = distribution['percentiles']
+            stats_text += (f"Отклонение сроков, дн.: медиана {percentiles[50]:.0f}, "
+                           f"90-й перцентиль {percentiles[90]:.0f}, среднее {distribution['mean']:.1f}\n")
         
         messagebox.showinfo("Статистика проектов", stats_text)
 
-    def show_stage_network_diagram(self, stage_name: str):
-        ProjectStageModal(self.root, stage_name)
\ No newline at end of file
+    @ui_action("ProjectView.export_report")
+    def export_report(self):
+        start, end = self.date_range.get_dates()
+        if start is None:
+            messagebox.showerror("Ошибка", "Неверный формат дат периода")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".xlsx",
+                                            filetypes=[("Excel", "*.xlsx"), ("CSV", "*.csv")])
+        if not path:
+            return
+        filters = {'date_from': start, 'date_to': end}
+        ProgressDialog(self.root, "Отчет по проектам",
+                       lambda progress, cancel: self.project_service.export_report(path, filters=filters,
+                                                                                   progress=progress, cancel=cancel),
+                       lambda count: messagebox.showinfo("Отчет по проектам", f"Выгружено проектов: {count}"))
+
+    @ui_action("ProjectView.show_stage_network_diagram")
+    def show_stage_network_diagram(self, stage_name: str, stage_id: Optional[int] = None):
+        from ui.modals import ProjectStageModal
+        from services.schedule_service import ScheduleService
+        schedule = None
+        if stage_id is not None:
+            schedule = ScheduleService(self.project_service.repository).get_stage_schedule(stage_id)
+        ProjectStageModal(self.root, stage_name, schedule)
\ No newline at end of file
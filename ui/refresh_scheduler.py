@@ -0,0 +1,48 @@
+import time
+from typing import Dict, Iterable, Optional, Set
+
+class DirtyRegion:
+    def __init__(self):
+        self.full = False
+        self.rows: Set[int] = set()
+        self.regions: Set[str] = set()
+
+    def merge(self, rows: Iterable[int], regions: Iterable[str], full: bool):
+        self.full = self.full or full
+        self.rows.update(rows)
+        self.regions.update(regions)
+
+class RefreshScheduler:
+    def __init__(self, widget, frame_budget_ms: int = 16):
+        self.widget = widget
+        self.frame_budget_ms = frame_budget_ms
+        self.pending: Dict[object, DirtyRegion] = {}
+        self.after_id: Optional[str] = None
+        self.last_flush = 0.0
+
+    def invalidate(self, view, rows: Iterable[int] = (), regions: Iterable[str] = (), full: bool = False):
+        rows, regions = list(rows), list(regions)
+        dirty = self.pending.setdefault(view, DirtyRegion())
+        dirty.merge(rows, regions, full or not (rows or regions))
+        self._schedule()
+
+    def _schedule(self):
+        if self.after_id is not None:
+            return
+        elapsed_ms = (time.perf_counter() - self.last_flush) * 1000
+        if elapsed_ms >= self.frame_budget_ms:
+            self.after_id = self.widget.after_idle(self.flush)
+        else:
+            self.after_id = self.widget.after(int(self.frame_budget_ms - elapsed_ms) + 1, self.flush)
+
+    def flush(self):
+        self.cancel()
+        pending, self.pending = self.pending, {}
+        self.last_flush = time.perf_counter()
+        for view, dirty in pending.items():
+            view.apply_refresh(dirty)
+
+    def cancel(self):
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
@@ -1,5 +1,6 @@
+import threading
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox
 from datetime import datetime, timedelta
 from typing import Callable, List
 
@@ -133,4 +134,51 @@ class PaginationWidget(ttk.Frame):
     def update_buttons(self):
         total_pages = max(1, (self.total_items + self.page_size - 1) // self.page_size)
         self.prev_button.state(['!disabled' if self.current_page > 1 else 'disabled'])
-        self.next_button.state(['!disabled' if self.current_page < total_pages else 'disabled'])
\ No newline at end of file
+        self.next_button.state(['!disabled' if self.current_page < total_pages else 'disabled'])
+
+
+class ProgressDialog(tk.Toplevel):
+    def __init__(self, parent, title: str, task: Callable, on_done: Callable):
+        super().__init__(parent)
+        self.title(title)
+        self.geometry("360x120")
+        self.transient(parent)
+        self.resizable(False, False)
+        self.task_title = title
+        self.on_done = on_done
+        self.cancel = threading.Event()
+        self._job = {'done': 0, 'total': 0, 'result': None, 'error': None, 'finished': False}
+        
+        self.label = ttk.Label(self, text="Подготовка...")
+        self.label.pack(fill=tk.X, padx=10, pady=(10, 5))
+        self.progress_bar = ttk.Progressbar(self, maximum=100)
+        self.progress_bar.pack(fill=tk.X, padx=10, pady=5)
+        ttk.Button(self, text="Отмена", command=self.cancel.set).pack(pady=5)
+        self.protocol("WM_DELETE_WINDOW", self.cancel.set)
+        
+        threading.Thread(target=self._run, args=(task,), name="progress-dialog", daemon=True).start()
+        self._poll()
+
+    def _progress(self, done: int, total: int):
+        self._job['done'], self._job['total'] = done, total
+
+    def _run(self, task: Callable):
+        try:
+            self._job['result'] = task(self._progress, self.cancel)
+        except Exception as e:
+            self._job['error'] = e
+        self._job['finished'] = True
+
+    def _poll(self):
+        done, total = self._job['done'], self._job['total']
+        if total:
+            self.progress_bar.config(value=done * 100 / total)
+            self.label.config(text=f"{done} из {total}")
+        if not self._job['finished']:
+            self.after(100, self._poll)
+            return
+        self.destroy()
+        if self._job['error'] is not None:
+            messagebox.showerror("Ошибка", f"{self.task_title}: {self._job['error']}")
+        else:
+            self.on_done(self._job['result'])